@@ -8,14 +8,29 @@ build_module_simulator() {
   (cd /opentrons-modules && cmake --build ./build-stm32-host -j $(expr $(nproc) - 1) --target $1)
 }
 
-echo "Building opentrons-modules"
-build_opentrons_modules
+# SOURCE_FINGERPRINT is set when building local opentrons-modules source.
+# If it matches the fingerprint of the last build, the build steps are skipped.
+FINGERPRINT_FILE=/opentrons-modules/build-stm32-host/.source-fingerprint
 
-echo "Building Heater-Shaker Module simulator"
-build_module_simulator "heater-shaker-simulator"
+if [ -n "$SOURCE_FINGERPRINT" ] && [ -f "$FINGERPRINT_FILE" ] && [ "$(cat "$FINGERPRINT_FILE")" == "$SOURCE_FINGERPRINT" ]; then
+  echo "Skipping opentrons-modules build, source is unchanged"
+else
+  rm -f "$FINGERPRINT_FILE"
+  BUILD_SUCCEEDED=true
 
-echo "Building Thermocycler Module simulator"
-build_module_simulator "thermocycler-gen2-simulator"
+  echo "Building opentrons-modules"
+  build_opentrons_modules || BUILD_SUCCEEDED=false
+
+  echo "Building Heater-Shaker Module simulator"
+  build_module_simulator "heater-shaker-simulator" || BUILD_SUCCEEDED=false
+
+  echo "Building Thermocycler Module simulator"
+  build_module_simulator "thermocycler-gen2-simulator" || BUILD_SUCCEEDED=false
+
+  if [ -n "$SOURCE_FINGERPRINT" ] && [ "$BUILD_SUCCEEDED" == "true" ]; then
+    echo "$SOURCE_FINGERPRINT" > "$FINGERPRINT_FILE"
+  fi
+fi
 
 echo "Creating simulator directories (If needed)"
 mkdir -p \
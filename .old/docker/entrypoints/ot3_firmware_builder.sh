@@ -5,23 +5,38 @@
 # On local-ot3-firwmare-builder container create a volume for each simulator and bind each simulator directory to it
 # On each OT-3 Firmware emulator container attach its respective volume
 
-echo "Building ot3-firmware"
-(
-  cd /ot3-firmware && \
-  cmake --preset host-gcc10
-)
+# SOURCE_FINGERPRINT is set when building local ot3-firmware source.
+# If it matches the fingerprint of the last build, the build steps are skipped.
+FINGERPRINT_FILE=/ot3-firmware/build-host/.source-fingerprint
 
-echo "Building subsystem simulator files"
-(
-  cd /ot3-firmware && \
-  cmake --build ./build-host -j $(expr $(nproc) - 1)
-)
+if [ -n "$SOURCE_FINGERPRINT" ] && [ -f "$FINGERPRINT_FILE" ] && [ "$(cat "$FINGERPRINT_FILE")" == "$SOURCE_FINGERPRINT" ]; then
+  echo "Skipping ot3-firmware build, source is unchanged"
+else
+  rm -f "$FINGERPRINT_FILE"
+  BUILD_SUCCEEDED=true
 
-echo "Building ot3-firmware State Manager"
-(
-  cd /ot3-firmware && \
-  cmake --build --preset tests --target state-manager-build
-)
+  echo "Building ot3-firmware"
+  (
+    cd /ot3-firmware && \
+    cmake --preset host-gcc10
+  ) || BUILD_SUCCEEDED=false
+
+  echo "Building subsystem simulator files"
+  (
+    cd /ot3-firmware && \
+    cmake --build ./build-host -j $(expr $(nproc) - 1)
+  ) || BUILD_SUCCEEDED=false
+
+  echo "Building ot3-firmware State Manager"
+  (
+    cd /ot3-firmware && \
+    cmake --build --preset tests --target state-manager-build
+  ) || BUILD_SUCCEEDED=false
+
+  if [ -n "$SOURCE_FINGERPRINT" ] && [ "$BUILD_SUCCEEDED" == "true" ]; then
+    echo "$SOURCE_FINGERPRINT" > "$FINGERPRINT_FILE"
+  fi
+fi
 
 
 echo "Creating directories (If needed)"
@@ -3,14 +3,29 @@
 # Pass in a list of directories to build
 # Each directory should have a Makefile with a `wheel` target
 # The wheel will be copied to /dist
+#
+# If SOURCE_FINGERPRINT_<DIRECTORY> is set (e.g. SOURCE_FINGERPRINT_ROBOT_SERVER)
+# and matches the fingerprint stored from the last build, the directory is skipped.
 
 DIST_DIR=$1
 shift 1
 
 cd /opentrons || exit 1
 
+mkdir -p "$DIST_DIR/.fingerprints"
+
 for arg; do
+    fingerprint_var="SOURCE_FINGERPRINT_$(echo "$arg" | tr '[:lower:]' '[:upper:]' | tr -c 'A-Z0-9\n' '_')"
+    fingerprint="${!fingerprint_var}"
+    fingerprint_file="$DIST_DIR/.fingerprints/$fingerprint_var"
+    if [ -n "$fingerprint" ] && [ -f "$fingerprint_file" ] && [ "$(cat "$fingerprint_file")" == "$fingerprint" ]; then
+        echo "Skipping /opentrons/$arg, source is unchanged"
+        continue
+    fi
     echo "Building /opentrons/$arg"
-    make -C $arg python=monorepo_python wheel
-    cp $arg/dist/*.whl $DIST_DIR
+    rm -f "$fingerprint_file"
+    make -C $arg python=monorepo_python wheel && cp $arg/dist/*.whl $DIST_DIR
+    if [ $? -eq 0 ] && [ -n "$fingerprint" ]; then
+        echo "$fingerprint" > "$fingerprint_file"
+    fi
 done
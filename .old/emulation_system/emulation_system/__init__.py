@@ -1,6 +1,24 @@
 """emulation_system package."""
-from emulation_system.compose_file_creator.input.configuration_file import (
-    SystemConfigurationModel,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from emulation_system.compose_file_creator.input.configuration_file import (
+        SystemConfigurationModel,
+    )
 
 __all__ = ["SystemConfigurationModel"]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import SystemConfigurationModel on first access.
+
+    Keeps "import emulation_system.<submodule>" cheap for modules that do not need
+    the configuration models, like the daemon client.
+    """
+    if name == "SystemConfigurationModel":
+        from emulation_system.compose_file_creator.input.configuration_file import (
+            SystemConfigurationModel,
+        )
+
+        return SystemConfigurationModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
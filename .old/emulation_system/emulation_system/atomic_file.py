@@ -0,0 +1,22 @@
+"""Helpers for writing files that are read concurrently by other processes."""
+
+import os
+import tempfile
+
+
+def write_file_atomically(file_path: str, content: str) -> None:
+    """Write content to file_path so readers never see a partially written file.
+
+    The content is written to a temporary file in the same directory and then
+    moved into place. Missing parent directories are created.
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
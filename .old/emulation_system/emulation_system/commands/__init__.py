@@ -1,9 +1,32 @@
 """commands package."""
+from typing import TYPE_CHECKING, Any
 
 from .emulation_system_command import EmulationSystemCommand
 from .load_containers_command import LoadContainersCommand
+from .lock_command import LockCommand
+from .render_log_command import RenderLogCommand
+from .serve_command import ServeCommand
+
+if TYPE_CHECKING:
+    from .batch_command import BatchCommand
 
 __all__ = [
+    "BatchCommand",
     "EmulationSystemCommand",
     "LoadContainersCommand",
+    "LockCommand",
+    "RenderLogCommand",
+    "ServeCommand",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import BatchCommand on first access.
+
+    It pulls in multiprocessing, which every other command would pay for at startup.
+    """
+    if name == "BatchCommand":
+        from .batch_command import BatchCommand
+
+        return BatchCommand
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,224 @@
+"""Command for converting many configuration files in one invocation."""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import yaml
+
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.commands.emulation_system_command import EmulationSystemCommand
+
+CONFIGURATION_FILE_EXTENSIONS = [".yaml", ".json"]
+MANIFEST_FILE_EXTENSION = ".txt"
+SUMMARY_FILE_NAME = "summary.json"
+
+
+class BatchConversionError(Exception):
+    """Exception raised when at least one file in a batch failed to convert."""
+
+    def __init__(self, failed_count: int, total_count: int, summary_path: str) -> None:
+        super().__init__(
+            f"{failed_count} of {total_count} files failed to convert. "
+            f"See {summary_path} for details."
+        )
+
+
+def _has_configuration_file_extension(path: str) -> bool:
+    return os.path.splitext(path)[1] in CONFIGURATION_FILE_EXTENSIONS
+
+
+def _read_manifest(manifest_path: str) -> Iterator[str]:
+    """Paths listed in a manifest, one per line, relative to the manifest file.
+
+    Empty lines and lines starting with "#" are ignored.
+    """
+    manifest_dir = os.path.dirname(manifest_path)
+    with open(manifest_path, "r") as manifest_file:
+        for line in manifest_file:
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                yield os.path.join(manifest_dir, line)
+
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """Expand directories, globs, and manifests to a list of configuration files.
+
+    Directories are searched recursively for .yaml and .json files. Manifests are
+    .txt files listing one configuration file per line.
+    """
+    input_paths: List[str] = []
+    for input_spec in inputs:
+        if os.path.isdir(input_spec):
+            matches = glob.glob(os.path.join(input_spec, "**", "*"), recursive=True)
+            input_paths.extend(
+                sorted(
+                    path for path in matches if _has_configuration_file_extension(path)
+                )
+            )
+        elif glob.has_magic(input_spec):
+            input_paths.extend(sorted(glob.glob(input_spec, recursive=True)))
+        elif os.path.splitext(input_spec)[1] == MANIFEST_FILE_EXTENSION:
+            input_paths.extend(_read_manifest(input_spec))
+        else:
+            input_paths.append(input_spec)
+
+    # Keep first occurrence of inputs listed more than once
+    return list(dict.fromkeys(os.path.abspath(path) for path in input_paths))
+
+
+def get_output_paths(input_paths: List[str], output_dir: str) -> Dict[str, str]:
+    """Compose file path for each input path.
+
+    The directory structure of the inputs below their common directory is mirrored in
+    output_dir, so inputs with the same file name do not overwrite each other.
+    """
+    if len(input_paths) == 0:
+        return {}
+    common_dir = os.path.commonpath([os.path.dirname(path) for path in input_paths])
+    return {
+        input_path: os.path.join(
+            output_dir,
+            os.path.splitext(os.path.relpath(input_path, common_dir))[0] + ".yaml",
+        )
+        for input_path in input_paths
+    }
+
+
+def _prefetch_refs(input_paths: List[str]) -> None:
+    """Resolve git refs for every input once, before the worker processes start.
+
+    Workers forked afterwards inherit the in-process ref caches. Otherwise they read
+    the on-disk ref cache written here.
+    """
+    from ..compose_file_creator.input.configuration_file import (
+        SOURCE_FIELD_REPOS,
+        SystemConfigurationModel,
+    )
+    from ..source import prefetch_source_refs
+
+    source_locations = []
+    for input_path in input_paths:
+        try:
+            with open(input_path, "r") as input_file:
+                content = yaml.safe_load(input_file)
+        except (OSError, yaml.YAMLError):
+            # Reported when the file is converted
+            continue
+        if not isinstance(content, dict):
+            continue
+        for field_name, repo in SOURCE_FIELD_REPOS.items():
+            alias = SystemConfigurationModel.__fields__[field_name].alias
+            source_location = content.get(alias, content.get(field_name))
+            if isinstance(source_location, str):
+                source_locations.append((source_location, repo))
+    try:
+        prefetch_source_refs(source_locations)
+    except RuntimeError:
+        # Files using refs that cannot be fetched report it when they are converted
+        pass
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    dev: bool,
+    remote_only: bool,
+    use_cache: bool,
+) -> Optional[str]:
+    """Convert a single configuration file. Returns error message if it failed."""
+    try:
+        output = io.StringIO()
+        with open(input_path, "r") as input_file:
+            EmulationSystemCommand(
+                input_path=input_file,
+                output_path=output,  # type: ignore[arg-type]
+                remote_only=remote_only,
+                dev=dev,
+                use_cache=use_cache,
+            ).execute()
+        write_file_atomically(output_path, output.getvalue())
+    except Exception as err:
+        return f"{type(err).__name__}: {str(err).strip()}"
+    return None
+
+
+@dataclass
+class BatchCommand:
+    """Converts many configuration files to compose files using a process pool."""
+
+    inputs: List[str]
+    output_dir: str
+    remote_only: bool
+    dev: bool
+    use_cache: bool = True
+    jobs: Optional[int] = None
+
+    @classmethod
+    def from_cli_input(cls, args: argparse.Namespace) -> BatchCommand:
+        """Construct BatchCommand from CLI input."""
+        return cls(
+            inputs=args.inputs,
+            output_dir=args.output_dir,
+            remote_only=args.remote_only,
+            dev=args.dev,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+        )
+
+    def _convert_all(self, output_paths: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Convert every input. Returns error message, or None, per input path."""
+        # Imported before the pool starts so forked workers share the loaded models
+        # and pipette lookups instead of importing them again.
+        from ..compose_file_creator.conversion import conversion_functions  # noqa: F401
+
+        _prefetch_refs(list(output_paths))
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                input_path: executor.submit(
+                    convert_file,
+                    input_path,
+                    output_path,
+                    self.dev,
+                    self.remote_only,
+                    self.use_cache,
+                )
+                for input_path, output_path in output_paths.items()
+            }
+            errors = {
+                input_path: future.result() for input_path, future in futures.items()
+            }
+        return errors
+
+    def execute(self) -> None:
+        """Convert all inputs, then print and save a summary."""
+        output_paths = get_output_paths(expand_inputs(self.inputs), self.output_dir)
+        errors = self._convert_all(output_paths)
+
+        summary = {
+            input_path: {
+                "output_path": output_paths[input_path] if error is None else None,
+                "error": error,
+            }
+            for input_path, error in errors.items()
+        }
+        summary_path = os.path.join(self.output_dir, SUMMARY_FILE_NAME)
+        write_file_atomically(summary_path, json.dumps(summary, indent=2) + "\n")
+
+        failed_input_paths = [path for path, error in errors.items() if error]
+        print(
+            f"Converted {len(errors) - len(failed_input_paths)} of {len(errors)} files"
+        )
+        for input_path in failed_input_paths:
+            print(f"\t{input_path}: {errors[input_path]}")
+        if len(failed_input_paths) > 0:
+            raise BatchConversionError(
+                len(failed_input_paths), len(errors), summary_path
+            )
@@ -5,17 +5,39 @@ from __future__ import annotations
 import argparse
 import io
 import os
+import sys
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 import yaml
 
-from ..compose_file_creator.conversion.conversion_functions import convert_from_obj
-from ..compose_file_creator.errors import NotRemoteOnlyError
-from ..compose_file_creator.logging.console import logging_console
+from ..profiling import CHROME_TRACE_FORMAT, span
+
+if TYPE_CHECKING:
+    from ..compose_cache import ComposeCache
+    from ..compose_file_creator.output.runtime_compose_file_model import (
+        RuntimeComposeFileModel,
+    )
+    from ..lock_file import LockFileModel
 
 STDIN_NAME = "<stdin>"
 STDOUT_NAME = "<stdout>"
 
+YAML_FORMAT = "yaml"
+JSON_FORMAT = "json"
+NDJSON_FORMAT = "ndjson"
+OUTPUT_FORMATS = [YAML_FORMAT, JSON_FORMAT, NDJSON_FORMAT]
+JSON_INDENT = 2
+YAML_DOCUMENT_SEPARATOR = "---\n"
+# Written to stderr instead of a file
+PROFILE_STDERR_PATH = "-"
+
+PARSE_YAML_SPAN = "parse_yaml"
+TO_YAML_SPAN = "to_yaml"
+TO_JSON_SPAN = "to_json"
+
+COMPOSE_CACHE_LOG_SERVICE_NAME = "compose-cache"
+
 
 class InvalidFileExtensionException(Exception):
     """Exception raise when file passed does not have yaml or json extension."""
@@ -29,6 +51,14 @@ class EmulationSystemCommand:
     output_path: io.TextIOWrapper
     remote_only: bool
     dev: bool
+    use_cache: bool = True
+    output_format: str = YAML_FORMAT
+    parallel: bool = False
+    snapshot_path: Optional[str] = None
+    changes_path: Optional[str] = None
+    log_path: Optional[str] = None
+    profile_path: Optional[str] = None
+    profile_format: str = CHROME_TRACE_FORMAT
 
     @classmethod
     def from_cli_input(cls, args: argparse.Namespace) -> EmulationSystemCommand:
@@ -38,22 +68,249 @@ class EmulationSystemCommand:
             output_path=args.output_path,
             remote_only=args.remote_only,
             dev=args.dev,
+            use_cache=not args.no_cache,
+            output_format=args.format,
+            parallel=args.parallel,
+            snapshot_path=args.snapshot,
+            changes_path=args.changes,
+            log_path=args.log_file,
+            profile_path=args.profile,
+            profile_format=args.profile_format,
         )
 
-    def execute(self) -> None:
-        """Parse input file to compose file."""
+    def _read_lock_file(self) -> Optional[str]:
+        """Contents of the lock file of the input file, if there is one."""
+        from ..lock_file import get_lock_file_path
+
+        if self.input_path.name == STDIN_NAME:
+            return None
+        try:
+            with open(get_lock_file_path(self.input_path.name), "r") as lock_file:
+                return lock_file.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _parse_lock_file(lock_file_content: Optional[str]) -> Optional[LockFileModel]:
+        """Parse contents returned by _read_lock_file."""
+        from ..lock_file import LockFileModel
+
+        if lock_file_content is None:
+            return None
+        return LockFileModel.parse_raw(lock_file_content)
+
+    @staticmethod
+    def _log_cache_hit(cache_key: str) -> None:
+        """Logs that the compose file was served from the cache."""
+        from ..compose_file_creator.logging.log_sink import LogEvent, get_log_sink
+
+        log_sink = get_log_sink()
+        if log_sink is None:
+            return
+        log_sink.write(
+            LogEvent(
+                COMPOSE_CACHE_LOG_SERVICE_NAME,
+                "cache",
+                cache_key,
+                [
+                    "Served compose file from the cache. No services were built, "
+                    'run with "--no-cache" to log how every service is built.'
+                ],
+            )
+        )
+
+    def _convert_incrementally(
+        self, parsed_content: Any, lock: Optional[LockFileModel]  # noqa: ANN401
+    ) -> RuntimeComposeFileModel:
+        """Convert, rebuilding only services whose inputs changed since the snapshot.
+
+        The snapshot is updated afterwards, and the containers that changed are
+        written to changes_path, or to stderr if it is not set.
+        """
+        from ..atomic_file import write_file_atomically
+        from ..compose_file_creator.conversion.conversion_functions import (
+            parse_configuration,
+        )
+        from ..compose_file_creator.conversion.incremental import (
+            ServiceSnapshot,
+            convert_incrementally,
+        )
+
+        assert self.snapshot_path is not None
+        previous_snapshot = (
+            ServiceSnapshot.from_file(self.snapshot_path)
+            if os.path.isfile(self.snapshot_path)
+            else None
+        )
+        compose_file_model, diff, snapshot = convert_incrementally(
+            parse_configuration(parsed_content, lock),
+            self.dev,
+            previous_snapshot,
+            self.parallel,
+        )
+        snapshot.to_file(self.snapshot_path)
+
+        changes = "".join(f"{line}\n" for line in diff.to_lines())
+        if self.changes_path is not None:
+            write_file_atomically(self.changes_path, changes)
+        else:
+            sys.stderr.write(changes)
+        return compose_file_model
+
+    def _convert_document(
+        self,
+        parsed_content: Any,  # noqa: ANN401
+        lock_file_content: Optional[str],
+        compose_cache: ComposeCache,
+    ) -> str:
+        """Convert a single configuration document to a compose file."""
+        from ..compose_cache import get_compose_cache_key, get_compose_cache_max_age
+        from ..git_interaction import force_refresh_requested
+
+        # Incremental conversions always build, to update the snapshot
+        cache_key = (
+            get_compose_cache_key(
+                parsed_content,
+                self.dev,
+                self.remote_only,
+                lock_file_content,
+                self.output_format,
+            )
+            if self.use_cache and self.snapshot_path is None
+            else None
+        )
+        # Refreshing refs revalidates the configuration, so the cache is only written
+        if cache_key is not None and not force_refresh_requested():
+            cached_compose_file = compose_cache.get(
+                cache_key, get_compose_cache_max_age(parsed_content)
+            )
+            if cached_compose_file is not None:
+                self._log_cache_hit(cache_key)
+                return cached_compose_file
+
+        # Only imported on a cache miss, since importing the conversion code takes
+        # longer than serving a cached compose file.
+        from ..compose_file_creator.conversion.conversion_functions import (
+            convert_from_obj,
+        )
+        from ..compose_file_creator.errors import NotRemoteOnlyError
+
+        lock = self._parse_lock_file(lock_file_content)
+        converted_object = (
+            self._convert_incrementally(parsed_content, lock)
+            if self.snapshot_path is not None
+            else convert_from_obj(parsed_content, self.dev, lock, self.parallel)
+        )
+
+        if self.remote_only and not converted_object.is_remote:
+            raise NotRemoteOnlyError
+
+        if self.output_format == JSON_FORMAT:
+            with span(TO_JSON_SPAN):
+                compose_file = converted_object.to_json(indent=JSON_INDENT) + "\n"
+        elif self.output_format == NDJSON_FORMAT:
+            with span(TO_JSON_SPAN):
+                compose_file = converted_object.to_json() + "\n"
+        else:
+            with span(TO_YAML_SPAN):
+                compose_file = converted_object.to_yaml()
+        if cache_key is not None:
+            compose_cache.put(cache_key, compose_file)
+        return compose_file
+
+    def _check_multiple_documents_supported(self) -> None:
+        from ..compose_file_creator.errors import MultipleDocumentsNotSupportedError
+
+        if self.snapshot_path is not None:
+            raise MultipleDocumentsNotSupportedError('"--snapshot"')
+        if self.output_format == JSON_FORMAT:
+            # Concatenated JSON documents are not valid JSON
+            raise MultipleDocumentsNotSupportedError(
+                f'"--format {JSON_FORMAT}" (use "--format {NDJSON_FORMAT}" instead)'
+            )
+
+    def _load_documents(self) -> Iterator[Any]:
+        """Parse documents from the input one at a time."""
+        documents = yaml.safe_load_all(self.input_path)
+        while True:
+            with span(PARSE_YAML_SPAN):
+                try:
+                    document = next(documents)
+                except StopIteration:
+                    return
+            yield document
+
+    def _convert_input(self) -> None:
+        """Convert every document in the input and write the compose files."""
+        from ..compose_cache import ComposeCache
+
         extension = os.path.splitext(self.input_path.name)[1]
 
         if self.input_path.name != STDIN_NAME and extension not in [".yaml", ".json"]:
             raise InvalidFileExtensionException(
                 "Passed file must either be a .json or" ".yaml extension."
             )
-        stdin_content = self.input_path.read().strip()
-        parsed_content = yaml.safe_load(stdin_content)
-        converted_object = convert_from_obj(parsed_content, self.dev)
+        lock_file_content = self._read_lock_file()
+        compose_cache = ComposeCache()
 
-        if self.remote_only and not converted_object.is_remote:
-            raise NotRemoteOnlyError
+        document_count = 0
+        for parsed_content in self._load_documents():
+            if document_count > 0:
+                self._check_multiple_documents_supported()
+            compose_file = self._convert_document(
+                parsed_content, lock_file_content, compose_cache
+            )
+            if document_count > 0 and self.output_format == YAML_FORMAT:
+                self.output_path.write(YAML_DOCUMENT_SEPARATOR)
+            self.output_path.write(compose_file)
+            self.output_path.flush()
+            document_count += 1
+
+        if document_count == 0:
+            # Empty input is converted as a single empty document, which reports
+            # that the configuration is invalid.
+            self._convert_document(None, lock_file_content, compose_cache)
+
+    def execute(self) -> None:
+        """Parse input file to compose files.
+
+        Every document in a multi-document input is converted and written as soon as
+        it has been parsed, so configurations can be streamed through stdin.
+
+        The conversion log is written to log_path, or to a new file in the log
+        directory. Documents served from the cache only log the cache hit.
+        """
+        # Imported here so that the CLI only loads the conversion code for commands
+        # that need it.
+        from ..compose_file_creator.logging.log_sink import (
+            JSONLinesLogSink,
+            create_run_log_sink,
+            log_to,
+        )
+
+        log_sink = (
+            JSONLinesLogSink(self.log_path)
+            if self.log_path is not None
+            else create_run_log_sink()
+        )
+        try:
+            with log_to(log_sink):
+                if self.profile_path is not None:
+                    self._convert_input_with_profile(self.profile_path)
+                else:
+                    self._convert_input()
+        finally:
+            log_sink.close()
+
+    def _convert_input_with_profile(self, profile_path: str) -> None:
+        """Convert input, then write the time spent in every stage to profile_path."""
+        from ..atomic_file import write_file_atomically
+        from ..profiling import profile
 
-        self.output_path.write(converted_object.to_yaml())
-        logging_console.save_log()
+        with profile() as profiler:
+            self._convert_input()
+        exported_profile = profiler.export(self.profile_format)
+        if profile_path == PROFILE_STDERR_PATH:
+            sys.stderr.write(exported_profile)
+        else:
+            write_file_atomically(os.path.abspath(profile_path), exported_profile)
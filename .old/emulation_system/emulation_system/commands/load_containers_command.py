@@ -4,18 +4,27 @@ from __future__ import annotations
 
 import argparse
 import io
+import json
 import os
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
 import yaml
 
 from emulation_system.commands.emulation_system_command import (
+    NDJSON_FORMAT,
     STDIN_NAME,
     InvalidFileExtensionException,
 )
 
-from ..compose_file_creator.conversion.conversion_functions import convert_from_obj
+if TYPE_CHECKING:
+    from ..compose_file_creator.output.runtime_compose_file_model import (
+        RuntimeComposeFileModel,
+    )
+
+TEXT_FORMAT = "text"
+OUTPUT_FORMATS = [TEXT_FORMAT, NDJSON_FORMAT]
+TEXT_DOCUMENT_SEPARATOR = "---"
 
 
 @dataclass
@@ -25,6 +34,7 @@ class LoadContainersCommand:
     input_path: io.TextIOWrapper
     filter: str
     local_only: bool
+    output_format: str = TEXT_FORMAT
 
     @classmethod
     def from_cli_input(cls, args: argparse.Namespace) -> LoadContainersCommand:
@@ -33,22 +43,46 @@ class LoadContainersCommand:
             input_path=args.input_path,
             filter=args.filter,
             local_only=args.local_only,
+            output_format=args.format,
         )
 
+    def _print_container_names(
+        self, system: RuntimeComposeFileModel, first_document: bool
+    ) -> None:
+        container_names = [
+            cast(str, container.container_name)
+            for container in system.load_containers_by_filter(self.filter)
+        ]
+        if self.output_format == NDJSON_FORMAT:
+            print(json.dumps(container_names), flush=True)
+            return
+        if not first_document:
+            print(TEXT_DOCUMENT_SEPARATOR)
+        print("\n".join(container_names), flush=True)
+
     def execute(self) -> None:
-        """Parse input file, apply filter, and print container names."""
+        """Parse input file, apply filter, and print container names.
+
+        Every document in a multi-document input is converted and printed as soon as
+        it has been parsed.
+        """
+        from ..compose_file_creator.conversion.conversion_functions import (
+            convert_from_obj,
+        )
+
         extension = os.path.splitext(self.input_path.name)[1]
 
         if self.input_path.name != STDIN_NAME and extension not in [".yaml", ".json"]:
             raise InvalidFileExtensionException(
                 "Passed file must either be a .json or" ".yaml extension."
             )
-        stdin_content = self.input_path.read().strip()
-        parsed_content = yaml.safe_load(stdin_content)
-        system = convert_from_obj(parsed_content, False)
-        print(
-            "\n".join(
-                cast(str, container.container_name)
-                for container in system.load_containers_by_filter(self.filter)
+        document_count = 0
+        for parsed_content in yaml.safe_load_all(self.input_path):
+            self._print_container_names(
+                convert_from_obj(parsed_content, False), document_count == 0
             )
-        )
+            document_count += 1
+        if document_count == 0:
+            # Empty input is converted as a single empty document, which reports
+            # that the configuration is invalid.
+            convert_from_obj(None, False)  # type: ignore[arg-type]
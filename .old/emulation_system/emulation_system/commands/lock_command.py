@@ -0,0 +1,56 @@
+"""Command for creating a lock file from a configuration file."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+from dataclasses import dataclass
+
+import yaml
+
+from emulation_system.commands.emulation_system_command import (
+    STDIN_NAME,
+    InvalidFileExtensionException,
+)
+
+
+@dataclass
+class LockCommand:
+    """Resolves remote sources to commit SHAs and writes them to a lock file."""
+
+    input_path: io.TextIOWrapper
+
+    @classmethod
+    def from_cli_input(cls, args: argparse.Namespace) -> LockCommand:
+        """Construct LockCommand from CLI input."""
+        return cls(input_path=args.input_path)
+
+    def execute(self) -> None:
+        """Parse input file and write its lock file next to it."""
+        from emulation_system import SystemConfigurationModel
+
+        from ..compose_file_creator.logging.console import (
+            CustomConsole,
+            CustomHightlighter,
+        )
+        from ..lock_file import create_lock, get_lock_file_path
+
+        extension = os.path.splitext(self.input_path.name)[1]
+
+        if self.input_path.name == STDIN_NAME:
+            raise InvalidFileExtensionException(
+                "Lock file is written next to the configuration file. "
+                "Reading from stdin is not supported."
+            )
+        if extension not in [".yaml", ".json"]:
+            raise InvalidFileExtensionException(
+                "Passed file must either be a .json or" ".yaml extension."
+            )
+        parsed_content = yaml.safe_load(self.input_path.read().strip())
+        config_model = SystemConfigurationModel.from_dict(parsed_content)
+        lock_file_path = get_lock_file_path(self.input_path.name)
+        create_lock(config_model).to_file(lock_file_path)
+        CustomConsole(highlighter=CustomHightlighter()).print(
+            f"Wrote lock file to {lock_file_path}"
+        )
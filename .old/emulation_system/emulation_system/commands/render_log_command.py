@@ -0,0 +1,77 @@
+"""Command for rendering a conversion log as text or HTML."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+TEXT_FORMAT = "text"
+HTML_FORMAT = "html"
+RENDER_FORMATS = [TEXT_FORMAT, HTML_FORMAT]
+RENDER_WIDTH = 200
+
+
+@dataclass
+class RenderLogCommand:
+    """Renders the JSON lines log written by emulation-system."""
+
+    log_path: Optional[str]
+    output_path: Optional[str]
+    output_format: str = TEXT_FORMAT
+
+    @classmethod
+    def from_cli_input(cls, args: argparse.Namespace) -> RenderLogCommand:
+        """Construct RenderLogCommand from CLI input."""
+        return cls(
+            log_path=args.log_path,
+            output_path=args.output,
+            output_format=args.format,
+        )
+
+    def _get_log_path(self) -> str:
+        """Log to render. Defaults to the log of the most recent run."""
+        from ..compose_file_creator.errors import NoLogFilesError
+        from ..compose_file_creator.logging.log_sink import (
+            get_latest_log_path,
+            get_log_dir,
+        )
+
+        if self.log_path is not None:
+            return self.log_path
+        latest_log_path = get_latest_log_path()
+        if latest_log_path is None:
+            raise NoLogFilesError(get_log_dir())
+        return latest_log_path
+
+    def render(self) -> str:
+        """Render the log."""
+        from ..compose_file_creator.logging.console import (
+            CustomConsole,
+            CustomHightlighter,
+            render_log_events,
+        )
+        from ..compose_file_creator.logging.log_sink import read_log_events
+
+        output = io.StringIO()
+        console = CustomConsole(
+            width=RENDER_WIDTH,
+            record=self.output_format == HTML_FORMAT,
+            highlighter=CustomHightlighter(),
+            file=output,
+        )
+        render_log_events(read_log_events(self._get_log_path()), console)
+        if self.output_format == HTML_FORMAT:
+            return console.export_html(inline_styles=True)
+        return output.getvalue()
+
+    def execute(self) -> None:
+        """Write the rendered log to output_path, or to stdout if it is not set."""
+        rendered_log = self.render()
+        if self.output_path is None:
+            sys.stdout.write(rendered_log)
+        else:
+            with open(self.output_path, "w") as output_file:
+                output_file.write(rendered_log)
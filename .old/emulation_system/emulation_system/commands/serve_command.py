@@ -0,0 +1,29 @@
+"""Command for running the emulation-system daemon."""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+
+from ..daemon import EmulationSystemDaemon
+
+
+@dataclass
+class ServeCommand:
+    """Serves emulation-system and load-containers requests on a Unix socket."""
+
+    socket_path: str
+
+    @classmethod
+    def from_cli_input(cls, args: argparse.Namespace) -> ServeCommand:
+        """Construct ServeCommand from CLI input."""
+        return cls(socket_path=args.socket_path)
+
+    def execute(self) -> None:
+        """Serve requests until interrupted or emulation_system changes."""
+        with EmulationSystemDaemon(self.socket_path) as daemon:
+            print(f"Serving on {self.socket_path}")
+            try:
+                daemon.serve_until_stopped()
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,276 @@
+"""Content-addressed cache of generated compose files.
+
+The Makefile regenerates the compose file for every step of a single action, e.g.
+"make emulation-system" converts the same configuration file five times. Results are
+cached under a key built from everything that affects the generated compose file:
+
+- the configuration file, as parsed from YAML
+- the dev and remote_only flags, and the output format
+- the version of emulation_system and the mtimes of its source files
+- the pipette versions file
+- the mtimes of the files in every local source
+- whether every extra-mount host path exists, and its stat
+- the lock file, if there is one
+- today's date, since pipette serial numbers and OT-2 ids contain it
+
+Only cheap inputs are part of the key. Nothing is validated, so a hit never imports
+the configuration models. Invalid configurations get a key too, but nothing is
+stored under it, since their conversion fails.
+
+Remote refs are not part of the key. Entries for configurations with a source
+pinned to a ref are only served for as long as the on-disk ref cache is valid (see
+get_compose_cache_max_age), so refs deleted upstream are noticed as soon as they
+would be without the compose cache.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import time
+from datetime import datetime
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.consts import (
+    COMPOSE_CACHE_DIR_ENV_VAR_NAME,
+    COMPOSE_CACHE_MAX_AGE_SECONDS,
+    COMPOSE_CACHE_MAX_SIZE_BYTES,
+    DATE_STRING_FORMAT,
+    DEFAULT_COMPOSE_CACHE_DIR,
+    PIPETTE_VERSIONS_FILE_PATH,
+)
+from emulation_system.git_interaction import get_ref_cache_ttl
+from emulation_system.source_fingerprint import compute_source_stat_signature
+
+PACKAGE_NAME = "emulation-system"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FIELD_NAMES = [
+    "monorepo_source",
+    "ot3_firmware_source",
+    "opentrons_modules_source",
+]
+
+
+def get_tool_version() -> str:
+    """Version of emulation_system combined with a signature of its source files.
+
+    The signature makes sure local changes to the code invalidate the cache
+    without bumping the version.
+    """
+    try:
+        version = metadata.version(PACKAGE_NAME)
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"{version}+{compute_source_stat_signature(PACKAGE_DIR)}"
+
+
+def hash_pipette_versions() -> Optional[str]:
+    """sha256 of the pipette versions file. None if it does not exist."""
+    try:
+        with open(PIPETTE_VERSIONS_FILE_PATH, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _get_local_source_signatures(parsed_content: Dict[str, Any]) -> Dict[str, str]:
+    """Stat signature of every source field pointing at a local directory.
+
+    Remote sources are fully described by their source location, which is already
+    part of the configuration.
+    """
+    return {
+        field_name: compute_source_stat_signature(source_location)
+        for field_name, source_location in _get_source_locations(parsed_content).items()
+        if isinstance(source_location, str) and os.path.isdir(source_location)
+    }
+
+
+def _get_source_locations(parsed_content: Dict[str, Any]) -> Dict[str, Any]:
+    """Source location of every source field set in parsed_content."""
+    source_locations = {}
+    for field_name in SOURCE_FIELD_NAMES:
+        source_location = parsed_content.get(
+            field_name.replace("_", "-"), parsed_content.get(field_name)
+        )
+        if source_location is not None:
+            source_locations[field_name] = source_location
+    return source_locations
+
+
+def _get_extra_mount_signatures(
+    parsed_content: Dict[str, Any]
+) -> List[Optional[List[int]]]:
+    """File type, inode and mtime of every extra-mount host path.
+
+    None for host paths that do not exist, so deleting one invalidates the cache
+    and the conversion reports it.
+    """
+    extra_mounts = parsed_content.get(
+        "extra-mounts", parsed_content.get("extra_mounts")
+    )
+    if not isinstance(extra_mounts, list):
+        return []
+    signatures: List[Optional[List[int]]] = []
+    for extra_mount in extra_mounts:
+        host_path = (
+            extra_mount.get("host-path", extra_mount.get("host_path"))
+            if isinstance(extra_mount, dict)
+            else None
+        )
+        try:
+            if not isinstance(host_path, str):
+                raise FileNotFoundError(host_path)
+            stat_result = os.stat(host_path)
+        except OSError:
+            signatures.append(None)
+            continue
+        signatures.append(
+            [
+                stat.S_IFMT(stat_result.st_mode),
+                stat_result.st_ino,
+                stat_result.st_mtime_ns,
+            ]
+        )
+    return signatures
+
+
+def depends_on_remote_refs(parsed_content: Any) -> bool:  # noqa: ANN401
+    """Whether any source of parsed_content is pinned to a ref on Github."""
+    if not isinstance(parsed_content, dict):
+        return False
+    return any(
+        isinstance(source_location, str)
+        and source_location.lower() != "latest"
+        and not os.path.isdir(source_location)
+        for source_location in _get_source_locations(parsed_content).values()
+    )
+
+
+def get_compose_cache_max_age(parsed_content: Any) -> Optional[float]:  # noqa: ANN401
+    """Number of seconds the cached compose file of parsed_content can be served for.
+
+    Compose files validated against remote refs expire with the ref cache. None if
+    only the regular max age of the cache applies.
+    """
+    return get_ref_cache_ttl() if depends_on_remote_refs(parsed_content) else None
+
+
+def get_compose_cache_key(
+    parsed_content: Any,  # noqa: ANN401
+    dev: bool,
+    remote_only: bool,
+    lock_file_content: Optional[str],
+    output_format: str = "yaml",
+) -> Optional[str]:
+    """Cache key for the compose file generated from parsed_content.
+
+    Returns None if parsed_content cannot be cached because it is not a mapping. The
+    regular conversion should then run so it can report the error.
+    """
+    if not isinstance(parsed_content, dict):
+        return None
+    key_content = json.dumps(
+        {
+            "config": parsed_content,
+            "dev": dev,
+            "remote_only": remote_only,
+            "tool_version": get_tool_version(),
+            "pipette_versions": hash_pipette_versions(),
+            "local_sources": _get_local_source_signatures(parsed_content),
+            "extra_mounts": _get_extra_mount_signatures(parsed_content),
+            "lock": lock_file_content,
+            "output_format": output_format,
+            "date": datetime.now().strftime(DATE_STRING_FORMAT),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key_content.encode()).hexdigest()
+
+
+class ComposeCache:
+    """On-disk cache of generated compose files, evicted by size and age.
+
+    The mtime of an entry is when it was written, its atime when it was last served.
+    Entries expire by mtime and are evicted least recently used first, by atime.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_bytes: int = COMPOSE_CACHE_MAX_SIZE_BYTES,
+        max_age_seconds: float = COMPOSE_CACHE_MAX_AGE_SECONDS,
+    ) -> None:
+        self._cache_dir = (
+            cache_dir
+            if cache_dir is not None
+            else os.environ.get(
+                COMPOSE_CACHE_DIR_ENV_VAR_NAME, DEFAULT_COMPOSE_CACHE_DIR
+            )
+        )
+        self._max_size_bytes = max_size_bytes
+        self._max_age_seconds = max_age_seconds
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.yaml")
+
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[str]:
+        """Cached compose file for key, or None if there is no valid entry.
+
+        Entries older than max_age_seconds are not served, if it is shorter than
+        the max age of the cache.
+        """
+        if max_age_seconds is None or max_age_seconds > self._max_age_seconds:
+            max_age_seconds = self._max_age_seconds
+        entry_path = self._entry_path(key)
+        try:
+            entry_stat = os.stat(entry_path)
+            if time.time() - entry_stat.st_mtime > max_age_seconds:
+                return None
+            with open(entry_path, "r") as file:
+                content = file.read()
+            # Refresh atime so eviction removes least recently used entries first
+            os.utime(entry_path, ns=(time.time_ns(), entry_stat.st_mtime_ns))
+        except OSError:
+            return None
+        return content
+
+    def put(self, key: str, content: str) -> None:
+        """Store compose file under key. Failing to write the cache is not fatal."""
+        try:
+            write_file_atomically(self._entry_path(key), content)
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove entries older than max age, then least recently used until under max size."""
+        entries = []
+        now = time.time()
+        for file_name in os.listdir(self._cache_dir):
+            if not file_name.endswith(".yaml"):
+                continue
+            entry_path = os.path.join(self._cache_dir, file_name)
+            try:
+                entry_stat = os.stat(entry_path)
+                if now - entry_stat.st_mtime > self._max_age_seconds:
+                    os.remove(entry_path)
+                else:
+                    entries.append(
+                        (entry_stat.st_atime, entry_stat.st_size, entry_path)
+                    )
+            except OSError:
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self._max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
@@ -1,7 +1,22 @@
 """compose_file_creator package."""
-from emulation_system.compose_file_creator.output.compose_file_model import (
-    BuildItem,
-    Service,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from emulation_system.compose_file_creator.output.compose_file_model import (
+        BuildItem,
+        Service,
+    )
 
 __all__ = ["BuildItem", "Service"]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import compose file model on first access.
+
+    Keeps importing submodules, like the log sink, cheap for compose file cache hits.
+    """
+    if name in __all__:
+        from emulation_system.compose_file_creator.output import compose_file_model
+
+        return getattr(compose_file_model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
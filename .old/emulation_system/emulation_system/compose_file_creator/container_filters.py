@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 from enum import Enum, auto, unique
-from typing import List
+from typing import Dict, FrozenSet, List, Tuple
 
 from . import BuildItem, Service
 from .errors import InvalidFilterError
@@ -30,6 +31,13 @@ from .images import (
     ThermocyclerModuleImages,
 )
 
+INVERSE_PREFIX = "not-"
+UNION_SEPARATOR = ","
+INTERSECTION_SEPARATOR = "+"
+
+# Image names a filter term matches and whether the term is inverted
+FilterTerm = Tuple[FrozenSet[str], bool]
+
 
 @unique
 class EmulationLevelFilter(Enum):
@@ -247,18 +255,63 @@ class ContainerFilters(Enum):
         self.container_filter_name = container_filter_name
         self.images = images
         self.emulation_level_filter = emulation_level_filter
+        self.image_names = self._get_image_names()
+
+    def _get_image_names(self) -> FrozenSet[str]:
+        """Names of all images matching the filter at its emulation level."""
+        firmware_level: bool
+        hardware_level: bool
+        match self.emulation_level_filter:
+            case EmulationLevelFilter.FIRMWARE_ONLY:
+                firmware_level = True
+                hardware_level = False
+            case EmulationLevelFilter.HARDWARE_ONLY:
+                firmware_level = False
+                hardware_level = True
+            case _:
+                firmware_level = True
+                hardware_level = True
+
+        matching_image_names: List[str] = []
+        for image in self.images:
+            matching_image_names.extend(
+                image.get_image_names(
+                    only_firmware_level=firmware_level,
+                    only_hardware_level=hardware_level,
+                )
+            )
+        return frozenset(matching_image_names)
 
     @classmethod
     def _load_by_filter_name(cls, filter_name: str) -> ContainerFilters:
         """Load ContainerFilters object by filter_name."""
-        valid_filters = []
-        for name, value in cls.__members__.items():
-            if filter_name == value.container_filter_name:
-                return value
-            else:
-                valid_filters.append(value.container_filter_name)
+        try:
+            return FILTERS_BY_NAME[filter_name]
+        except KeyError:
+            raise InvalidFilterError(filter_name, list(FILTERS_BY_NAME)) from None
 
-        raise InvalidFilterError(filter_name, valid_filters)
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def parse_filter_expression(cls, expression: str) -> List[List[FilterTerm]]:
+        """Parse filter expression into a union of intersections of filter terms.
+
+        Filters separated by "," are combined as a union and filters separated by
+        "+" as an intersection, which takes precedence. Every filter can be
+        prefixed with "not-" to use its inverse.
+        """
+        clauses = []
+        for union_part in expression.split(UNION_SEPARATOR):
+            clause = []
+            for filter_name in union_part.split(INTERSECTION_SEPARATOR):
+                filter_name = filter_name.strip()
+                inverse = filter_name.startswith(INVERSE_PREFIX)
+                if inverse:
+                    filter_name = filter_name[len(INVERSE_PREFIX) :]
+                clause.append(
+                    (cls._load_by_filter_name(filter_name).image_names, inverse)
+                )
+            clauses.append(clause)
+        return clauses
 
     @classmethod
     def filter_services(
@@ -270,46 +323,29 @@ class ContainerFilters(Enum):
 
         For instance, "not-source-builders" would return all containers that
         are not in the "source-builders" filter.
+
+        Filters can be combined, "ot3-firmware,modules" returns containers in
+        either filter and "modules+not-hardware-modules" containers in both.
+        Services are checked against the whole expression in a single pass.
         """
+        clauses = cls.parse_filter_expression(filter_name)
         service_list = []
-        image_names = []
-        inverse = False
-
-        if filter_name.startswith("not-"):
-            inverse = True
-            filter_name = filter_name.replace("not-", "")
-
-        container_filter: ContainerFilters = cls._load_by_filter_name(filter_name)
-
-        for image in container_filter.images:
-            firmware_level: bool
-            hardware_level: bool
-            match container_filter.emulation_level_filter:
-                case EmulationLevelFilter.FIRMWARE_ONLY:
-                    firmware_level = True
-                    hardware_level = False
-                case EmulationLevelFilter.HARDWARE_ONLY:
-                    firmware_level = False
-                    hardware_level = True
-                case _:
-                    firmware_level = True
-                    hardware_level = True
-
-            image_names.extend(
-                image.get_image_names(
-                    only_firmware_level=firmware_level,
-                    only_hardware_level=hardware_level,
-                )
-            )
-
         for service in services:
             service_build = service.build
             assert isinstance(service_build, BuildItem)
-            if not inverse:
-                if service_build.target in image_names:
-                    service_list.append(service)
-            else:
-                if service_build.target not in image_names:
-                    service_list.append(service)
+            if any(
+                all(
+                    (service_build.target in image_names) != inverse
+                    for image_names, inverse in clause
+                )
+                for clause in clauses
+            ):
+                service_list.append(service)
 
         return service_list
+
+
+FILTERS_BY_NAME: Dict[str, ContainerFilters] = {
+    container_filter.container_filter_name: container_filter
+    for container_filter in ContainerFilters
+}
@@ -1,16 +1,19 @@
 """Conversion package."""
-from .service_builders import (
-    CANServerService,
-    EmulatorProxyService,
-    InputServices,
-    MonorepoBuilderService,
-    OpentronsModulesBuilderService,
-    OT3FirmwareBuilderService,
-    OT3Services,
-    OT3StateManagerService,
-    ServiceOrchestrator,
-    SmoothieService,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .service_builders import (
+        CANServerService,
+        EmulatorProxyService,
+        InputServices,
+        MonorepoBuilderService,
+        OpentronsModulesBuilderService,
+        OT3FirmwareBuilderService,
+        OT3Services,
+        OT3StateManagerService,
+        ServiceOrchestrator,
+        SmoothieService,
+    )
 
 __all__ = [
     "CANServerService",
@@ -24,3 +27,12 @@ __all__ = [
     "OT3FirmwareBuilderService",
     "OpentronsModulesBuilderService",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import builder from service_builders on first access."""
+    if name in __all__:
+        from . import service_builders
+
+        return getattr(service_builders, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,11 +5,20 @@ from pydantic import parse_obj_as
 
 from emulation_system import SystemConfigurationModel
 from emulation_system.compose_file_creator import Service
+from emulation_system.lock_file import LockFileModel, apply_lock
+from emulation_system.profiling import span
 
 from ..output.compose_file_model import Network, Volume
 from ..output.runtime_compose_file_model import RuntimeComposeFileModel
+from ..types.intermediate_types import DockerServices
 from . import ServiceOrchestrator
 
+CONVERT_SPAN = "convert_from_obj"
+VALIDATE_SPAN = "validate"
+BUILD_SERVICES_SPAN = "build_services"
+TOP_LEVEL_VOLUMES_SPAN = "get_top_level_volumes"
+COMPOSE_FILE_MODEL_SPAN = "RuntimeComposeFileModel"
+
 
 def _get_top_level_volumes(service_list: List[Service]) -> Optional[Dict[str, Volume]]:
     """Get top level volumes dict."""
@@ -29,25 +38,59 @@ def _get_top_level_volumes(service_list: List[Service]) -> Optional[Dict[str, Vo
         return None
 
 
+def create_compose_file_model(
+    config_model: SystemConfigurationModel, services: DockerServices
+) -> RuntimeComposeFileModel:
+    """Compose file containing services and the networks and volumes they use."""
+    with span(TOP_LEVEL_VOLUMES_SPAN):
+        volumes = _get_top_level_volumes(list(services.values()))
+    with span(COMPOSE_FILE_MODEL_SPAN):
+        return RuntimeComposeFileModel(
+            is_remote=config_model.is_remote,
+            services=services,
+            networks={
+                network_name: Network()
+                for network_name in config_model.required_networks
+            },
+            volumes=volumes,
+        )
+
+
 def _convert(
     config_model: SystemConfigurationModel,
     dev: bool,
+    parallel: bool = False,
 ) -> RuntimeComposeFileModel:
     """Parses SystemConfigurationModel to compose file."""
-    services = ServiceOrchestrator(config_model, dev).build_services()
-    return RuntimeComposeFileModel(
-        is_remote=config_model.is_remote,
-        services=services,
-        networks={
-            network_name: Network() for network_name in config_model.required_networks
-        },
-        volumes=_get_top_level_volumes(list(services.values())),
-    )
+    with span(BUILD_SERVICES_SPAN, parallel=parallel):
+        services = ServiceOrchestrator(config_model, dev, parallel).build_services()
+    return create_compose_file_model(config_model, services)
+
+
+def parse_configuration(
+    input_obj: Dict[str, Any], lock: Optional[LockFileModel] = None
+) -> SystemConfigurationModel:
+    """Parse configuration from obj, pinning remote sources to lock if passed.
+
+    Validation includes resolving the refs of remote sources.
+    """
+    with span(VALIDATE_SPAN):
+        config_model = parse_obj_as(SystemConfigurationModel, input_obj)
+        if lock is not None:
+            apply_lock(config_model, lock)
+    return config_model
 
 
 def convert_from_obj(
     input_obj: Dict[str, Any],
     dev: bool,
+    lock: Optional[LockFileModel] = None,
+    parallel: bool = False,
 ) -> RuntimeComposeFileModel:
-    """Parse from obj."""
-    return _convert(parse_obj_as(SystemConfigurationModel, input_obj), dev)
+    """Parse from obj.
+
+    If lock is passed, remote sources are pinned to the commit SHAs it contains.
+    If parallel is True, independent services are built concurrently.
+    """
+    with span(CONVERT_SPAN):
+        return _convert(parse_configuration(input_obj, lock), dev, parallel)
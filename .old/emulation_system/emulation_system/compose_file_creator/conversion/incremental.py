@@ -0,0 +1,221 @@
+"""Incremental conversion, rebuilding only services whose inputs changed.
+
+A snapshot stores, for every build step of a conversion, a hash of the inputs the
+step was built from and the service it produced. When the configuration is
+converted again with the snapshot, steps with unchanged inputs reuse the stored
+service, and the services of both conversions are compared to find the containers
+docker-compose has to recreate, create, or remove.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator import Service
+from emulation_system.compose_file_creator.types.intermediate_types import (
+    DockerServices,
+)
+from opentrons_pydantic_base_model import OpentronsBaseModel
+
+from ..output.runtime_compose_file_model import RuntimeComposeFileModel
+from .service_builders.service_orchestrator import BuildStep, ServiceOrchestrator
+
+RECREATE_STATUS = "recreate"
+NEW_STATUS = "new"
+ORPHANED_STATUS = "orphaned"
+
+
+class SnapshotStep(OpentronsBaseModel):
+    """Hash of the inputs of a build step and the service it built."""
+
+    input_hash: str
+    service: Dict
+
+
+class ServiceSnapshot(OpentronsBaseModel):
+    """Services of a conversion, keyed by build step name."""
+
+    environment_hash: str
+    steps: Dict[str, SnapshotStep] = {}
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "ServiceSnapshot":
+        """Parse from file."""
+        return cls.parse_file(file_path)
+
+    def to_file(self, file_path: str) -> None:
+        """Write snapshot to file_path."""
+        from emulation_system.atomic_file import write_file_atomically
+
+        write_file_atomically(file_path, self.json(sort_keys=True) + "\n")
+
+    @property
+    def services(self) -> Dict[str, Service]:
+        """Services in the snapshot keyed by container name."""
+        services = [Service.parse_obj(step.service) for step in self.steps.values()]
+        return {
+            service.container_name: service
+            for service in services
+            if service.container_name is not None
+        }
+
+
+@dataclass
+class ServiceDiff:
+    """Containers which changed between two conversions."""
+
+    recreate: List[str] = field(default_factory=list)
+    new: List[str] = field(default_factory=list)
+    orphaned: List[str] = field(default_factory=list)
+
+    @property
+    def changed_containers(self) -> List[str]:
+        """Containers docker-compose has to create or recreate."""
+        return self.recreate + self.new
+
+    def to_lines(self) -> List[str]:
+        """One "<status> <container name>" line per changed container."""
+        return (
+            [f"{RECREATE_STATUS} {name}" for name in self.recreate]
+            + [f"{NEW_STATUS} {name}" for name in self.new]
+            + [f"{ORPHANED_STATUS} {name}" for name in self.orphaned]
+        )
+
+
+def _hash(content: object) -> str:
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_environment_hash(dev: bool) -> str:
+    """Hash of everything outside the configuration file that affects services.
+
+    A snapshot created in a different environment is not reused.
+    """
+    from emulation_system.compose_cache import get_tool_version, hash_pipette_versions
+
+    return _hash(
+        {
+            "dev": dev,
+            "tool_version": get_tool_version(),
+            "pipette_versions": hash_pipette_versions(),
+        }
+    )
+
+
+def _get_shared_inputs(config_model: SystemConfigurationModel) -> Dict:
+    """Inputs every service is built from.
+
+    Modules only affect the services built for them, so they are left out. The
+    robot is included because most services are configured from it.
+    """
+    return {
+        "config": config_model.dict(exclude={"modules"}),
+        "sources": [
+            {
+                "build_args": source.generate_build_args(),
+                "fingerprint": source.generate_fingerprint_env_vars(),
+            }
+            for source in config_model.sources
+        ],
+    }
+
+
+def get_step_input_hashes(
+    config_model: SystemConfigurationModel, steps: List[BuildStep]
+) -> Dict[str, str]:
+    """Hash of the inputs of every step, keyed by step name."""
+    shared_inputs = _get_shared_inputs(config_model)
+    return {
+        step.name: _hash(
+            {
+                "shared": shared_inputs,
+                "step": step.name,
+                "container": step.container.dict()
+                if step.container is not None
+                else None,
+            }
+        )
+        for step in steps
+    }
+
+
+def diff_services(
+    previous: Dict[str, Service], current: Dict[str, Service]
+) -> ServiceDiff:
+    """Compare services keyed by container name."""
+    return ServiceDiff(
+        recreate=[
+            name
+            for name, service in current.items()
+            if name in previous
+            and previous[name].dict(exclude_none=True)
+            != service.dict(exclude_none=True)
+        ],
+        new=[name for name in current if name not in previous],
+        orphaned=[name for name in previous if name not in current],
+    )
+
+
+def convert_incrementally(
+    config_model: SystemConfigurationModel,
+    dev: bool,
+    previous: Optional[Union[ServiceSnapshot, SystemConfigurationModel]],
+    parallel: bool = False,
+) -> Tuple[RuntimeComposeFileModel, ServiceDiff, ServiceSnapshot]:
+    """Convert config_model, only rebuilding services whose inputs changed.
+
+    previous is either the snapshot of a previous conversion, or the configuration
+    it was converted from. Without a previous conversion every service is new.
+    Returns the compose file, the containers that changed since the previous
+    conversion, and the snapshot of this conversion.
+    """
+    from .conversion_functions import create_compose_file_model
+
+    if isinstance(previous, SystemConfigurationModel):
+        previous = convert_incrementally(previous, dev, None, parallel)[2]
+
+    environment_hash = get_environment_hash(dev)
+    previous_steps = (
+        previous.steps
+        if previous is not None and previous.environment_hash == environment_hash
+        else {}
+    )
+
+    orchestrator = ServiceOrchestrator(config_model, dev, parallel)
+    steps = orchestrator.get_build_steps()
+    input_hashes = get_step_input_hashes(config_model, steps)
+    built_services = orchestrator.build_steps(
+        steps,
+        reused_services={
+            step_name: Service.parse_obj(previous_steps[step_name].service)
+            for step_name, input_hash in input_hashes.items()
+            if step_name in previous_steps
+            and previous_steps[step_name].input_hash == input_hash
+        },
+    )
+
+    snapshot = ServiceSnapshot(
+        environment_hash=environment_hash,
+        steps={
+            step_name: SnapshotStep(
+                input_hash=input_hashes[step_name],
+                service=json.loads(service.json(exclude_none=True)),
+            )
+            for step_name, service in built_services.items()
+        },
+    )
+    services = DockerServices(
+        {
+            service.container_name: service
+            for service in built_services.values()
+            if service.container_name is not None
+        }
+    )
+    diff = diff_services(
+        previous.services if previous is not None else {}, dict(services)
+    )
+    return create_compose_file_model(config_model, services), diff, snapshot
@@ -1,16 +1,35 @@
-"""service_builders package."""
-from .can_server_service import CANServerService
-from .emulator_proxy_service import EmulatorProxyService
-from .input_services import InputServices
-from .monorepo_builder_service import MonorepoBuilderService
-from .opentrons_modules_builder_service import OpentronsModulesBuilderService
-from .ot3_firmware_builder_service import OT3FirmwareBuilderService
-from .ot3_services import OT3Services
-from .ot3_state_manager_service import OT3StateManagerService
-from .smoothie_service import SmoothieService
+"""service_builders package.
 
-from .service_orchestrator import ServiceOrchestrator  # isort:skip
+Builders are imported on first access so that ServiceOrchestrator only loads the
+builders required by the system it is building.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from .can_server_service import CANServerService
+    from .emulator_proxy_service import EmulatorProxyService
+    from .input_services import InputServices
+    from .monorepo_builder_service import MonorepoBuilderService
+    from .opentrons_modules_builder_service import OpentronsModulesBuilderService
+    from .ot3_firmware_builder_service import OT3FirmwareBuilderService
+    from .ot3_services import OT3Services
+    from .ot3_state_manager_service import OT3StateManagerService
+    from .service_orchestrator import ServiceOrchestrator
+    from .smoothie_service import SmoothieService
+
+_BUILDER_MODULES = {
+    "CANServerService": "can_server_service",
+    "EmulatorProxyService": "emulator_proxy_service",
+    "InputServices": "input_services",
+    "MonorepoBuilderService": "monorepo_builder_service",
+    "OpentronsModulesBuilderService": "opentrons_modules_builder_service",
+    "OT3FirmwareBuilderService": "ot3_firmware_builder_service",
+    "OT3Services": "ot3_services",
+    "OT3StateManagerService": "ot3_state_manager_service",
+    "ServiceOrchestrator": "service_orchestrator",
+    "SmoothieService": "smoothie_service",
+}
 
 __all__ = [
     "CANServerService",
@@ -24,3 +43,11 @@ __all__ = [
     "OT3FirmwareBuilderService",
     "OpentronsModulesBuilderService",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import builder on first access."""
+    if name in _BUILDER_MODULES:
+        module = importlib.import_module(f".{_BUILDER_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
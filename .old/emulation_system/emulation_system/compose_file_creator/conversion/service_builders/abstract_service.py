@@ -22,6 +22,10 @@ from emulation_system.compose_file_creator.input.hardware_models import (
     OT3InputModel,
 )
 from emulation_system.compose_file_creator.output.compose_file_model import ListOrDict
+from emulation_system.compose_file_creator.pipette_utils import (
+    RobotPipettes,
+    get_robot_pipettes,
+)
 from emulation_system.compose_file_creator.types.final_types import (
     ServiceBuild,
     ServiceContainerName,
@@ -51,12 +55,15 @@ from emulation_system.consts import (
     DOCKERFILE_NAME,
     ENTRYPOINT_FILE_LOCATION,
 )
+from emulation_system.profiling import span, timed
 from emulation_system.source import (
     MonorepoSource,
     OpentronsModulesSource,
     OT3FirmwareSource,
 )
 
+BUILD_SERVICE_SPAN = "build_service"
+
 
 class AbstractService(ABC):
     """Abstract class defining all necessary functions to build a service."""
@@ -117,6 +124,20 @@ class AbstractService(ABC):
         assert is_ot3(robot)
         return robot
 
+    def _get_robot_pipettes(self, robot: Robots) -> RobotPipettes:
+        """Pipettes attached to robot.
+
+        Versions are resolved against the pipette definitions of a local monorepo.
+        """
+        return get_robot_pipettes(
+            robot.hardware,
+            robot.left_pipette,
+            robot.right_pipette,
+            robot.left_pipette_version,
+            robot.right_pipette_version,
+            self._monorepo_source.pipette_definitions(),
+        )
+
     @property
     @abstractmethod
     def _image(self) -> str:
@@ -196,39 +217,43 @@ class AbstractService(ABC):
         ...
 
     def build_service(self) -> Service:
-        """Method calling all generate* methods to build Service object."""
-        intermediate_healthcheck = self.generate_healthcheck()
-
-        container_name = self.generate_container_name()
-        mounts = self.generate_volumes()
-        extra_mounts = self._config_model.extra_mounts
-
-        if len(extra_mounts) > 0:
-            mounts_to_add: List[str] = []
-
-            for mount in extra_mounts:
-                if container_name in mount.container_names:
-                    mounts_to_add.append(f"{mount.host_path}:{mount.container_path}")
-            if mounts is not None:
-                mounts.extend(mounts_to_add)
-            else:
-                mounts = mounts_to_add
-
-        return Service(
-            container_name=cast(ServiceContainerName, container_name),
-            image=cast(ServiceImage, self.generate_image()),
-            build=cast(ServiceBuild, self.generate_build()),
-            tty=cast(ServiceTTY, self.is_tty()),
-            volumes=cast(ServiceVolumes, mounts),
-            ports=cast(ServicePorts, self.generate_ports()),
-            environment=cast(ServiceEnvironment, self.generate_env_vars()),
-            networks=self.generate_networks(),
-            healthcheck=ServiceHealthcheck(
-                interval=f"{intermediate_healthcheck.interval}s",
-                retries=intermediate_healthcheck.retries,
-                timeout=f"{intermediate_healthcheck.timeout}s",
-                test=intermediate_healthcheck.command,
+        """Method calling all generate* methods to build Service object.
+
+        When profiling, the whole build and every generate* call are timed as spans.
+        """
+        with span(BUILD_SERVICE_SPAN, builder=type(self).__name__) as service_span:
+            intermediate_healthcheck = timed(self.generate_healthcheck)
+
+            container_name = timed(self.generate_container_name)
+            service_span.set_arg("container_name", container_name)
+            mounts = timed(self.generate_volumes)
+            extra_mounts = self._config_model.get_extra_mounts(container_name)
+
+            if len(extra_mounts) > 0:
+                mounts_to_add: List[str] = [
+                    f"{mount.host_path}:{mount.container_path}"
+                    for mount in extra_mounts
+                ]
+                if mounts is not None:
+                    mounts.extend(mounts_to_add)
+                else:
+                    mounts = mounts_to_add
+
+            return Service(
+                container_name=cast(ServiceContainerName, container_name),
+                image=cast(ServiceImage, timed(self.generate_image)),
+                build=cast(ServiceBuild, timed(self.generate_build)),
+                tty=cast(ServiceTTY, timed(self.is_tty)),
+                volumes=cast(ServiceVolumes, mounts),
+                ports=cast(ServicePorts, timed(self.generate_ports)),
+                environment=cast(ServiceEnvironment, timed(self.generate_env_vars)),
+                networks=timed(self.generate_networks),
+                healthcheck=ServiceHealthcheck(
+                    interval=f"{intermediate_healthcheck.interval}s",
+                    retries=intermediate_healthcheck.retries,
+                    timeout=f"{intermediate_healthcheck.timeout}s",
+                    test=intermediate_healthcheck.command,
+                )
+                if intermediate_healthcheck is not None
+                else None,
             )
-            if intermediate_healthcheck is not None
-            else None,
-        )
@@ -83,4 +83,5 @@ class MonorepoBuilderService(AbstractService):
                 "OPENTRONS_PROJECT": "ot3",
             }
 
+        env_vars.update(self._monorepo_source.generate_fingerprint_env_vars())
         return env_vars
@@ -77,4 +77,6 @@ class OpentronsModulesBuilderService(AbstractService):
 
     def generate_env_vars(self) -> Optional[IntermediateEnvironmentVariables]:
         """Generates value for environment parameter."""
-        return None
+        env_vars: IntermediateEnvironmentVariables = {}
+        env_vars.update(self._opentrons_modules_source.generate_fingerprint_env_vars())
+        return env_vars if len(env_vars) > 0 else None
@@ -2,9 +2,6 @@
 from typing import Optional
 
 from emulation_system import SystemConfigurationModel
-from emulation_system.compose_file_creator.pipette_utils import (
-    get_robot_pipettes,
-)
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateBuildArgs,
     IntermediateEnvironmentVariables,
@@ -92,9 +89,7 @@ class OT3FirmwareBuilderService(AbstractService):
         """Generates value for environment parameter."""
         robot = self._ot3
         env_vars: IntermediateEnvironmentVariables = {}
-        pipettes = get_robot_pipettes(
-            robot.hardware, robot.left_pipette, robot.right_pipette
-        )
+        pipettes = self._get_robot_pipettes(robot)
 
         if is_ot3(robot):
             env_vars = {
@@ -103,4 +98,5 @@ class OT3FirmwareBuilderService(AbstractService):
 
         env_vars.update(pipettes.get_left_pipette_env_var())
         env_vars.update(pipettes.get_right_pipette_env_var())
+        env_vars.update(self._ot3_source.generate_fingerprint_env_vars())
         return env_vars
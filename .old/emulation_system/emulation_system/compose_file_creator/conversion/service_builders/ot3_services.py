@@ -2,7 +2,6 @@
 from typing import Optional
 
 from emulation_system import SystemConfigurationModel
-from emulation_system.compose_file_creator.pipette_utils import get_robot_pipettes
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateBuildArgs,
     IntermediateEnvironmentVariables,
@@ -41,9 +40,7 @@ class OT3Services(AbstractService):
         self._ot3 = self.get_ot3(config_model)
         self._logging_client = OT3LoggingClient(service_info.ot3_hardware, self._dev)
         self._ot3_image = self._generate_image()
-        self._pipettes = get_robot_pipettes(
-            self._ot3.hardware, self._ot3.left_pipette, self._ot3.right_pipette
-        )
+        self._pipettes = self._get_robot_pipettes(self._ot3)
 
     def _generate_image(self) -> str:
         """Inner method for generating image.
@@ -1,5 +1,8 @@
 """Module containing ServiceOrchestrator class."""
-from typing import List, Optional
+import functools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, cast
 
 from emulation_system import SystemConfigurationModel
 from emulation_system.compose_file_creator import Service
@@ -13,23 +16,41 @@ from ...images import (
     OT3HeadImage,
     OT3PipettesImage,
 )
+from ...types.input_types import Containers
 from ...types.intermediate_types import DockerServices
-from . import (
-    CANServerService,
-    EmulatorProxyService,
-    InputServices,
-    MonorepoBuilderService,
-    OpentronsModulesBuilderService,
-    OT3FirmwareBuilderService,
-    OT3Services,
-    OT3StateManagerService,
-    SmoothieService,
-)
 from .service_info import ServiceInfo
 
+EMULATOR_PROXY_STEP = "emulator-proxy"
+SMOOTHIE_STEP = "smoothie"
+CAN_SERVER_STEP = "can-server"
+STATE_MANAGER_STEP = "state-manager"
+
+# Argument each dependency's container name is passed to dependent builders as
+DEPENDENCY_ARGUMENT_NAMES = {
+    EMULATOR_PROXY_STEP: "emulator_proxy_name",
+    SMOOTHIE_STEP: "smoothie_name",
+    CAN_SERVER_STEP: "can_server_service_name",
+    STATE_MANAGER_STEP: "state_manager_name",
+}
+
+
+@dataclass
+class BuildStep:
+    """A single service to build and the steps it depends on."""
+
+    name: str
+    build: Callable[..., Service]
+    dependencies: List[str] = field(default_factory=list)
+    # Container from the configuration file the service is built for, if any
+    container: Optional[Containers] = None
+
 
 class ServiceOrchestrator:
-    """Class that client uses to interface with builders."""
+    """Class that client uses to interface with builders.
+
+    Builders are imported by the methods using them, so only the builders required
+    by the system being built are loaded.
+    """
 
     OT3_SERVICES_TO_CREATE = [
         ServiceInfo(OT3HeadImage(), OT3Hardware.HEAD),
@@ -45,167 +66,313 @@ class ServiceOrchestrator:
         self,
         config_model: SystemConfigurationModel,
         dev: bool,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
     ) -> None:
-        """Instantiates a ServiceOrchestrator object."""
+        """Instantiates a ServiceOrchestrator object.
+
+        If parallel is True, services that do not depend on each other are built
+        concurrently by up to max_workers threads.
+        """
         self._config_model = config_model
         self._dev = dev
+        self._parallel = parallel
+        self._max_workers = max_workers
         self._services: DockerServices = {}
 
     def _build_can_server_service(self) -> Service:
         """Method to generate and return a CAN Server Service."""
+        from .can_server_service import CANServerService
+
         return CANServerService(self._config_model, self._dev).build_service()
 
     def _build_emulator_proxy_service(self) -> Service:
         """Method to generate and return an Emulator Proxy Service."""
+        from .emulator_proxy_service import EmulatorProxyService
+
         return EmulatorProxyService(self._config_model, self._dev).build_service()
 
     def _build_smoothie_service(self) -> Service:
         """Method to generate and return a Smoothie Service."""
+        from .smoothie_service import SmoothieService
+
         return SmoothieService(self._config_model, self._dev).build_service()
 
-    def _build_ot3_services(
-        self, can_server_service_name: str, state_manager_name: str
-    ) -> List[Service]:
-        """Generates OT-3 Firmware Services."""
-        return [
-            OT3Services(
-                self._config_model,
-                self._dev,
-                can_server_service_name,
-                state_manager_name,
-                service_info,
-            ).build_service()
-            for service_info in self.OT3_SERVICES_TO_CREATE
-        ]
+    def _build_ot3_service(
+        self,
+        can_server_service_name: str,
+        state_manager_name: str,
+        service_info: ServiceInfo,
+    ) -> Service:
+        """Generates a single OT-3 Firmware Service."""
+        from .ot3_services import OT3Services
+
+        return OT3Services(
+            self._config_model,
+            self._dev,
+            can_server_service_name,
+            state_manager_name,
+            service_info,
+        ).build_service()
 
     def _build_ot3_state_manager_service(self) -> Service:
+        from .ot3_state_manager_service import OT3StateManagerService
+
         return OT3StateManagerService(self._config_model, self._dev).build_service()
 
-    def _build_input_services(
+    def _build_input_service(
         self,
+        container: Containers,
         emulator_proxy_name: Optional[str],
-        smoothie_name: Optional[str],
-        can_server_service_name: Optional[str],
-    ) -> List[Service]:
-        """Build services directly specified in input file."""
-        return [
-            InputServices(
-                self._config_model,
-                self._dev,
+        smoothie_name: Optional[str] = None,
+        can_server_service_name: Optional[str] = None,
+    ) -> Service:
+        """Build a single service directly specified in input file."""
+        from .input_services import InputServices
+
+        return InputServices(
+            self._config_model,
+            self._dev,
+            container,
+            emulator_proxy_name,
+            smoothie_name,
+            can_server_service_name,
+        ).build_service()
+
+    def _build_ot3_firmware_builder(self) -> Service:
+        from .ot3_firmware_builder_service import OT3FirmwareBuilderService
+
+        return OT3FirmwareBuilderService(self._config_model, self._dev).build_service()
+
+    def _build_opentrons_modules_builder(self) -> Service:
+        from .opentrons_modules_builder_service import OpentronsModulesBuilderService
+
+        return OpentronsModulesBuilderService(
+            self._config_model, self._dev
+        ).build_service()
+
+    def _build_monorepo_builder(self) -> Service:
+        from .monorepo_builder_service import MonorepoBuilderService
+
+        return MonorepoBuilderService(self._config_model, self._dev).build_service()
+
+    def get_build_steps(self) -> List[BuildStep]:
+        """Every service to build, in the order they are added to the compose file.
+
+        Services which need the container name of another service list that
+        service's step as a dependency, which forms the build DAG.
+        """
+        steps = [BuildStep(EMULATOR_PROXY_STEP, self._build_emulator_proxy_service)]
+        input_dependencies = [EMULATOR_PROXY_STEP]
+
+        if self._config_model.has_ot2:
+            steps.append(BuildStep(SMOOTHIE_STEP, self._build_smoothie_service))
+            input_dependencies.append(SMOOTHIE_STEP)
+
+        if self._config_model.has_ot3:
+            steps.append(BuildStep(CAN_SERVER_STEP, self._build_can_server_service))
+            steps.append(
+                BuildStep(STATE_MANAGER_STEP, self._build_ot3_state_manager_service)
+            )
+            steps.extend(
+                BuildStep(
+                    service_info.ot3_hardware.value,
+                    functools.partial(
+                        self._build_ot3_service, service_info=service_info
+                    ),
+                    [CAN_SERVER_STEP, STATE_MANAGER_STEP],
+                )
+                for service_info in self.OT3_SERVICES_TO_CREATE
+            )
+            input_dependencies.append(CAN_SERVER_STEP)
+
+        steps.extend(
+            BuildStep(
+                f"input-{container.id}",
+                functools.partial(self._build_input_service, container),
+                input_dependencies,
                 container,
-                emulator_proxy_name,
-                smoothie_name,
-                can_server_service_name,
-            ).build_service()
+            )
             for container in self._config_model.containers.values()
-        ]
+        )
 
-    def _add_ot2_services(self) -> str:
-        smoothie_service = self._build_smoothie_service()
-        smoothie_name = smoothie_service.container_name
-        assert smoothie_name is not None
-        self._services[smoothie_name] = smoothie_service
+        if self._config_model.local_ot3_builder_required:
+            steps.append(
+                BuildStep("ot3-firmware-builder", self._build_ot3_firmware_builder)
+            )
 
-        return smoothie_name
+        if self._config_model.local_opentrons_modules_builder_required:
+            steps.append(
+                BuildStep(
+                    "opentrons-modules-builder", self._build_opentrons_modules_builder
+                )
+            )
 
-    def _add_ot3_services(self) -> str:
-        can_server_service = self._build_can_server_service()
-        can_server_service_name = can_server_service.container_name
-        ot3_state_manager_service = self._build_ot3_state_manager_service()
-        ot3_state_manager_service_name = ot3_state_manager_service.container_name
+        if self._config_model.local_monorepo_builder_required:
+            steps.append(BuildStep("monorepo-builder", self._build_monorepo_builder))
 
-        assert can_server_service_name is not None
-        assert ot3_state_manager_service_name is not None
+        return steps
 
-        ot3_services = self._build_ot3_services(
-            can_server_service_name, ot3_state_manager_service_name
+    @staticmethod
+    def _run_step(step: BuildStep, services: Dict[str, Service]) -> Service:
+        """Build step, passing it the container names of its dependencies."""
+        return step.build(
+            **{
+                DEPENDENCY_ARGUMENT_NAMES[dependency]: services[
+                    dependency
+                ].container_name
+                for dependency in step.dependencies
+            }
         )
-        self._services[can_server_service_name] = can_server_service
-        self._services[ot3_state_manager_service_name] = ot3_state_manager_service
-        for ot3_service in ot3_services:
-            assert ot3_service.container_name is not None
-            self._services[ot3_service.container_name] = ot3_service
 
-        return can_server_service_name
+    @staticmethod
+    def _check_dependencies_built(
+        steps: List[BuildStep], services: Dict[str, Service]
+    ) -> None:
+        """Raise UnbuildableStepsError for steps with dependencies not in services."""
+        from ...errors import UnbuildableStepsError
 
-    def _add_emulator_proxy_service(self) -> str:
-        emulator_proxy_service = self._build_emulator_proxy_service()
-        emulator_proxy_name = emulator_proxy_service.container_name
-        assert emulator_proxy_name is not None  # For mypy
-        self._services[emulator_proxy_name] = emulator_proxy_service
+        unsatisfied_dependencies: Dict[str, List[str]] = {}
+        for step in steps:
+            missing_dependencies = [
+                dependency
+                for dependency in step.dependencies
+                if dependency not in services
+            ]
+            if len(missing_dependencies) > 0:
+                unsatisfied_dependencies[step.name] = missing_dependencies
+        if len(unsatisfied_dependencies) > 0:
+            raise UnbuildableStepsError(unsatisfied_dependencies)
 
-        return emulator_proxy_name
+    def _build_serially(
+        self, steps: List[BuildStep], services: Dict[str, Service]
+    ) -> None:
+        for step in steps:
+            self._check_dependencies_built([step], services)
+            services[step.name] = self._run_step(step, services)
 
-    def _add_input_services(
-        self,
-        emulator_proxy_name: str,
-        smoothie_name: Optional[str],
-        can_server_service_name: Optional[str],
+    def _build_in_parallel(
+        self, steps: List[BuildStep], services: Dict[str, Service]
     ) -> None:
-        input_services = self._build_input_services(
-            emulator_proxy_name, smoothie_name, can_server_service_name
-        )
-        for service in input_services:
-            assert service.container_name is not None
-            self._services[service.container_name] = service
+        """Build every step as soon as its dependencies are built.
 
-    def _add_ot3_firmware_builder(self) -> None:
-        ot3_firmware_builder = OT3FirmwareBuilderService(
-            self._config_model, self._dev
-        ).build_service()
-        assert ot3_firmware_builder.container_name is not None
-        self._services[ot3_firmware_builder.container_name] = ot3_firmware_builder
+        Each step logs to its own buffer. Buffers are flushed in step order once
+        all steps are built, so the log matches the serial build. If a step fails,
+        the buffers of every step that ran, including the failed one, are still
+        flushed before the error is raised.
+        """
+        from ...logging.log_sink import MemoryLogSink, buffered_logging, get_log_sink
 
-    def _add_opentrons_modules_builder(self) -> None:
-        opentrons_modules_builder = OpentronsModulesBuilderService(
-            self._config_model, self._dev
-        ).build_service()
-        assert opentrons_modules_builder.container_name is not None
-        self._services[
-            opentrons_modules_builder.container_name
-        ] = opentrons_modules_builder
+        # Worker threads don't inherit the context the log sink is set in
+        log_sink = get_log_sink()
+        buffers: Dict[str, MemoryLogSink] = {}
 
-    def _add_monorepo_builder(self) -> None:
-        monorepo_builder = MonorepoBuilderService(
-            self._config_model, self._dev
-        ).build_service()
-        assert monorepo_builder.container_name is not None
-        self._services[monorepo_builder.container_name] = monorepo_builder
+        def run_buffered(step: BuildStep, services: Dict[str, Service]) -> Service:
+            if log_sink is None:
+                return self._run_step(step, services)
+            with buffered_logging() as buffer:
+                buffers[step.name] = buffer
+                return self._run_step(step, services)
 
-    def _confirm_all_extra_mounts_mapped(self, service_name_list: List[str]) -> None:
-        if len(self._config_model.extra_mounts) == 0:
+        pending = list(steps)
+        running: Dict[Future, str] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                while len(pending) > 0 or len(running) > 0:
+                    for step in [
+                        step
+                        for step in pending
+                        if all(
+                            dependency in services for dependency in step.dependencies
+                        )
+                    ]:
+                        pending.remove(step)
+                        # Copied because services keeps growing while the step runs
+                        # in another thread.
+                        running[
+                            executor.submit(run_buffered, step, dict(services))
+                        ] = step.name
+                    if len(running) == 0:
+                        # Nothing can run, so the pending steps never would
+                        self._check_dependencies_built(pending, services)
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        services[running.pop(future)] = future.result()
+        finally:
+            # Leaving the executor waits for running steps, so their buffers are
+            # complete.
+            if log_sink is not None:
+                for step in steps:
+                    if step.name in buffers:
+                        buffers[step.name].flush(log_sink)
+
+    @staticmethod
+    def _log_build_steps(
+        steps: List[BuildStep],
+        built_services: Dict[str, Service],
+        reused_step_names: List[str],
+    ) -> None:
+        """Logs how every step was built and the service it produced."""
+        from ...logging.log_sink import LogEvent, get_log_sink
+
+        log_sink = get_log_sink()
+        if log_sink is None:
             return
 
-        expected_container_names = set()
-        for mount in self._config_model.extra_mounts:
-            expected_container_names.update(mount.container_names)
+        for step in steps:
+            log_sink.write(
+                LogEvent(
+                    step.name,
+                    "build-step",
+                    built_services[step.name].dict(exclude_none=True),
+                    [
+                        "Reused from previous conversion."
+                        if step.name in reused_step_names
+                        else "Built.",
+                        f"Depends on: {step.dependencies}",
+                    ],
+                )
+            )
+
+    def build_steps(
+        self,
+        steps: List[BuildStep],
+        reused_services: Optional[Dict[str, Service]] = None,
+    ) -> Dict[str, Service]:
+        """Build services for steps. Returns services keyed by step name.
+
+        Steps in reused_services, keyed by step name, are not built again.
+        """
+        from ...logging.log_sink import LogLevel, get_log_level
 
-        service_name_set = set(service_name_list)
-        bad_mount_container_names = expected_container_names.difference(
-            service_name_set
+        services = dict(reused_services) if reused_services is not None else {}
+        reused_step_names = [step.name for step in steps if step.name in services]
+        steps_to_build = [step for step in steps if step.name not in services]
+        if self._parallel:
+            self._build_in_parallel(steps_to_build, services)
+        else:
+            self._build_serially(steps_to_build, services)
+        built_services = {step.name: services[step.name] for step in steps}
+        self._confirm_all_extra_mounts_mapped(
+            [cast(str, service.container_name) for service in built_services.values()]
         )
-        if len(bad_mount_container_names) > 0:
-            raise ValueError(
-                f'The following "container_names" specified in "extra-mounts" do not exist in the emulated system: {list(bad_mount_container_names)}'
-            )
+        if get_log_level() == LogLevel.VERBOSE:
+            self._log_build_steps(steps, built_services, reused_step_names)
+        return built_services
 
     def build_services(self) -> DockerServices:
         """Build services."""
-        emulator_proxy_name = self._add_emulator_proxy_service()
-        smoothie_name = self._add_ot2_services() if self._config_model.has_ot2 else None
-        can_server_service_name = (
-            self._add_ot3_services() if self._config_model.has_ot3 else None
-        )
-        self._add_input_services(
-            emulator_proxy_name, smoothie_name, can_server_service_name
-        )
-        if self._config_model.local_ot3_builder_required:
-            self._add_ot3_firmware_builder()
-
-        if self._config_model.local_opentrons_modules_builder_required:
-            self._add_opentrons_modules_builder()
-
-        if self._config_model.local_monorepo_builder_required:
-            self._add_monorepo_builder()
-        self._confirm_all_extra_mounts_mapped(list(self._services.keys()))
+        built_services = self.build_steps(self.get_build_steps())
+        for service in built_services.values():
+            assert service.container_name is not None  # For mypy
+            self._services[service.container_name] = service
         return DockerServices(self._services)
+
+    def _confirm_all_extra_mounts_mapped(self, service_name_list: List[str]) -> None:
+        bad_mount_container_names = (
+            self._config_model.extra_mount_container_names - set(service_name_list)
+        )
+        if len(bad_mount_container_names) > 0:
+            raise ValueError(
+                f'The following "container_names" specified in "extra-mounts" do not exist in the emulated system: {list(bad_mount_container_names)}'
+            )
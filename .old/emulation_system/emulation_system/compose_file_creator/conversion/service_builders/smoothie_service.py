@@ -3,7 +3,6 @@ from typing import Optional
 
 from emulation_system import SystemConfigurationModel
 from emulation_system.compose_file_creator.images import SmoothieImage
-from emulation_system.compose_file_creator.pipette_utils import get_robot_pipettes
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateBuildArgs,
     IntermediateEnvironmentVariables,
@@ -97,8 +96,8 @@ class SmoothieService(AbstractService):
     def generate_env_vars(self) -> Optional[IntermediateEnvironmentVariables]:
         """Generates value for environment parameter."""
         robot = self._ot2
-        env_vars: IntermediateEnvironmentVariables = get_robot_pipettes(
-            robot.hardware, robot.left_pipette, robot.right_pipette
+        env_vars: IntermediateEnvironmentVariables = self._get_robot_pipettes(
+            robot
         ).get_ot2_pipette_env_var(self.SMOOTHIE_DEFAULT_PORT)
 
         assert isinstance(self._config_model.robot, OT2InputModel)
@@ -1,6 +1,6 @@
 """One-stop shop for all errors."""
 
-from typing import List, Set
+from typing import Dict, List, Set
 
 from .config_file_settings import Hardware
 
@@ -135,3 +135,42 @@ class InvalidFilterError(Exception):
             f'\n\nFilter name "{filter_name}" is invalid.\n'
             f"Valid filter names are \n\t{valid_names}\n\n\tnot-{valid_not_names}\n"
         )
+
+
+class LockFileOutOfDateError(Exception):
+    """Exception thrown when lock file does not match the configuration file."""
+
+    def __init__(self, repo: str, locked_ref: str, configured_ref: str) -> None:
+        super().__init__(
+            f'Lock file pins "{repo}" to "{locked_ref}" but the configuration file '
+            f'specifies "{configured_ref}". Re-run the lock command to update it.'
+        )
+
+
+class MultipleDocumentsNotSupportedError(Exception):
+    """Exception thrown when an option only supports single-document inputs."""
+
+    def __init__(self, option: str) -> None:
+        super().__init__(
+            f"{option} can only be used when converting a single configuration."
+        )
+
+
+class NoLogFilesError(Exception):
+    """Exception thrown when there is no conversion log to render."""
+
+    def __init__(self, log_dir: str) -> None:
+        super().__init__(
+            f'No conversion logs found in "{log_dir}". Run emulation-system first '
+            "or pass the path of a log file."
+        )
+
+
+class UnbuildableStepsError(Exception):
+    """Exception thrown when build steps depend on steps that are never built."""
+
+    def __init__(self, unsatisfied_dependencies: Dict[str, List[str]]) -> None:
+        super().__init__(
+            "The following build steps depend on steps that are never built: "
+            f"{unsatisfied_dependencies}"
+        )
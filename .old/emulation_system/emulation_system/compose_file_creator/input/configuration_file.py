@@ -2,19 +2,26 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Any, Dict, List, Mapping, Optional, TypeGuard, cast
+from typing import AbstractSet, Any, Dict, List, Mapping, Optional, TypeGuard, cast
 
 import yaml
-from pydantic import Field, parse_file_as, parse_obj_as, root_validator
+from pydantic import Field, PrivateAttr, parse_file_as, parse_obj_as, root_validator
 
 from emulation_system.consts import DEFAULT_NETWORK_NAME
 from opentrons_pydantic_base_model import OpentronsBaseModel
 
-from ...source import MonorepoSource, OpentronsModulesSource, OT3FirmwareSource
+from ...source import (
+    MonorepoSource,
+    OpentronsModulesSource,
+    OpentronsSource,
+    OT3FirmwareSource,
+    prefetch_source_refs,
+)
 from ..config_file_settings import (
     EmulationLevels,
     ExtraMount,
     Hardware,
+    OpentronsRepository,
 )
 from ..errors import DuplicateHardwareNameError
 from ..types.input_types import Containers, Modules, Robots
@@ -28,6 +35,12 @@ from .hardware_models import (
     RobotInputModel,
 )
 
+SOURCE_FIELD_REPOS = {
+    "monorepo_source": OpentronsRepository.OPENTRONS,
+    "ot3_firmware_source": OpentronsRepository.OT3_FIRMWARE,
+    "opentrons_modules_source": OpentronsRepository.OPENTRONS_MODULES,
+}
+
 
 class SystemConfigurationModel(OpentronsBaseModel):
     """Model for overall system configuration specified in a JSON file.
@@ -49,6 +62,54 @@ class SystemConfigurationModel(OpentronsBaseModel):
     )
     extra_mounts: List[ExtraMount] = Field(default=[])
 
+    # Extra mounts keyed by the names of the containers they are mounted in. Built
+    # once, at validation time.
+    _extra_mounts_by_container_name: Dict[str, List[ExtraMount]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def __init__(self, **data: Any) -> None:  # noqa: ANN401
+        """Validate configuration and index extra mounts by container name."""
+        super().__init__(**data)
+        self._index_extra_mounts()
+
+    def _index_extra_mounts(self) -> None:
+        extra_mounts_by_container_name: Dict[str, List[ExtraMount]] = {}
+        for mount in self.extra_mounts:
+            # A container listed twice in the same mount only gets it once
+            for container_name in dict.fromkeys(mount.container_names):
+                extra_mounts_by_container_name.setdefault(container_name, []).append(
+                    mount
+                )
+        self._extra_mounts_by_container_name = extra_mounts_by_container_name
+
+    def get_extra_mounts(self, container_name: str) -> List[ExtraMount]:
+        """Extra mounts to add to the container named container_name."""
+        return self._extra_mounts_by_container_name.get(container_name, [])
+
+    @property
+    def extra_mount_container_names(self) -> AbstractSet[str]:
+        """Names of all containers extra mounts are added to."""
+        return self._extra_mounts_by_container_name.keys()
+
+    @root_validator(pre=True)
+    def prefetch_source_refs(cls, values) -> Dict[str, Any]:  # noqa: ANN001
+        """Look up git refs for all source fields at once.
+
+        Each source field is validated on its own and may need a git ls-remote call.
+        Fetching them all concurrently up front means validation of the individual
+        source fields reads already fetched ref lists instead of doing one network
+        round-trip per field.
+        """
+        source_locations = []
+        for field_name, repo in SOURCE_FIELD_REPOS.items():
+            alias = cls.__fields__[field_name].alias
+            source_location = values.get(alias, values.get(field_name))
+            if isinstance(source_location, str):
+                source_locations.append((source_location, repo))
+        prefetch_source_refs(source_locations)
+        return values
+
     @root_validator(pre=True)
     def validate_names(cls, values) -> Dict[str, Dict[str, Containers]]:  # noqa: ANN001
         """Checks all names in the config file and confirms there are no duplicates."""
@@ -145,6 +206,15 @@ class SystemConfigurationModel(OpentronsBaseModel):
         """Return hardware model by container id."""
         return self.containers[container_id]
 
+    @property
+    def sources(self) -> List[OpentronsSource]:
+        """All source objects of the configuration."""
+        return [
+            self.monorepo_source,
+            self.ot3_firmware_source,
+            self.opentrons_modules_source,
+        ]
+
     @property
     def is_remote(self) -> bool:
         """Checks if all modules and robots are remote."""
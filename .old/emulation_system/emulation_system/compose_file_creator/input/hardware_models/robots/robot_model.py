@@ -6,12 +6,15 @@ Used to group all robots together and distinguish them from modules.
 import abc
 from typing import TypeGuard
 
-from pydantic import Field
+from pydantic import Field, validator
 
 from emulation_system.compose_file_creator.images import get_image_name
 from emulation_system.compose_file_creator.input.hardware_models.hardware_specific_attributes import (
     HardwareSpecificAttributes,
 )
+from emulation_system.compose_file_creator.pipette_utils.definitions import (
+    PipetteVersion,
+)
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateEnvironmentVariables,
 )
@@ -24,6 +27,16 @@ class RobotAttributes(HardwareSpecificAttributes, abc.ABC):
 
     left_pipette: str | None
     right_pipette: str | None
+    # Pipette definition versions, e.g. "3.4". Defaults to the newest version.
+    left_pipette_version: str | None = None
+    right_pipette_version: str | None = None
+
+    @validator("left_pipette_version", "right_pipette_version")
+    def validate_pipette_version(cls, v: str | None) -> str | None:
+        """Confirm pipette version is formatted as "<major>.<minor>"."""
+        if v is not None:
+            PipetteVersion.parse(v)
+        return v
 
 
 class RobotInputModel(HardwareModel):
@@ -68,3 +81,13 @@ class RobotInputModel(HardwareModel):
     def left_pipette(self) -> str | None:
         """Return left pipette."""
         return self.hardware_specific_attributes.left_pipette
+
+    @property
+    def right_pipette_version(self) -> str | None:
+        """Return requested right pipette version."""
+        return self.hardware_specific_attributes.right_pipette_version
+
+    @property
+    def left_pipette_version(self) -> str | None:
+        """Return requested left pipette version."""
+        return self.hardware_specific_attributes.left_pipette_version
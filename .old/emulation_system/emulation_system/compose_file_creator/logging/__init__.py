@@ -1,9 +1,13 @@
 """Package containing all mechanisms for logging."""
-from .can_server_logging_client import CANServerLoggingClient
-from .emulator_proxy_logging_client import EmulatorProxyLoggingClient
-from .input_logging_client import InputLoggingClient
-from .ot3_logging_client import OT3LoggingClient
-from .smoothie_logging_client import SmoothieLoggingClient
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .can_server_logging_client import CANServerLoggingClient
+    from .emulator_proxy_logging_client import EmulatorProxyLoggingClient
+    from .input_logging_client import InputLoggingClient
+    from .ot3_logging_client import OT3LoggingClient
+    from .smoothie_logging_client import SmoothieLoggingClient
 
 __all__ = [
     "CANServerLoggingClient",
@@ -12,3 +16,22 @@ __all__ = [
     "OT3LoggingClient",
     "InputLoggingClient",
 ]
+
+_CLIENT_MODULES = {
+    "CANServerLoggingClient": "can_server_logging_client",
+    "EmulatorProxyLoggingClient": "emulator_proxy_logging_client",
+    "SmoothieLoggingClient": "smoothie_logging_client",
+    "OT3LoggingClient": "ot3_logging_client",
+    "InputLoggingClient": "input_logging_client",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import logging client on first access.
+
+    Keeps importing the log sink cheap, since it does not need any logging client.
+    """
+    if name in _CLIENT_MODULES:
+        module = importlib.import_module(f".{_CLIENT_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,8 @@
 """Contains Abstract Base Class for all logging clients."""
 
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Callable, Optional, cast
 
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateBuildArgs,
@@ -13,7 +14,30 @@ from emulation_system.compose_file_creator.types.intermediate_types import (
 )
 from emulation_system.consts import DEV_DOCKERFILE_NAME, DOCKERFILE_NAME
 
-from .console import logging_console
+from .log_sink import AbstractLogSink, LogEvent, get_log_sink
+
+LOG_METHOD_PREFIX = "log_"
+
+
+def _skip_when_disabled(log_method: Callable[..., None]) -> Callable[..., None]:
+    """Return before log_method builds any output if the client does not log."""
+
+    @functools.wraps(log_method)
+    def wrapper(
+        self: "AbstractLoggingClient", *args: Any, **kwargs: Any  # noqa: ANN401
+    ) -> None:
+        if self._log_sink is None:
+            return
+        log_method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _skip_log_methods_when_disabled(cls: type) -> None:
+    """Wrap every log method defined on cls with _skip_when_disabled."""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith(LOG_METHOD_PREFIX) and callable(attribute):
+            setattr(cls, name, _skip_when_disabled(attribute))
 
 
 class AbstractLoggingClient(ABC):
@@ -22,42 +46,49 @@ class AbstractLoggingClient(ABC):
     Defines all possible logging methods for ConcreteServiceBuilder classes to call.
     Each ConcreteServiceBuilder should use its own concrete implementation of
     AbstractLoggingClient.
+
+    Every log method writes LogEvents to the sink returned by get_log_sink(). If
+    there is no sink, every method starting with "log_", including the ones defined
+    by concrete implementations, returns immediately.
     """
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        """Make the log methods of concrete implementations skippable."""
+        super().__init_subclass__(**kwargs)
+        _skip_log_methods_when_disabled(cls)
+
     def __init__(self, service_builder_name: str, dev: bool) -> None:
         """Base __init__ method.
 
         Contains any parameters that are common to all concrete implementations of
         AbstractLoggingClient.
-        Calls log_header and log_dockerfile since all concrete implementations will need
-        to call it.
+        Calls log_dockerfile since all concrete implementations will need to call it.
 
         :param service_builder_name: The name of the ConcreteServiceBuilder you are using.
         :param dev: Whether you are in dev mode.
         """
         self._dev = dev
-        self._logging_console = logging_console
-        self.log_header(service_builder_name)
+        self._service_name = service_builder_name
+        self._log_sink = get_log_sink()
         self.log_dockerfile()
 
+    def _log_decision(
+        self, field: str, value: Any, *reason: str  # noqa: ANN401
+    ) -> None:
+        """Logs the value field is being set to and why."""
+        cast(AbstractLogSink, self._log_sink).write(
+            LogEvent(self._service_name, field, value, list(reason))
+        )
+
     def log_dockerfile(self) -> None:
         """Logs message detailing which dockerfile is being used and why."""
-        if self._dev:
-            output = [
-                f'Since "dev" is "true" setting build.dockerfile to '
-                f'"{DEV_DOCKERFILE_NAME}"'
-            ]
-        else:
-            output = [
-                f'Since "dev" is "false" setting build.dockerfile to '
-                f'"{DOCKERFILE_NAME}"'
-            ]
-        self._logging_console.h2_print("build.dockerfile")
-        self._logging_console.double_tabbed_print(*output)
-
-    def log_header(self, service_being_built: str) -> None:
-        """Logs header for ConcreteServiceBuilder."""
-        self._logging_console.h1_print(f"Creating Service for {service_being_built}")
+        dockerfile = DEV_DOCKERFILE_NAME if self._dev else DOCKERFILE_NAME
+        dev = "true" if self._dev else "false"
+        self._log_decision(
+            "build.dockerfile",
+            dockerfile,
+            f'Since "dev" is "{dev}" setting build.dockerfile to "{dockerfile}"',
+        )
 
     def log_container_name(
         self,
@@ -81,16 +112,11 @@ class AbstractLoggingClient(ABC):
                 f'Setting container name to "{final_container_name}".',
             ]
 
-        self._logging_console.h2_print("container_name")
-        self._logging_console.double_tabbed_print(*message)
+        self._log_decision("container_name", final_container_name, *message)
 
     def log_networks(self, networks: IntermediateNetworks) -> None:
         """Logs what networks are being added to Service."""
-        tabbed_networks = [f'\t"{network}"' for network in networks]
-        self._logging_console.h2_print("networks")
-        self._logging_console.double_tabbed_print(
-            "Adding the following networks:", *tabbed_networks
-        )
+        self._log_decision("networks", networks, "Adding the following networks:")
 
     def log_tty(self, is_tty: bool) -> None:
         """Logs what tty is being set to."""
@@ -98,8 +124,7 @@ class AbstractLoggingClient(ABC):
             val = "true"
         else:
             val = "false"
-        self._logging_console.h2_print("tty")
-        self._logging_console.double_tabbed_print(f'Setting tty to "{val}".')
+        self._log_decision("tty", is_tty, f'Setting tty to "{val}".')
 
     ############################################################################
     # Note that all below abstract logging methods have parallel methods in    #
@@ -135,3 +160,6 @@ class AbstractLoggingClient(ABC):
     ) -> None:
         """Logs what environment values are being set, if any, and why."""
         ...
+
+
+_skip_log_methods_when_disabled(AbstractLoggingClient)
@@ -2,17 +2,14 @@
 
 from __future__ import annotations
 
-import os
-from typing import Any, Dict, List, Tuple, cast
+from typing import Any, Dict, Iterable, List, Tuple, cast
 
 from rich.console import Console
 from rich.highlighter import RegexHighlighter
 from rich.pretty import pretty_repr
 
-from emulation_system.consts import ROOT_DIR
+from .log_sink import LogEvent
 
-CONSOLE_OUTPUT_HTML_FILE_PATH = os.path.join(ROOT_DIR, "compose_file_creator_log.html")
-CONSOLE_OUTPUT_TEXT_FILE_PATH = os.path.join(ROOT_DIR, "compose_file_creator_log.txt")
 TOP_LEVEL_HEADER_STYLE_STRING = "bold blue underline"
 SECOND_LEVEL_HEADER_STYLE_STRING = "bold yellow encircle"
 
@@ -112,14 +109,23 @@ class CustomConsole(Console):
         """Converts dictionary into a list of strings to pretty print."""
         return pretty_repr(dict_to_convert).split("\n")
 
-    def save_log(self) -> None:
-        """Saves generated log to file."""
-        self.save_html(CONSOLE_OUTPUT_HTML_FILE_PATH, clear=True, inline_styles=True)
 
-
-logging_console = CustomConsole(
-    width=200,
-    record=True,
-    highlighter=CustomHightlighter(),
-    file=open(CONSOLE_OUTPUT_TEXT_FILE_PATH, "wt"),
-)
+def _format_value(value: Any) -> List[str]:  # noqa: ANN401
+    """Lines displaying the value of a LogEvent below its reason."""
+    if isinstance(value, dict):
+        return CustomConsole.convert_dict(value)
+    if isinstance(value, list):
+        return [f"\t{item}" for item in value]
+    # Scalar values are already part of the reason
+    return []
+
+
+def render_log_events(events: Iterable[LogEvent], console: CustomConsole) -> None:
+    """Print events with a header for every service."""
+    service = None
+    for event in events:
+        if event.service != service:
+            service = event.service
+            console.h1_print(f"Creating Service for {service}")
+        console.h2_print(event.field)
+        console.double_tabbed_print(*event.reason, *_format_value(event.value))
@@ -31,50 +31,49 @@ class EmulatorProxyLoggingClient(AbstractLoggingClient):
 
         Overrides non-abstract parent method.
         """
-        self._logging_console.h2_print("image")
-        self._logging_console.double_tabbed_print(
+        self._log_decision(
+            "image",
+            image_name,
             f'Using image name "{image_name}" since emulator proxy always uses '
-            f"it's remote firmware image."
+            f"it's remote firmware image.",
         )
 
     def log_build_args(self, build_args: Optional[IntermediateBuildArgs]) -> None:
         """Logs what build args are being set and why."""
         assert build_args is not None
-        output = [
+        self._log_decision(
+            "build.args",
+            build_args,
             'Since "emulator-proxy" is always "remote", '
             "adding the following build args:",
-            *self._logging_console.convert_dict(build_args),
-        ]
-        self._logging_console.h2_print("build.args")
-        self._logging_console.double_tabbed_print(*output)
+        )
 
     def log_volumes(self, volumes: Optional[IntermediateVolumes]) -> None:
         """Logs that no volumes are being added."""
         assert volumes is None
-        output = ['Adding no volumes since "emulator-proxy" is always "remote".']
-        self._logging_console.h2_print("volumes")
-        self._logging_console.double_tabbed_print(*output)
+        self._log_decision(
+            "volumes",
+            volumes,
+            'Adding no volumes since "emulator-proxy" is always "remote".',
+        )
 
     def log_command(self, command: Optional[IntermediateCommand]) -> None:
         """Logs that no command is being added."""
         assert command is None
-        self._logging_console.h2_print("command")
-        self._logging_console.double_tabbed_print("Does not require command field.")
+        self._log_decision("command", command, "Does not require command field.")
 
     def log_ports(self, ports: Optional[IntermediatePorts]) -> None:
         """Logs that no ports are being added."""
         assert ports is None
-        self._logging_console.h2_print("ports")
-        self._logging_console.double_tabbed_print("Does not require ports field.")
+        self._log_decision("ports", ports, "Does not require ports field.")
 
     def log_env_vars(
         self, env_vars: Optional[IntermediateEnvironmentVariables]
     ) -> None:
         """Logs what environment variables are being added and why."""
         assert env_vars is not None
-        output = [
+        self._log_decision(
+            "environment",
+            env_vars,
             '"emulator-proxy" always requires env vars. Setting env vars to:',
-            *self._logging_console.convert_dict(env_vars),
-        ]
-        self._logging_console.h2_print("environment")
-        self._logging_console.double_tabbed_print(*output)
+        )
@@ -24,61 +24,41 @@ class InputLoggingClient(AbstractLoggingClient):
     def log_build_args(self, build_args: Optional[IntermediateBuildArgs]) -> None:
         """Logs what build args are being set and why."""
         if build_args is None:
-            output = ['Adding no build args since "source-type" is "local"']
+            reason = 'Adding no build args since "source-type" is "local"'
         else:
-            output = [
-                'Since "source-type" is "remote", ' "adding the following build args:",
-                *self._logging_console.convert_dict(build_args),
-            ]
-        self._logging_console.h2_print("build.args")
-        self._logging_console.double_tabbed_print(*output)
+            reason = 'Since "source-type" is "remote", adding the following build args:'
+        self._log_decision("build.args", build_args, reason)
 
     def log_volumes(self, volumes: Optional[IntermediateVolumes]) -> None:
         """Logs that no volumes are being added."""
         if volumes is None:
-            output = ["Adding no volumes."]
+            reason = "Adding no volumes."
         else:
-            tabbed_volumes = [f"\t{volume}" for volume in volumes]
-            output = [
-                "Adding the following volumes and bind mounts:",
-                *tabbed_volumes,
-            ]
-        self._logging_console.h2_print("volumes")
-        self._logging_console.double_tabbed_print(*output)
+            reason = "Adding the following volumes and bind mounts:"
+        self._log_decision("volumes", volumes, reason)
 
     def log_command(self, command: Optional[IntermediateCommand]) -> None:
         """Logs that no command is being added."""
-        output = []
         if command is None:
-            output.append("Does not require command field.")
+            reason = "Does not require command field."
         else:
-            output.append(f"Adding the following command: {command}")
-        self._logging_console.h2_print("command")
-        self._logging_console.double_tabbed_print(*output)
+            reason = f"Adding the following command: {command}"
+        self._log_decision("command", command, reason)
 
     def log_ports(self, ports: Optional[IntermediatePorts]) -> None:
         """Logs that no ports are being added."""
         if ports is None:
-            output = ["No ports will be exposed."]
+            reason = "No ports will be exposed."
         else:
-            tabbed_ports = [f'\t"{port}"' for port in ports]
-            output = [
-                'Since "exposed-port" is defined, adding the following ports:',
-                *tabbed_ports,
-            ]
-        self._logging_console.h2_print("ports")
-        self._logging_console.double_tabbed_print(*output)
+            reason = 'Since "exposed-port" is defined, adding the following ports:'
+        self._log_decision("ports", ports, reason)
 
     def log_env_vars(
         self, env_vars: Optional[IntermediateEnvironmentVariables]
     ) -> None:
         """Logs what environment variables are being added and why."""
         if env_vars is None:
-            output = ["No environment required."]
+            reason = "No environment required."
         else:
-            output = [
-                "Setting env vars to:",
-                *self._logging_console.convert_dict(env_vars),
-            ]
-        self._logging_console.h2_print("environment")
-        self._logging_console.double_tabbed_print(*output)
+            reason = "Setting env vars to:"
+        self._log_decision("environment", env_vars, reason)
@@ -0,0 +1,227 @@
+"""Structured log events and the sinks they are written to.
+
+Logging clients write a LogEvent for every decision made while building a service.
+A run writes its events as JSON lines to its own log file, so concurrent
+conversions never share a log. Events are only rendered to text or HTML on demand,
+by the "render-log" command.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import enum
+import glob
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import IO, Any, Iterator, List, Optional
+
+from emulation_system.consts import (
+    DEFAULT_LOG_DIR,
+    LOG_DIR_ENV_VAR_NAME,
+    LOG_LEVEL_ENV_VAR_NAME,
+    MAX_LOG_FILES,
+)
+
+LOG_FILE_EXTENSION = ".jsonl"
+
+
+class LogLevel(enum.IntEnum):
+    """How much is written to the conversion log.
+
+    QUIET: Nothing is logged and no log file is written.
+    NORMAL: Every decision made while building a service is logged.
+    VERBOSE: Also logs how build steps were run and the services they built.
+    """
+
+    QUIET = 0
+    NORMAL = 1
+    VERBOSE = 2
+
+    @classmethod
+    def from_name(cls, name: str) -> "LogLevel":
+        """Parse log level from its case-insensitive name."""
+        try:
+            return cls[name.upper()]
+        except KeyError:
+            raise ValueError(
+                f'"{name}" is not a valid log level. Valid log levels are: '
+                f"{[level.name.lower() for level in cls]}"
+            )
+
+
+def get_log_level() -> LogLevel:
+    """Log level set with the LOG_LEVEL_ENV_VAR_NAME environment variable.
+
+    Defaults to LogLevel.NORMAL.
+    """
+    name = os.environ.get(LOG_LEVEL_ENV_VAR_NAME)
+    return LogLevel.NORMAL if name is None else LogLevel.from_name(name)
+
+
+@dataclass
+class LogEvent:
+    """Value a field of a service was set to and the reason for it."""
+
+    service: str
+    field: str
+    value: Any
+    reason: List[str]
+
+    def to_json(self) -> str:
+        """Serialize to a single line of JSON."""
+        return json.dumps(
+            {
+                "service": self.service,
+                "field": self.field,
+                "value": self.value,
+                "reason": self.reason,
+            },
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> LogEvent:
+        """Parse event serialized with to_json."""
+        return cls(**json.loads(line))
+
+
+class AbstractLogSink(ABC):
+    """Destination of log events."""
+
+    @abstractmethod
+    def write(self, event: LogEvent) -> None:
+        """Write a single event."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
+
+
+class MemoryLogSink(AbstractLogSink):
+    """Keeps events in memory."""
+
+    def __init__(self) -> None:
+        """Creates an empty sink."""
+        self.events: List[LogEvent] = []
+
+    def write(self, event: LogEvent) -> None:
+        """Append event to events."""
+        self.events.append(event)
+
+    def flush(self, sink: AbstractLogSink) -> None:
+        """Write all events to sink, in the order they were logged."""
+        for event in self.events:
+            sink.write(event)
+        self.events.clear()
+
+
+class JSONLinesLogSink(AbstractLogSink):
+    """Writes one JSON object per event to a file.
+
+    The file is created by the first write, so runs that log nothing leave no file
+    behind.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Creates sink writing to path."""
+        self.path = path
+        self._file: Optional[IO[str]] = None
+
+    def write(self, event: LogEvent) -> None:
+        """Append event to the file."""
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "w")
+        self._file.write(event.to_json() + "\n")
+
+    def close(self) -> None:
+        """Close the file, if it was created."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_log_events(path: str) -> Iterator[LogEvent]:
+    """Events written to path by a JSONLinesLogSink."""
+    with open(path, "r") as log_file:
+        for line in log_file:
+            if line.strip():
+                yield LogEvent.from_json(line)
+
+
+_active_sink: ContextVar[Optional[AbstractLogSink]] = ContextVar(
+    "active_sink", default=None
+)
+
+
+@contextlib.contextmanager
+def log_to(sink: AbstractLogSink) -> Iterator[AbstractLogSink]:
+    """Send everything logged in the current context to sink."""
+    token = _active_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _active_sink.reset(token)
+
+
+@contextlib.contextmanager
+def buffered_logging() -> Iterator[MemoryLogSink]:
+    """Buffers everything logged in the current context until flushed.
+
+    Used when services are built concurrently, so that each service's events are
+    written as one block in a deterministic order.
+    """
+    buffer = MemoryLogSink()
+    with log_to(buffer):
+        yield buffer
+
+
+def get_log_sink() -> Optional[AbstractLogSink]:
+    """Sink events logged in the current context are written to.
+
+    Returns None if nothing should be logged, either because the log level is
+    LogLevel.QUIET or because no sink was set with log_to().
+    """
+    if get_log_level() == LogLevel.QUIET:
+        return None
+    return _active_sink.get()
+
+
+def get_log_dir() -> str:
+    """Directory every run writes its log file to."""
+    return os.environ.get(LOG_DIR_ENV_VAR_NAME, DEFAULT_LOG_DIR)
+
+
+def _get_log_paths(log_dir: str) -> List[str]:
+    """Log files in log_dir, oldest first."""
+    return sorted(
+        glob.glob(os.path.join(log_dir, f"*{LOG_FILE_EXTENSION}")),
+        key=os.path.getmtime,
+    )
+
+
+def get_latest_log_path() -> Optional[str]:
+    """Log file of the most recent run, if there is one."""
+    log_paths = _get_log_paths(get_log_dir())
+    return log_paths[-1] if len(log_paths) > 0 else None
+
+
+def create_run_log_sink() -> JSONLinesLogSink:
+    """Sink writing to a new log file in the log directory.
+
+    The oldest log files are removed, so that at most MAX_LOG_FILES are kept.
+    """
+    log_dir = get_log_dir()
+    old_log_paths = _get_log_paths(log_dir)
+    for log_path in old_log_paths[: max(len(old_log_paths) - MAX_LOG_FILES + 1, 0)]:
+        with contextlib.suppress(OSError):
+            os.remove(log_path)
+
+    file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    return JSONLinesLogSink(os.path.join(log_dir, file_name + LOG_FILE_EXTENSION))
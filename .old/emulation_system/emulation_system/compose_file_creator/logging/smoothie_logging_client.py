@@ -27,49 +27,39 @@ class SmoothieLoggingClient(AbstractLoggingClient):
     def log_build_args(self, build_args: Optional[IntermediateBuildArgs]) -> None:
         """Logs what build args are being set and why."""
         if build_args is None:
-            output = ['Adding no build args since "source-type" is "local"']
+            reason = 'Adding no build args since "source-type" is "local"'
         else:
-            output = [
-                'Since "source-type" is "remote", ' "adding the following build args:",
-                *self._logging_console.convert_dict(build_args),
-            ]
-        self._logging_console.h2_print("build.args")
-        self._logging_console.double_tabbed_print(*output)
+            reason = 'Since "source-type" is "remote", adding the following build args:'
+        self._log_decision("build.args", build_args, reason)
 
     def log_volumes(self, volumes: Optional[IntermediateVolumes]) -> None:
         """Logs that no volumes are being added."""
         if volumes is None:
-            output = ['Adding no volumes since "source-type" is "remote".']
+            reason = 'Adding no volumes since "source-type" is "remote".'
         else:
-            tabbed_volumes = [f"\t{volume}" for volume in volumes]
-            output = [
+            reason = (
                 'Since "source-type" is "remote",'
-                "adding the following volumes and bind mounts:",
-                *tabbed_volumes,
-            ]
-        self._logging_console.h2_print("volumes")
-        self._logging_console.double_tabbed_print(*output)
+                "adding the following volumes and bind mounts:"
+            )
+        self._log_decision("volumes", volumes, reason)
 
     def log_command(self, command: Optional[IntermediateCommand]) -> None:
         """Logs that no command is being added."""
         assert command is None
-        self._logging_console.h2_print("command")
-        self._logging_console.double_tabbed_print("Does not require command field.")
+        self._log_decision("command", command, "Does not require command field.")
 
     def log_ports(self, ports: Optional[IntermediatePorts]) -> None:
         """Logs that no ports are being added."""
         assert ports is None
-        self._logging_console.h2_print("ports")
-        self._logging_console.double_tabbed_print("Does not require ports field.")
+        self._log_decision("ports", ports, "Does not require ports field.")
 
     def log_env_vars(
         self, env_vars: Optional[IntermediateEnvironmentVariables]
     ) -> None:
         """Logs what environment variables are being added and why."""
         assert env_vars is not None
-        output = [
+        self._log_decision(
+            "environment",
+            env_vars,
             '"smoothie" always requires env vars. Setting env vars to:',
-            *self._logging_console.convert_dict(env_vars),
-        ]
-        self._logging_console.h2_print("environment")
-        self._logging_console.double_tabbed_print(*output)
+        )
@@ -1,7 +1,8 @@
 """Adds functions to generated compose_file_model."""
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
+from pydantic import PrivateAttr
 
 from emulation_system.compose_file_creator import Service
 from emulation_system.compose_file_creator.container_filters import ContainerFilters
@@ -13,15 +14,78 @@ from ..utilities.yaml_utils import OpentronsEmulationYamlDumper
 # and Service do not exist when they actually do.
 from .compose_file_model import ComposeSpecification  # type: ignore[attr-defined]
 
+FilterIndex = Dict[str, List[Service]]
+
+
+class VersionedServices(Dict[str, Service]):
+    """Dict of services which counts how many times it has been mutated.
+
+    Lets RuntimeComposeFileModel tell whether its filter index is out of date
+    without comparing every service. Merge services with update(), "|=" uses the
+    implementation of dict and is not counted.
+    """
+
+    version = 0
+
+    def __setitem__(self, key: str, value: Service) -> None:
+        """Set service and bump version."""
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        """Delete service and bump version."""
+        super().__delitem__(key)
+        self.version += 1
+
+    def clear(self) -> None:
+        """Remove all services and bump version."""
+        super().clear()
+        self.version += 1
+
+    def pop(self, *args: Any) -> Any:  # noqa: ANN401
+        """Pop service and bump version."""
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Service]:
+        """Pop last service and bump version."""
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(  # type: ignore[override]
+        self, key: str, default: Service
+    ) -> Service:
+        """Set service if missing and bump version."""
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Update services and bump version."""
+        super().update(*args, **kwargs)
+        self.version += 1
+
 
 class RuntimeComposeFileModel(ComposeSpecification):
     """Class to add functionality to generated ComposeSpecification model."""
 
     is_remote: bool
 
+    # Filter name, including "not-" inverses, to matching services. Built on first
+    # lookup and rebuilt once services are changed.
+    _filter_index: Optional[FilterIndex] = PrivateAttr(default=None)
+    _filter_index_key: Optional[Tuple[int, int]] = PrivateAttr(default=None)
+
     def __init__(self, **data: Any) -> None:  # noqa: ANN401
         """Initialize ComposeSpecification."""
         super().__init__(**data)
+        if self.services is not None:
+            self.services = self.services
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Track mutations of services so the filter index can be rebuilt."""
+        if name == "services" and value is not None:
+            value = VersionedServices(value)
+        super().__setattr__(name, value)
 
     def to_yaml(self) -> str:
         """Convert pydantic model to yaml."""
@@ -31,6 +95,13 @@ class RuntimeComposeFileModel(ComposeSpecification):
             Dumper=OpentronsEmulationYamlDumper
         )
 
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Convert pydantic model to json.
+
+        Single line json, unless indent is passed.
+        """
+        return self.json(exclude={"is_remote"}, exclude_none=True, indent=indent)
+
     @property
     def robot_server(self) -> Optional[Service]:
         """Returns robot server service if one exists."""
@@ -242,6 +313,30 @@ class RuntimeComposeFileModel(ComposeSpecification):
             ContainerFilters.MONOREPO_CONTAINERS.container_filter_name,
         )
 
+    def _build_filter_index(self, services: List[Service]) -> FilterIndex:
+        """Services matching every filter and the inverse of every filter."""
+        filter_index: FilterIndex = {}
+        for container_filter in ContainerFilters:
+            filter_name = container_filter.container_filter_name
+            matching_services = ContainerFilters.filter_services(filter_name, services)
+            matching_ids = {id(service) for service in matching_services}
+            filter_index[filter_name] = matching_services
+            filter_index[f"not-{filter_name}"] = [
+                service for service in services if id(service) not in matching_ids
+            ]
+        return filter_index
+
+    @property
+    def filter_index(self) -> FilterIndex:
+        """Services matching each filter name, including "not-" inverses."""
+        services = self.services
+        assert isinstance(services, VersionedServices)
+        filter_index_key = (id(services), services.version)
+        if self._filter_index is None or self._filter_index_key != filter_index_key:
+            self._filter_index = self._build_filter_index(list(services.values()))
+            self._filter_index_key = filter_index_key
+        return self._filter_index
+
     def load_containers_by_filter(
         self,
         container_filter: str,
@@ -249,4 +344,10 @@ class RuntimeComposeFileModel(ComposeSpecification):
         """Get a list of services based on filter string."""
         services = self.services
         assert services is not None
-        return ContainerFilters.filter_services(container_filter, list(services.values()))
+        filter_index = self.filter_index
+        if container_filter in filter_index:
+            return list(filter_index[container_filter])
+        # Raises InvalidFilterError for unknown filters
+        return ContainerFilters.filter_services(
+            container_filter, list(services.values())
+        )
@@ -1,35 +1,131 @@
 """Module for pipette utilities."""
 
 
+import threading
 from enum import Enum
+from typing import Dict, Optional, Tuple
 
 from emulation_system.compose_file_creator.pipette_utils.data_models import (
     PipetteInfo,
     RobotPipettes,
+    _get_date_string,
+)
+from emulation_system.compose_file_creator.pipette_utils.definitions import (
+    PipetteDefinitionIndex,
+    PipetteVersion,
 )
 from emulation_system.compose_file_creator.pipette_utils.lookups import (
     OT2PipetteLookup,
     OT3PipetteLookup,
+    get_pipette_version_registry,
     lookup_pipette,
 )
 
+# Keyed by robot type, both pipettes and their requested versions, and the
+# fingerprint of the pipette definitions they were resolved against. Only holds
+# pipettes created for a single (pipette versions file mtime, date) generation,
+# since those change the model and serial code of the pipettes.
+_RobotPipettesKey = Tuple[
+    str, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]
+]
+_robot_pipettes_cache: Dict[_RobotPipettesKey, RobotPipettes] = {}
+_robot_pipettes_cache_generation: Optional[Tuple[int, str]] = None
+_robot_pipettes_cache_lock = threading.Lock()
+
 
 def get_robot_pipettes(
-    robot_type: str, left_pipette: str | None, right_pipette: str | None
+    robot_type: str,
+    left_pipette: str | None,
+    right_pipette: str | None,
+    left_pipette_version: str | None = None,
+    right_pipette_version: str | None = None,
+    definitions: PipetteDefinitionIndex | None = None,
 ) -> RobotPipettes:
-    """Gets pipettes for robot."""
-    left_pipette_info = (
-        None
-        if left_pipette is None
-        else PipetteInfo.from_pipette_lookup(lookup_pipette(left_pipette, robot_type))
+    """Gets pipettes for robot.
+
+    Pipette versions are resolved against definitions, if passed. See
+    resolve_pipette_version.
+
+    Results are shared between callers asking for the same pipettes, so they must
+    not be modified.
+    """
+    global _robot_pipettes_cache_generation
+    generation = (get_pipette_version_registry().refresh(), _get_date_string())
+    key: _RobotPipettesKey = (
+        robot_type,
+        left_pipette,
+        right_pipette,
+        left_pipette_version,
+        right_pipette_version,
+        None if definitions is None else definitions.fingerprint,
     )
-    right_pipette_info = (
-        None
-        if not right_pipette is not None
-        else PipetteInfo.from_pipette_lookup(lookup_pipette(right_pipette, robot_type))
+    with _robot_pipettes_cache_lock:
+        if generation != _robot_pipettes_cache_generation:
+            _robot_pipettes_cache.clear()
+            _robot_pipettes_cache_generation = generation
+        cached = _robot_pipettes_cache.get(key)
+    if cached is not None:
+        return cached
+
+    robot_pipettes = RobotPipettes(
+        left=_create_pipette_info(
+            robot_type, left_pipette, left_pipette_version, definitions
+        ),
+        right=_create_pipette_info(
+            robot_type, right_pipette, right_pipette_version, definitions
+        ),
     )
+    with _robot_pipettes_cache_lock:
+        if generation != _robot_pipettes_cache_generation:
+            return robot_pipettes
+        return _robot_pipettes_cache.setdefault(key, robot_pipettes)
+
 
-    return RobotPipettes(left=left_pipette_info, right=right_pipette_info)
+def resolve_pipette_version(
+    robot_type: str,
+    pipette_name: str,
+    requested_version: str | None,
+    definitions: PipetteDefinitionIndex | None,
+) -> PipetteVersion | None:
+    """Version of definition to use for a pipette.
+
+    A requested version must exist in definitions, if passed. Without a requested
+    version the newest version in definitions is used. Returns None if neither
+    pick a version, meaning the model in pipette_versions.json should be used.
+    """
+    if requested_version is None:
+        if definitions is None:
+            return None
+        return definitions.get_latest_version(robot_type, pipette_name)
+
+    version = PipetteVersion.parse(requested_version)
+    if definitions is not None:
+        available_versions = definitions.get_versions(robot_type, pipette_name)
+        if version not in available_versions:
+            raise ValueError(
+                f'Could not find version "{version}" of pipette "{pipette_name}" in '
+                f"the local pipette definitions. Available versions are: "
+                f"{[str(available) for available in available_versions]}"
+            )
+    return version
+
+
+def _create_pipette_info(
+    robot_type: str,
+    pipette: str | None,
+    requested_version: str | None,
+    definitions: PipetteDefinitionIndex | None,
+) -> PipetteInfo | None:
+    """Looks up pipette and the version of its definition."""
+    if pipette is None:
+        return None
+    pipette_lookup = lookup_pipette(pipette, robot_type)
+    return PipetteInfo.from_pipette_lookup(
+        pipette_lookup,
+        resolve_pipette_version(
+            robot_type, pipette_lookup.pipette_name, requested_version, definitions
+        ),
+    )
 
 
 def get_valid_ot2_pipettes() -> Enum:
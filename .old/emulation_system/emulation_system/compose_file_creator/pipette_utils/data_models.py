@@ -4,8 +4,11 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from string import Template
-from typing import Dict, List, Literal, Union
+from typing import Dict, List, Literal, Optional, Union
 
+from emulation_system.compose_file_creator.pipette_utils.definitions import (
+    PipetteVersion,
+)
 from emulation_system.compose_file_creator.pipette_utils.lookups import (
     OT2PipetteLookup,
     OT3PipetteLookup,
@@ -15,7 +18,7 @@ from emulation_system.compose_file_creator.pipette_utils.lookups import (
 from emulation_system.compose_file_creator.types.intermediate_types import (
     IntermediateEnvironmentVariables,
 )
-from emulation_system.consts import EEPROM_FILE_NAME
+from emulation_system.consts import DATE_STRING_FORMAT, EEPROM_FILE_NAME
 
 OT3_SERIAL_CODE_MIN_CHARS = 1
 OT3_SERIAL_CODE_MAX_CHARS = 12
@@ -27,7 +30,7 @@ RIGHT_PIPETTE_ENV_VAR_NAME = "RIGHT_OT3_PIPETTE_DEFINITION"
 
 def _get_date_string() -> str:
     """Gets todays date string in the format of MMDDYYYY."""
-    return datetime.now().strftime("%m%d%Y")
+    return datetime.now().strftime(DATE_STRING_FORMAT)
 
 
 def _get_eeprom_file_name() -> str:
@@ -57,16 +60,29 @@ class PipetteInfo:
 
     @classmethod
     def from_pipette_lookup(
-        cls, pipette_lookup: Union["OT2PipetteLookup", "OT3PipetteLookup"]
+        cls,
+        pipette_lookup: Union["OT2PipetteLookup", "OT3PipetteLookup"],
+        version: Optional[PipetteVersion] = None,
     ) -> "PipetteInfo":
-        """Creates pipette info from pipette lookup."""
+        """Creates pipette info from pipette lookup.
+
+        If version is None, the model from pipette_versions.json is used.
+        """
+        if version is None:
+            version = PipetteVersion.from_model(pipette_lookup.get_pipette_model())
         if isinstance(pipette_lookup, OT3PipetteLookup):
+            if not OT3_MODEL_MIN_VALUE <= version.model <= OT3_MODEL_MAX_VALUE:
+                raise ValueError(
+                    f'Version "{version}" of pipette "{pipette_lookup.pipette_name}" '
+                    f"has model number {version.model}, but OT-3 pipette models "
+                    f"must be between {OT3_MODEL_MIN_VALUE} and {OT3_MODEL_MAX_VALUE}."
+                )
             return cls(
                 display_name=pipette_lookup.display_name,
                 internal_name=pipette_lookup.pipette_name,
                 restrictions=pipette_lookup.pipette_restrictions,
                 pipette_type=pipette_lookup.pipette_type,
-                model=pipette_lookup.get_pipette_model(),
+                model=version.model,
                 serial_code=_get_date_string(),
                 eeprom_file_name=_get_eeprom_file_name(),
             )
@@ -76,10 +92,12 @@ class PipetteInfo:
                 internal_name=pipette_lookup.pipette_name,
                 restrictions=pipette_lookup.pipette_restrictions,
                 pipette_type=pipette_lookup.pipette_type,
-                model=pipette_lookup.get_pipette_model(),
+                model=version.model,
                 serial_code=_get_date_string(),
                 eeprom_file_name=_get_eeprom_file_name(),
-                versioned_name_string=pipette_lookup.versioned_pipette_string,
+                versioned_name_string=pipette_lookup.get_versioned_pipette_string(
+                    version
+                ),
             )
 
     @classmethod
@@ -0,0 +1,207 @@
+"""Index of pipette definitions in a local copy of the monorepo's shared-data.
+
+Definitions are laid out as <channels>/<pipette>/<major>_<minor>.json under
+PIPETTE_DEFINITIONS_RELATIVE_PATH, so the index is built from file names alone and
+no definition is parsed. The index is cached on disk under the fingerprint of the
+definitions directory, and only rebuilt when a definition is added, removed or
+changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.consts import (
+    DEFAULT_PIPETTE_DEFINITIONS_CACHE_DIR,
+    PIPETTE_DEFINITIONS_CACHE_DIR_ENV_VAR_NAME,
+    PIPETTE_DEFINITIONS_RELATIVE_PATH,
+)
+from emulation_system.source_fingerprint import compute_source_fingerprint
+
+# Suffix of the internal pipette name for each channels directory,
+# e.g. single_channel/p50 is p50_single.
+CHANNELS_DIR_SUFFIXES = {
+    "single_channel": "single",
+    "eight_channel": "multi",
+    "ninety_six_channel": "96",
+}
+# Gen 3 pipettes, major version 3 and up, are the OT-3's. Older ones are the OT-2's.
+OT3_MIN_MAJOR_VERSION = 3
+
+DEFINITION_FILE_NAME_REGEX = re.compile(r"^(\d+)_(\d+)\.json$")
+VERSION_STRING_REGEX = re.compile(r"^(\d+)\.(\d+)$")
+
+
+@dataclass(frozen=True, order=True)
+class PipetteVersion:
+    """Version of a pipette definition, e.g. 3.4 for definition file 3_4.json."""
+
+    major: int
+    minor: int
+
+    @classmethod
+    def parse(cls, version: str) -> PipetteVersion:
+        """Parse version from a string like "3.4"."""
+        match = VERSION_STRING_REGEX.match(version)
+        if match is None:
+            raise ValueError(
+                f'"{version}" is not a valid pipette version. '
+                'Versions are formatted as "<major>.<minor>", e.g. "3.4".'
+            )
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    @classmethod
+    def from_model(cls, model: int) -> PipetteVersion:
+        """Version from a model number in pipette_versions.json, e.g. 34 is 3.4."""
+        string_model = str(model)
+        return cls(int(string_model[0]), int(string_model[1:]))
+
+    @property
+    def model(self) -> int:
+        """Model number, the version with the dot removed, e.g. 3.4 is 34."""
+        return int(f"{self.major}{self.minor}")
+
+    def is_for_robot(self, robot_type: str) -> bool:
+        """Whether pipettes with this version are used by robot_type."""
+        is_ot3_version = self.major >= OT3_MIN_MAJOR_VERSION
+        return is_ot3_version if robot_type == "ot3" else not is_ot3_version
+
+    def __str__(self) -> str:
+        """Version formatted as "<major>.<minor>"."""
+        return f"{self.major}.{self.minor}"
+
+
+@dataclass(frozen=True)
+class PipetteDefinitionIndex:
+    """Versions of every pipette in a definitions directory.
+
+    versions maps internal pipette names, e.g. p50_single, to their versions,
+    oldest first.
+    """
+
+    fingerprint: str
+    versions: Dict[str, List[PipetteVersion]]
+
+    def get_versions(self, robot_type: str, pipette_name: str) -> List[PipetteVersion]:
+        """Versions of pipette_name used by robot_type, oldest first."""
+        return [
+            version
+            for version in self.versions.get(pipette_name, [])
+            if version.is_for_robot(robot_type)
+        ]
+
+    def get_latest_version(
+        self, robot_type: str, pipette_name: str
+    ) -> Optional[PipetteVersion]:
+        """Newest version of pipette_name used by robot_type, if there is one."""
+        versions = self.get_versions(robot_type, pipette_name)
+        return versions[-1] if len(versions) > 0 else None
+
+    def to_json(self) -> str:
+        """Serialize to compact JSON, versions as [major, minor] pairs."""
+        return json.dumps(
+            {
+                "fingerprint": self.fingerprint,
+                "versions": {
+                    pipette_name: [
+                        [version.major, version.minor] for version in versions
+                    ]
+                    for pipette_name, versions in self.versions.items()
+                },
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, content: str) -> PipetteDefinitionIndex:
+        """Parse index serialized with to_json."""
+        parsed = json.loads(content)
+        return cls(
+            fingerprint=parsed["fingerprint"],
+            versions={
+                pipette_name: [
+                    PipetteVersion(major, minor) for major, minor in versions
+                ]
+                for pipette_name, versions in parsed["versions"].items()
+            },
+        )
+
+
+def _scan_definitions(definitions_dir: str) -> Dict[str, List[PipetteVersion]]:
+    """Versions of every pipette, read from the definition file names."""
+    versions: Dict[str, List[PipetteVersion]] = {}
+    for channels_dir, suffix in CHANNELS_DIR_SUFFIXES.items():
+        channels_path = os.path.join(definitions_dir, channels_dir)
+        if not os.path.isdir(channels_path):
+            continue
+        for pipette in sorted(os.listdir(channels_path)):
+            pipette_path = os.path.join(channels_path, pipette)
+            if not os.path.isdir(pipette_path):
+                continue
+            matches = [
+                DEFINITION_FILE_NAME_REGEX.match(file_name)
+                for file_name in os.listdir(pipette_path)
+            ]
+            pipette_versions = sorted(
+                PipetteVersion(int(match.group(1)), int(match.group(2)))
+                for match in matches
+                if match is not None
+            )
+            if len(pipette_versions) > 0:
+                versions[f"{pipette}_{suffix}"] = pipette_versions
+    return versions
+
+
+def _index_cache_file_path(fingerprint: str) -> str:
+    """Path of the cached index of definitions with fingerprint."""
+    cache_dir = os.environ.get(
+        PIPETTE_DEFINITIONS_CACHE_DIR_ENV_VAR_NAME,
+        DEFAULT_PIPETTE_DEFINITIONS_CACHE_DIR,
+    )
+    return os.path.join(cache_dir, f"{fingerprint}.json")
+
+
+def _read_index_cache(fingerprint: str) -> Optional[PipetteDefinitionIndex]:
+    """Cached index for fingerprint. None if there is none or it is unreadable."""
+    try:
+        with open(_index_cache_file_path(fingerprint), "r") as file:
+            index = PipetteDefinitionIndex.from_json(file.read())
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return index if index.fingerprint == fingerprint else None
+
+
+def _write_index_cache(index: PipetteDefinitionIndex) -> None:
+    """Atomically writes index to the cache. Failing to write is not fatal."""
+    try:
+        write_file_atomically(
+            _index_cache_file_path(index.fingerprint), index.to_json()
+        )
+    except OSError:
+        pass
+
+
+def get_definitions_dir(monorepo_dir: str) -> str:
+    """Pipette definitions directory of a local monorepo."""
+    return os.path.join(monorepo_dir, PIPETTE_DEFINITIONS_RELATIVE_PATH)
+
+
+def load_pipette_definitions(monorepo_dir: str) -> Optional[PipetteDefinitionIndex]:
+    """Index of the pipette definitions in a local monorepo.
+
+    Returns None if the monorepo has no pipette definitions directory.
+    """
+    definitions_dir = get_definitions_dir(monorepo_dir)
+    if not os.path.isdir(definitions_dir):
+        return None
+    fingerprint = compute_source_fingerprint(definitions_dir).tree_hash
+    index = _read_index_cache(fingerprint)
+    if index is None:
+        index = PipetteDefinitionIndex(fingerprint, _scan_definitions(definitions_dir))
+        _write_index_cache(index)
+    return index
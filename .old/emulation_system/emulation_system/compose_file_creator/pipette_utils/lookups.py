@@ -1,12 +1,67 @@
 """Pipette lookups Enums."""
 
 import json
+import os
+import threading
 from enum import Enum, auto, unique
-from typing import Generator, List, Literal, Tuple, Type, Union
+from typing import Dict, Generator, List, Literal, Optional, Tuple, Type, Union
 
+from emulation_system.compose_file_creator.pipette_utils.definitions import (
+    PipetteVersion,
+)
 from emulation_system.consts import PIPETTE_VERSIONS_FILE_PATH
 
 
+class PipetteVersionRegistry:
+    """Pipette models read from a pipette versions file.
+
+    The file is only read again when its modification time changes, so looking up
+    a model is a dictionary lookup plus a stat call.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Creates a registry for the versions file at path. Nothing is read yet."""
+        self.path = path
+        self._mtime: Optional[int] = None
+        self._versions: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """Reload the versions file if it changed since it was last read.
+
+        Returns the modification time of the loaded file, which identifies the
+        versions currently in the registry.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        with self._lock:
+            if mtime != self._mtime:
+                with open(self.path, "r") as file:
+                    self._versions = json.load(file)
+                self._mtime = mtime
+            return mtime
+
+    def get_model(self, robot_type: str, pipette_name: str) -> int:
+        """Model of pipette_name for robot_type.
+
+        Raises ValueError if the versions file has no model for it.
+        """
+        self.refresh()
+        try:
+            return self._versions[robot_type][pipette_name]
+        except KeyError:
+            raise ValueError(
+                f'Could not find pipette model for "{pipette_name}" inside of "{self.path}".'
+            )
+
+
+_registry = PipetteVersionRegistry(PIPETTE_VERSIONS_FILE_PATH)
+
+
+def get_pipette_version_registry() -> PipetteVersionRegistry:
+    """Registry shared by every pipette lookup in the process."""
+    return _registry
+
+
 class PipetteTypes(Enum):
     """Enum for pipette types."""
 
@@ -88,14 +143,7 @@ class BasePipetteLookup(Enum):
         return Enum(f"{cls.__name__}ValidNames", key_value_pairs, type=str)
 
     def _get_pipette_model(self, robot_type: Literal["ot2", "ot3"]) -> int:
-        with open(PIPETTE_VERSIONS_FILE_PATH, "r") as file:
-            versions = json.load(file)
-        try:
-            return versions[robot_type][self.pipette_name]
-        except KeyError:
-            raise ValueError(
-                f'Could not find pipette model for "{self.pipette_name}" inside of "{PIPETTE_VERSIONS_FILE_PATH}".'
-            )
+        return get_pipette_version_registry().get_model(robot_type, self.pipette_name)
 
 
 @unique
@@ -128,8 +176,13 @@ class OT2PipetteLookup(BasePipetteLookup):
     @property
     def versioned_pipette_string(self) -> str:
         """Gets pipette name."""
-        string_model = str(self.get_pipette_model())
-        return f"{self.pipette_name}_v{string_model[0]}.{string_model[1:]}"
+        return self.get_versioned_pipette_string(
+            PipetteVersion.from_model(self.get_pipette_model())
+        )
+
+    def get_versioned_pipette_string(self, version: PipetteVersion) -> str:
+        """Gets pipette name with a specific version."""
+        return f"{self.pipette_name}_v{version}"
 
 
 @unique
@@ -158,16 +211,32 @@ class OT3PipetteLookup(BasePipetteLookup):
         return self._get_pipette_model("ot3")
 
 
+def _index_by_name(
+    pipette_lookup: Union[Type[OT2PipetteLookup], Type[OT3PipetteLookup]]
+) -> Dict[str, Union[OT2PipetteLookup, OT3PipetteLookup]]:
+    """Pipettes keyed by both their display name and internal name."""
+    index: Dict[str, Union[OT2PipetteLookup, OT3PipetteLookup]] = {}
+    for pipette_def in pipette_lookup.__members__.values():
+        index[pipette_def.pipette_name] = pipette_def
+        index[pipette_def.display_name] = pipette_def
+    return index
+
+
+_PIPETTES_BY_NAME = {
+    "ot2": _index_by_name(OT2PipetteLookup),
+    "ot3": _index_by_name(OT3PipetteLookup),
+}
+
+
 def lookup_pipette(
     name: str, robot_type: str
 ) -> Union[OT2PipetteLookup, OT3PipetteLookup]:
     """Looks up pipette by name."""
-    if robot_type not in ["ot2", "ot3"]:
+    try:
+        pipettes_by_name = _PIPETTES_BY_NAME[robot_type]
+    except KeyError:
         raise ValueError(f"Robot type {robot_type} not found.")
-    pipette_lookup: Union[Type[OT2PipetteLookup], Type[OT3PipetteLookup]] = (
-        OT2PipetteLookup if robot_type == "ot2" else OT3PipetteLookup
-    )
-    for _, pipette_def in pipette_lookup.__members__.items():
-        if name in [pipette_def.pipette_name, pipette_def.display_name]:
-            return pipette_def
-    raise ValueError(f"Pipette with name {name} not found.")
+    try:
+        return pipettes_by_name[name]
+    except KeyError:
+        raise ValueError(f"Pipette with name {name} not found.")
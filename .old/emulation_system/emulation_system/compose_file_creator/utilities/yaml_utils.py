@@ -1,28 +1,48 @@
 """Common utilities for yaml operations."""
 
+from typing import Any, Type
+
+import yaml
 from yaml.dumper import Dumper
 
+# libyaml's emitter is much faster than the pure Python one, but is only available
+# if PyYAML was built against libyaml.
+BaseDumper: Type[Dumper] = getattr(yaml, "CDumper", Dumper)
+
+
+def _represent_none(dumper: Dumper, value: None) -> yaml.ScalarNode:
+    return dumper.represent_scalar("tag:yaml.org,2002:null", "")
 
-class OpentronsEmulationYamlDumper(Dumper):
-    """Custom dumper to override default.
 
-    Passed to yaml.dump module function
+class _OpentronsEmulationDumperMixin:
+    """Custom dumper behavior to override default.
 
     Explanation of changes:
     - Remove `null` from outputted YAML file. Instead make it blank
     - Do not use YAML aliases
     """
 
-    def __init__(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
-        self.add_representer(
-            type(None),
-            lambda dumper, value: dumper.represent_scalar("tag:yaml.org,2002:null", ""),
-        )
-        super().__init__(*args, **kwargs)
-
     # Don't know what type `data` is and I don't really care.
     # This class will never be used directly.
     # Also do not care about having a docstring.
 
-    def ignore_aliases(self, data) -> bool:  # noqa: ANN001, D102
+    def ignore_aliases(self, data: Any) -> bool:  # noqa: D102, ANN401
         return True
+
+
+class OpentronsEmulationYamlDumper(
+    _OpentronsEmulationDumperMixin, BaseDumper  # type: ignore[valid-type, misc]
+):
+    """Custom dumper passed to yaml.dump module function.
+
+    Emits with libyaml when it is available, otherwise falls back to the pure Python
+    emitter. Output is the same either way.
+    """
+
+
+class PythonOpentronsEmulationYamlDumper(_OpentronsEmulationDumperMixin, Dumper):
+    """OpentronsEmulationYamlDumper that always uses the pure Python emitter."""
+
+
+OpentronsEmulationYamlDumper.add_representer(type(None), _represent_none)
+PythonOpentronsEmulationYamlDumper.add_representer(type(None), _represent_none)
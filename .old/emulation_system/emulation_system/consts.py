@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import tempfile
 
 # Latest Git Commit
 LATEST_KEYWORD = "latest"
@@ -37,6 +38,9 @@ DEFAULT_NETWORK_NAME = "local-network"
 COMMIT_SHA_REGEX = r"^[0-9a-f]{40}"
 
 EEPROM_FILE_NAME = "eeprom.bin"
+LOCK_FILE_EXTENSION = ".lock"
+# Format of the date in pipette serial numbers and OT-2 ids, MMDDYYYY
+DATE_STRING_FORMAT = "%m%d%Y"
 
 MONOREPO_NAMED_VOLUME_STRING = "monorepo-wheels:/dist"
 
@@ -65,3 +69,64 @@ OPENTRONS_MODULES_BUILDER_BUILD_HOST_CACHE_OVERRIDE_VOLUME = (
 OPENTRONS_MODULES_BUILDER_STM32_TOOLS_CACHE_OVERRIDE_VOLUME = (
     "opentrons-modules-stm32-tools-docker-cache:/opentrons-modules/stm32-tools"
 )
+
+# Git ref cache
+REF_CACHE_DIR_ENV_VAR_NAME = "OPENTRONS_EMULATION_REF_CACHE_DIR"
+REF_CACHE_TTL_ENV_VAR_NAME = "OPENTRONS_EMULATION_REF_CACHE_TTL"
+REF_CACHE_REFRESH_ENV_VAR_NAME = "OPENTRONS_EMULATION_REFRESH_REFS"
+DEFAULT_REF_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "opentrons-emulation", "refs"
+)
+DEFAULT_REF_CACHE_TTL_SECONDS = 60 * 60
+GIT_LS_REMOTE_TIMEOUT_SECONDS = 30
+
+# Offline ref resolution
+REF_MIRROR_DIR_ENV_VAR_NAME = "OPENTRONS_EMULATION_REF_MIRROR_DIR"
+REF_SNAPSHOT_FILE_ENV_VAR_NAME = "OPENTRONS_EMULATION_REF_SNAPSHOT"
+
+# Local source fingerprinting
+FINGERPRINT_CACHE_DIR_ENV_VAR_NAME = "OPENTRONS_EMULATION_FINGERPRINT_CACHE_DIR"
+DEFAULT_FINGERPRINT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "opentrons-emulation", "fingerprints"
+)
+SOURCE_FINGERPRINT_ENV_VAR_NAME = "SOURCE_FINGERPRINT"
+
+# Pipette definitions index
+PIPETTE_DEFINITIONS_CACHE_DIR_ENV_VAR_NAME = (
+    "OPENTRONS_EMULATION_PIPETTE_DEFINITIONS_CACHE_DIR"
+)
+DEFAULT_PIPETTE_DEFINITIONS_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "opentrons-emulation", "pipette-definitions"
+)
+PIPETTE_DEFINITIONS_RELATIVE_PATH = os.path.join(
+    "shared-data", "pipette", "definitions", "2", "general"
+)
+
+# Compose file cache
+COMPOSE_CACHE_DIR_ENV_VAR_NAME = "OPENTRONS_EMULATION_COMPOSE_CACHE_DIR"
+DEFAULT_COMPOSE_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "opentrons-emulation", "compose"
+)
+COMPOSE_CACHE_MAX_SIZE_BYTES = 50 * 1024 * 1024
+COMPOSE_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# emulation-system daemon
+DAEMON_SOCKET_ENV_VAR_NAME = "OPENTRONS_EMULATION_DAEMON_SOCKET"
+# Falls back to a directory only the current user can access when there is no
+# per-user runtime directory
+DEFAULT_DAEMON_SOCKET_DIR = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+    tempfile.gettempdir(), f"opentrons-emulation-{os.getuid()}"
+)
+DEFAULT_DAEMON_SOCKET_PATH = os.path.join(
+    DEFAULT_DAEMON_SOCKET_DIR, "opentrons-emulation.sock"
+)
+# Only environment variables starting with this are sent to the daemon
+DAEMON_ENV_VAR_PREFIX = "OPENTRONS_EMULATION_"
+
+# Conversion log
+LOG_LEVEL_ENV_VAR_NAME = "OPENTRONS_EMULATION_LOG_LEVEL"
+LOG_DIR_ENV_VAR_NAME = "OPENTRONS_EMULATION_LOG_DIR"
+DEFAULT_LOG_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "opentrons-emulation", "logs"
+)
+MAX_LOG_FILES = 100
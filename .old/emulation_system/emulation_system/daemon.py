@@ -0,0 +1,216 @@
+"""Long-running process executing CLI requests sent by daemon_client.
+
+Keeps the emulation_system modules imported between requests so that commands
+run from the Makefile do not pay for interpreter startup, imports, and building
+the compose file models every time.
+"""
+
+import contextlib
+import io
+import os
+import socketserver
+import stat
+import sys
+import traceback
+from typing import Any, Dict, Iterator, List, Tuple
+
+from emulation_system import git_interaction
+from emulation_system.consts import DAEMON_ENV_VAR_PREFIX
+from emulation_system.daemon_client import receive_message, send_message
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Socket file is created with mode 0o600
+SOCKET_UMASK = 0o177
+SOCKET_DIR_MODE = 0o700
+
+
+class _StandardStream(io.StringIO):
+    """In-memory standard stream, named like the real one so commands accept it."""
+
+    def __init__(self, name: str, initial_value: str = "") -> None:
+        super().__init__(initial_value)
+        self.name = name
+
+
+def get_package_mtime() -> float:
+    """Most recent modification time of any Python file in emulation_system."""
+    latest_mtime = 0.0
+    for dir_path, _, file_names in os.walk(PACKAGE_DIR):
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                latest_mtime = max(
+                    latest_mtime, os.path.getmtime(os.path.join(dir_path, file_name))
+                )
+    return latest_mtime
+
+
+@contextlib.contextmanager
+def _request_context(
+    cwd: str, env: Dict[str, str], stdin: str
+) -> Iterator[Tuple[io.StringIO, io.StringIO]]:
+    """Run a request as if it was a separate process started by the client.
+
+    Only the client's environment variables that commands read replace the
+    daemon's own, see daemon_client.get_request_env.
+    """
+    original_cwd = os.getcwd()
+    original_env = dict(os.environ)
+    original_streams = (sys.stdin, sys.stdout, sys.stderr)
+    stdout = _StandardStream("<stdout>")
+    stderr = _StandardStream("<stderr>")
+    try:
+        os.chdir(cwd)
+        for name in original_env:
+            if name.startswith(DAEMON_ENV_VAR_PREFIX):
+                del os.environ[name]
+        os.environ.update(
+            {
+                name: value
+                for name, value in env.items()
+                if name.startswith(DAEMON_ENV_VAR_PREFIX)
+            }
+        )
+        sys.stdin, sys.stdout, sys.stderr = (
+            _StandardStream("<stdin>", stdin),
+            stdout,
+            stderr,
+        )
+        # Refs might have changed on Github since the last request
+        git_interaction.clear_ref_caches()
+        yield stdout, stderr
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = original_streams
+        os.environ.clear()
+        os.environ.update(original_env)
+        os.chdir(original_cwd)
+
+
+def _close_files(command: object) -> None:
+    """Close files argparse opened for command.
+
+    A separate process would close them on exit, the daemon has to do it itself so
+    that output files are flushed.
+    """
+    for value in vars(command).values():
+        if isinstance(value, io.IOBase) and value not in (sys.stdin, sys.stdout):
+            value.close()
+
+
+def execute_request(
+    argv: List[str], cwd: str, env: Dict[str, str], stdin: str
+) -> Dict[str, Any]:
+    """Execute argv the same way main.py would and capture its output."""
+    # Imported here because the parsers import ServeCommand, which imports this module
+    from emulation_system.parsers.top_level_parser import TopLevelParser
+
+    exit_code = 0
+    with _request_context(cwd, env, stdin) as (stdout, stderr):
+        try:
+            command = TopLevelParser().parse(argv)
+            try:
+                command.execute()
+            finally:
+                _close_files(command)
+        except SystemExit as err:
+            exit_code = err.code if isinstance(err.code, int) else 1
+            if err.code is not None and not isinstance(err.code, int):
+                print(err.code, file=sys.stderr)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+def _make_socket_dir(socket_dir: str) -> None:
+    """Create socket_dir, only accessible by the current user, if it is missing.
+
+    Refuses to use a directory owned by another user, who could replace the socket.
+    """
+    with contextlib.suppress(FileExistsError):
+        os.makedirs(socket_dir, mode=SOCKET_DIR_MODE)
+    socket_dir_stat = os.lstat(socket_dir)
+    if (
+        not stat.S_ISDIR(socket_dir_stat.st_mode)
+        or socket_dir_stat.st_uid != os.getuid()
+    ):
+        raise RuntimeError(
+            f'Socket directory "{socket_dir}" is not a directory owned by the '
+            "current user."
+        )
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles a single request sent with daemon_client.run_with_daemon."""
+
+    server: "EmulationSystemDaemon"
+
+    def handle(self) -> None:
+        request = receive_message(self.request)
+        if self.server.code_changed():
+            # Let the client run the request in-process with the new code and stop
+            # serving the outdated code.
+            send_message(self.request, {"restart": True})
+            self.server.stopped = True
+            return
+        send_message(
+            self.request,
+            execute_request(
+                request["argv"],
+                request["cwd"],
+                request["env"],
+                request["stdin"] or "",
+            ),
+        )
+
+
+class EmulationSystemDaemon(socketserver.UnixStreamServer):
+    """Serves CLI requests on a Unix socket, one request at a time.
+
+    Requests change the working directory, environment, and standard streams of
+    the process, so they must not run concurrently.
+    """
+
+    # Seconds handle_request waits for a connection before checking stopped again
+    timeout = 1.0
+
+    def __init__(self, socket_path: str) -> None:
+        _make_socket_dir(os.path.dirname(os.path.abspath(socket_path)))
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self._socket_path = socket_path
+        self._package_mtime = get_package_mtime()
+        self.stopped = False
+
+    def server_bind(self) -> None:
+        """Create the socket file so that only the current user can connect to it.
+
+        The umask is set before binding, instead of changing the mode afterwards, so
+        other users can never connect in between.
+        """
+        original_umask = os.umask(SOCKET_UMASK)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(original_umask)
+
+    def code_changed(self) -> bool:
+        """Whether emulation_system was modified since the daemon started."""
+        return get_package_mtime() != self._package_mtime
+
+    def serve_until_stopped(self) -> None:
+        """Handle requests until stopped is set or the code changes."""
+        while not self.stopped:
+            self.handle_request()
+
+    def server_close(self) -> None:
+        """Close the socket and remove the socket file."""
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._socket_path)
@@ -0,0 +1,156 @@
+"""Thin client sending CLI requests to a running emulation-system daemon.
+
+Only depends on the standard library so that it can decide whether a daemon is
+available before any of the heavy emulation_system modules are imported.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+from typing import Any, Dict, List, Optional
+
+from emulation_system.consts import (
+    DAEMON_ENV_VAR_PREFIX,
+    DAEMON_SOCKET_ENV_VAR_NAME,
+    DEFAULT_DAEMON_SOCKET_PATH,
+)
+
+# Subcommands, including aliases, that can be executed by the daemon.
+# All of them take the input path as their first positional argument.
+DAEMON_SUBCOMMANDS = frozenset(["emulation-system", "em-sys", "load-containers", "lc"])
+# Options of those subcommands that take a separate value
+OPTIONS_WITH_VALUES = frozenset(
+    [
+        "--format",
+        "--snapshot",
+        "--changes",
+        "--log-file",
+        "--profile",
+        "--profile-format",
+    ]
+)
+
+
+def get_daemon_socket_path() -> str:
+    """Path of the Unix socket the daemon listens on."""
+    return os.environ.get(DAEMON_SOCKET_ENV_VAR_NAME, DEFAULT_DAEMON_SOCKET_PATH)
+
+
+def is_owned_socket(socket_path: str) -> bool:
+    """Whether socket_path is a socket created by the current user.
+
+    Symlinks are not followed, so another user cannot point the client at their
+    own socket.
+    """
+    try:
+        socket_stat = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(socket_stat.st_mode) and socket_stat.st_uid == os.getuid()
+
+
+def get_request_env() -> Dict[str, str]:
+    """Environment variables of this process that commands read."""
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if name.startswith(DAEMON_ENV_VAR_PREFIX)
+    }
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    """Send a single JSON message and signal that nothing else will be sent."""
+    connection.sendall(json.dumps(message).encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def receive_message(connection: socket.socket) -> Dict[str, Any]:
+    """Receive a single JSON message sent with send_message."""
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return json.loads(b"".join(chunks).decode())
+
+
+def _get_positionals(args: List[str]) -> List[str]:
+    """Positional arguments in args, skipping options and their values."""
+    positionals = []
+    args_iter = iter(args)
+    for arg in args_iter:
+        if arg in OPTIONS_WITH_VALUES:
+            next(args_iter, None)
+        elif not arg.startswith("--"):
+            positionals.append(arg)
+    return positionals
+
+
+def _reads_stdin(argv: List[str]) -> bool:
+    """Whether the subcommand in argv reads its input file from stdin."""
+    for index, arg in enumerate(argv):
+        if arg in DAEMON_SUBCOMMANDS:
+            positionals = _get_positionals(argv[index + 1 :])
+            return len(positionals) > 0 and positionals[0] == "-"
+    return False
+
+
+def is_daemon_request(argv: List[str]) -> bool:
+    """Whether argv is a subcommand the daemon can execute."""
+    return any(arg in DAEMON_SUBCOMMANDS for arg in argv)
+
+
+def run_with_daemon(argv: List[str]) -> Optional[int]:
+    """Execute argv on the daemon and print its output.
+
+    Returns the exit code of the request, or None if the request has to be executed
+    in-process because argv is not supported by the daemon, no daemon owned by the
+    current user is running, or the daemon shut down because its code changed.
+    Requests reading stdin cannot be executed in-process once stdin was sent, so
+    they fail instead.
+    """
+    if not is_daemon_request(argv):
+        return None
+
+    socket_path = get_daemon_socket_path()
+    if not is_owned_socket(socket_path):
+        return None
+
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    except OSError:
+        return None
+
+    stdin = sys.stdin.read() if _reads_stdin(argv) else None
+    response: Optional[Dict[str, Any]]
+    with connection:
+        try:
+            send_message(
+                connection,
+                {
+                    "argv": argv,
+                    "cwd": os.getcwd(),
+                    "env": get_request_env(),
+                    "stdin": stdin,
+                },
+            )
+            response = receive_message(connection)
+        except (OSError, ValueError):
+            response = None
+
+    if response is None or response.get("restart", False):
+        if stdin is None:
+            return None
+        sys.stderr.write(
+            "The emulation-system daemon did not execute the request after reading "
+            "stdin. Run the command again.\n"
+        )
+        return 1
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return int(response["exit_code"])
@@ -1,52 +1,429 @@
 """This module contains functions for interacting with git."""
 
+import bisect
+import difflib
+import hashlib
+import json
+import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, auto
 from functools import lru_cache
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.consts import (
+    DEFAULT_REF_CACHE_DIR,
+    DEFAULT_REF_CACHE_TTL_SECONDS,
+    GIT_LS_REMOTE_TIMEOUT_SECONDS,
+    REF_CACHE_DIR_ENV_VAR_NAME,
+    REF_CACHE_REFRESH_ENV_VAR_NAME,
+    REF_CACHE_TTL_ENV_VAR_NAME,
+    REF_MIRROR_DIR_ENV_VAR_NAME,
+    REF_SNAPSHOT_FILE_ENV_VAR_NAME,
+)
+
+
+class RefBackend(Enum):
+    """Where git refs are resolved from.
+
+    Either Github, a directory of local bare mirrors, or a refs snapshot file.
+    """
+
+    REMOTE = auto()
+    MIRROR = auto()
+    SNAPSHOT = auto()
+
+
+def get_remote_url(owner: str, repo: str) -> str:
+    """Github remote URL for a repo."""
+    return f"https://github.com/{owner}/{repo}.git"
+
+
+class RefIndex:
+    """Indexed store of the refs of a single repo.
+
+    Membership checks go through a hash set. Prefix and range queries go through a
+    sorted list using binary search.
+    """
+
+    def __init__(self, refs: Iterable[str]) -> None:
+        self._ref_set = frozenset(refs)
+        self._sorted_refs = sorted(self._ref_set)
+
+    def __contains__(self, ref: object) -> bool:
+        """Whether ref exists."""
+        return ref in self._ref_set
+
+    def __len__(self) -> int:
+        """Number of refs."""
+        return len(self._sorted_refs)
+
+    def range(self, start: str, end: str) -> List[str]:
+        """All refs r where start <= r < end, sorted."""
+        start_index = bisect.bisect_left(self._sorted_refs, start)
+        end_index = bisect.bisect_left(self._sorted_refs, end)
+        return self._sorted_refs[start_index:end_index]
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """All refs starting with prefix, sorted."""
+        start_index = bisect.bisect_left(self._sorted_refs, prefix)
+        end_index = start_index
+        while end_index < len(self._sorted_refs) and self._sorted_refs[
+            end_index
+        ].startswith(prefix):
+            end_index += 1
+        return self._sorted_refs[start_index:end_index]
+
+    def closest_matches(self, ref: str, max_matches: int = 5) -> List[str]:
+        """Refs that most closely resemble ref, best match first.
+
+        Refs that are similar to ref are listed first, followed by refs that start
+        with ref.
+        """
+        matches = difflib.get_close_matches(
+            ref, self._sorted_refs, n=max_matches, cutoff=0.6
+        )
+        for prefixed_ref in self.with_prefix(ref):
+            if len(matches) >= max_matches:
+                break
+            if prefixed_ref not in matches:
+                matches.append(prefixed_ref)
+        return matches
 
 
 def check_if_ref_exists(owner: str, repo: str, ref: str) -> bool:
     """Checks if a ref exists in a given repo."""
-    remote_url = f"https://github.com/{owner}/{repo}.git"
-    return ref in get_valid_ref_list(remote_url)
+    return ref in get_ref_index(get_remote_url(owner, repo))
 
 
-# lru_cache is not useful for the actual end user
-# of opentrons-emulation since the cache is only maintained
-# for the lifetime of the python executable. Whenever the user
-# calls a make command, the python executable is re-run.
+def get_closest_refs(owner: str, repo: str, ref: str) -> List[str]:
+    """Refs in a given repo that most closely resemble ref."""
+    return get_ref_index(get_remote_url(owner, repo)).closest_matches(ref)
 
-# However, it is still useful for tests since those are all run in the
-# same python executable. This prevents the need to make a network call for every test
-# that uses this function, which is almost all of them.
 
-# Although we could possibly run into a situation where refs have been updated
-# since the python executable was started, this doesn't really matter for tests
-# since the refs we are checking for are hardcoded to old refs.
+def prefetch_ref_lists(owner_repo_pairs: Iterable[Tuple[str, str]]) -> None:
+    """Concurrently loads the ref lists of all passed repos into get_valid_ref_list.
 
-# This changes test execution from ~80 seconds to ~20 seconds.
-@lru_cache
-def get_valid_ref_list(remote_url: str) -> List[str]:
-    """Gets a sorted list of valid refs from a remote URL."""
+    Every repo is looked up in its own thread, so n repos cost a single network
+    round-trip instead of n. Later calls to check_if_ref_exists are then served
+    from the in-process cache of get_ref_index.
+
+    Any error raised while fetching a ref list is re-raised.
+    """
+    remote_urls = sorted(
+        {get_remote_url(owner, repo) for owner, repo in owner_repo_pairs}
+    )
+    if len(remote_urls) == 0:
+        return
+    if len(remote_urls) == 1:
+        get_ref_index(remote_urls[0])
+        return
+    with ThreadPoolExecutor(max_workers=len(remote_urls)) as executor:
+        futures = [executor.submit(get_ref_index, url) for url in remote_urls]
+        for future in futures:
+            future.result()
 
-    def _format_line(line: str) -> str:
-        """Formats a line from the output of git ls-remote into a valid ref."""
-        sha_removed = line.split("\t")[1]
-        tags_path_removed = sha_removed.replace("refs/tags/", "")
-        heads_path_removed = tags_path_removed.replace("refs/heads/", "")
-        weird_tag_thing_removed = heads_path_removed.replace("^{}", "")
-        return weird_tag_thing_removed
 
+def get_ref_cache_dir() -> str:
+    """Directory the on-disk ref cache is stored in."""
+    return os.environ.get(REF_CACHE_DIR_ENV_VAR_NAME, DEFAULT_REF_CACHE_DIR)
+
+
+def get_ref_cache_ttl() -> float:
+    """Number of seconds a cached ref list is considered valid for."""
+    raw_ttl = os.environ.get(REF_CACHE_TTL_ENV_VAR_NAME)
+    if raw_ttl is None:
+        return DEFAULT_REF_CACHE_TTL_SECONDS
+    try:
+        return float(raw_ttl)
+    except ValueError:
+        raise ValueError(
+            f'"{REF_CACHE_TTL_ENV_VAR_NAME}" must be a number of seconds. '
+            f'You passed: "{raw_ttl}"'
+        )
+
+
+def force_refresh_requested() -> bool:
+    """Whether the user asked to skip the on-disk ref cache."""
+    return os.environ.get(REF_CACHE_REFRESH_ENV_VAR_NAME, "").lower() in [
+        "1",
+        "true",
+        "yes",
+    ]
+
+
+def _ref_cache_file_path(remote_url: str) -> str:
+    """Path of the cache file for remote_url."""
+    url_hash = hashlib.sha256(remote_url.encode()).hexdigest()
+    return os.path.join(get_ref_cache_dir(), f"{url_hash}.json")
+
+
+def _read_ref_cache(remote_url: str, ttl: float) -> Optional[Dict[str, str]]:
+    """Reads cached refs and their commit SHAs for remote_url.
+
+    Returns None if there is no cache entry, the entry is older than ttl,
+    or the entry cannot be parsed.
+    """
+    try:
+        with open(_ref_cache_file_path(remote_url), "r") as file:
+            cache_entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(cache_entry, dict)
+        or cache_entry.get("remote_url") != remote_url
+        or not isinstance(cache_entry.get("ref_shas"), dict)
+        or not isinstance(cache_entry.get("fetched_at"), (int, float))
+    ):
+        return None
+
+    if time.time() - cache_entry["fetched_at"] > ttl:
+        return None
+
+    return cache_entry["ref_shas"]
+
+
+def _write_ref_cache(remote_url: str, ref_shas: Dict[str, str]) -> None:
+    """Atomically writes refs and their commit SHAs for remote_url to the on-disk cache.
+
+    The entry is written to a temporary file in the cache directory and then
+    moved into place, so concurrent runs never read a partially written file.
+    Failing to write the cache is not fatal.
+    """
+    cache_entry = {
+        "remote_url": remote_url,
+        "fetched_at": time.time(),
+        "ref_shas": ref_shas,
+    }
+    try:
+        write_file_atomically(_ref_cache_file_path(remote_url), json.dumps(cache_entry))
+    except OSError:
+        pass
+
+
+def _ls_remote(remote_url: str) -> Dict[str, str]:
+    """Maps every branch and tag name of remote_url to its commit SHA.
+
+    remote_url can be anything git ls-remote accepts, including the path to a
+    local bare mirror. Annotated tags are mapped to the commit they point at.
+    """
     try:
         output = subprocess.run(
             ["git", "ls-remote", "--tags", "--heads", remote_url],
             capture_output=True,
             check=True,
             text=True,
+            timeout=GIT_LS_REMOTE_TIMEOUT_SECONDS,
         ).stdout.strip()
     except subprocess.CalledProcessError as e:
         raise RuntimeError(
             f"Unable to get valid ref list from {remote_url}. " f"Error: {e.stderr}"
         )
-    formatted_refs = [_format_line(item) for item in output.split("\n")]
-    return sorted(list(set(formatted_refs)))
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(
+            f"Unable to get valid ref list from {remote_url}. "
+            f"Error: git ls-remote timed out after {GIT_LS_REMOTE_TIMEOUT_SECONDS} seconds."
+        )
+
+    ref_shas: Dict[str, str] = {}
+    peeled_ref_shas: Dict[str, str] = {}
+    for line in output.split("\n"):
+        if line == "":
+            continue
+        sha, full_ref = line.split("\t")
+        ref = full_ref.replace("refs/tags/", "").replace("refs/heads/", "")
+        if ref.endswith("^{}"):
+            peeled_ref_shas[ref.replace("^{}", "")] = sha
+        else:
+            ref_shas[ref] = sha
+    ref_shas.update(peeled_ref_shas)
+    return ref_shas
+
+
+def get_ref_backend() -> RefBackend:
+    """Backend refs are resolved against.
+
+    Selected by setting the OPENTRONS_EMULATION_REF_SNAPSHOT or
+    OPENTRONS_EMULATION_REF_MIRROR_DIR environment variables. Defaults to Github.
+    """
+    snapshot_file = os.environ.get(REF_SNAPSHOT_FILE_ENV_VAR_NAME)
+    mirror_dir = os.environ.get(REF_MIRROR_DIR_ENV_VAR_NAME)
+    if snapshot_file and mirror_dir:
+        raise ValueError(
+            f'Only one of "{REF_SNAPSHOT_FILE_ENV_VAR_NAME}" and '
+            f'"{REF_MIRROR_DIR_ENV_VAR_NAME}" can be set.'
+        )
+    if snapshot_file:
+        return RefBackend.SNAPSHOT
+    if mirror_dir:
+        return RefBackend.MIRROR
+    return RefBackend.REMOTE
+
+
+def _split_remote_url(remote_url: str) -> Tuple[str, str]:
+    """Splits a Github remote URL created by get_remote_url into owner and repo."""
+    owner_and_repo = remote_url.removeprefix("https://github.com/").removesuffix(".git")
+    owner, _, repo = owner_and_repo.partition("/")
+    return owner, repo
+
+
+def _get_mirror_path(remote_url: str) -> str:
+    """Path of the local bare mirror of remote_url.
+
+    Mirrors are expected to be laid out the way "git clone --mirror" names them,
+    i.e. <mirror dir>/<repo>.git
+    """
+    _, repo = _split_remote_url(remote_url)
+    mirror_path = os.path.join(os.environ[REF_MIRROR_DIR_ENV_VAR_NAME], f"{repo}.git")
+    if not os.path.isdir(mirror_path):
+        raise RuntimeError(
+            f"Unable to get valid ref list from {remote_url}. "
+            f'Error: no local mirror found at "{mirror_path}".'
+        )
+    return mirror_path
+
+
+def _read_refs_snapshot(remote_url: str) -> Dict[str, str]:
+    """Reads the refs of remote_url from the refs snapshot file.
+
+    The snapshot file maps "<owner>/<repo>" to a mapping of ref name to commit SHA.
+    """
+    snapshot_file = os.environ[REF_SNAPSHOT_FILE_ENV_VAR_NAME]
+    owner, repo = _split_remote_url(remote_url)
+    repo_key = f"{owner}/{repo}"
+    try:
+        with open(snapshot_file, "r") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(
+            f'Unable to read refs snapshot "{snapshot_file}". Error: {e}'
+        )
+    if repo_key not in snapshot:
+        raise RuntimeError(
+            f'Unable to get valid ref list from {remote_url}. Error: refs snapshot "{snapshot_file}" '
+            f'has no entry for "{repo_key}".'
+        )
+    return snapshot[repo_key]
+
+
+def get_ref_shas(remote_url: str) -> Dict[str, str]:
+    """Maps every valid ref of remote_url to its commit SHA using the selected backend."""
+    backend = get_ref_backend()
+    if backend == RefBackend.SNAPSHOT:
+        return _read_refs_snapshot(remote_url)
+    elif backend == RefBackend.MIRROR:
+        return _ls_remote(_get_mirror_path(remote_url))
+    else:
+        return _ls_remote(remote_url)
+
+
+def write_refs_snapshot(
+    file_path: str, owner_repo_pairs: Iterable[Tuple[str, str]]
+) -> None:
+    """Writes a refs snapshot file for all passed repos.
+
+    Refs are read with the currently selected backend, so a snapshot can be created
+    from Github or from a local mirror.
+    """
+    snapshot = {
+        f"{owner}/{repo}": get_ref_shas(get_remote_url(owner, repo))
+        for owner, repo in sorted(set(owner_repo_pairs))
+    }
+    with open(file_path, "w") as file:
+        json.dump(snapshot, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def _load_ref_shas(remote_url: str, force_refresh: bool) -> Dict[str, str]:
+    """Maps every valid ref of a remote URL to its commit SHA, bypassing the lru_cache.
+
+    Uses the on-disk ref cache unless force_refresh is True. When an offline
+    backend is selected (see get_ref_backend) refs are read from the local mirror
+    or refs snapshot instead, and the on-disk ref cache is not used.
+    """
+    if get_ref_backend() != RefBackend.REMOTE:
+        return get_ref_shas(remote_url)
+
+    if not force_refresh:
+        cached_ref_shas = _read_ref_cache(remote_url, get_ref_cache_ttl())
+        if cached_ref_shas is not None:
+            return cached_ref_shas
+
+    ref_shas = _ls_remote(remote_url)
+    _write_ref_cache(remote_url, ref_shas)
+    return ref_shas
+
+
+# lru_cache only lives for the lifetime of the python executable. Whenever the user
+# calls a make command, the python executable is re-run, so the ref list is also
+# persisted to disk (see _read_ref_cache and _write_ref_cache) and reused until it
+# is older than the configured TTL.
+
+# lru_cache is still useful for tests since those are all run in the
+# same python executable. This prevents the need to read the cache file or make a
+# network call for every test that uses this function, which is almost all of them.
+
+# Although we could possibly run into a situation where refs have been updated
+# since the python executable was started, this doesn't really matter for tests
+# since the refs we are checking for are hardcoded to old refs.
+
+# This changes test execution from ~80 seconds to ~20 seconds.
+@lru_cache
+def _get_cached_ref_shas(remote_url: str, backend: RefBackend) -> Dict[str, str]:
+    """Refs and commit SHAs of remote_url, loaded once per process and backend.
+
+    backend is only part of the cache key, so switching backends in a process
+    never returns refs read from another backend.
+    """
+    return _load_ref_shas(remote_url, force_refresh_requested())
+
+
+@lru_cache
+def _get_cached_ref_list(remote_url: str, backend: RefBackend) -> List[str]:
+    """Sorted ref list of remote_url, built once per process and backend."""
+    return sorted(_get_cached_ref_shas(remote_url, backend))
+
+
+def get_valid_ref_list(remote_url: str, force_refresh: bool = False) -> List[str]:
+    """Gets a sorted list of valid refs from a remote URL.
+
+    Uses the on-disk ref cache unless force_refresh is True, or the
+    OPENTRONS_EMULATION_REFRESH_REFS environment variable is set. Passing
+    force_refresh always fetches the refs again and drops every ref list cached in
+    the process, so later calls see the refreshed refs.
+    """
+    if not force_refresh:
+        return _get_cached_ref_list(remote_url, get_ref_backend())
+    ref_shas = _load_ref_shas(remote_url, force_refresh=True)
+    clear_ref_caches()
+    return sorted(ref_shas)
+
+
+@lru_cache
+def _get_cached_ref_index(remote_url: str, backend: RefBackend) -> RefIndex:
+    """RefIndex of remote_url, built once per process and backend."""
+    return RefIndex(_get_cached_ref_list(remote_url, backend))
+
+
+def get_ref_index(remote_url: str) -> RefIndex:
+    """Gets a RefIndex of the valid refs of a remote URL."""
+    return _get_cached_ref_index(remote_url, get_ref_backend())
+
+
+def get_resolved_ref_shas(remote_url: str) -> Dict[str, str]:
+    """Maps every valid ref of remote_url to its commit SHA.
+
+    Returns the same refs that get_valid_ref_list and get_ref_index validated
+    against, so no extra lookup is made once a configuration has been validated.
+    """
+    return _get_cached_ref_shas(remote_url, get_ref_backend())
+
+
+def clear_ref_caches() -> None:
+    """Clear the in-process ref caches."""
+    _get_cached_ref_shas.cache_clear()
+    _get_cached_ref_list.cache_clear()
+    _get_cached_ref_index.cache_clear()
@@ -0,0 +1,92 @@
+"""Lock file pinning remote sources to commit SHAs.
+
+A lock file is stored next to the configuration file it was created from, with the
+same name and a .lock extension. It maps every remote source to the git ref it was
+resolved from and the commit SHA that ref pointed at. While a lock file exists, build
+args download the pinned commit instead of the tip of the ref, so docker layer caches
+stay valid until the lock is updated.
+"""
+
+import os
+from typing import TYPE_CHECKING, Dict
+
+from pydantic import parse_file_as
+
+from emulation_system import git_interaction
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.compose_file_creator.errors import LockFileOutOfDateError
+from emulation_system.consts import LOCK_FILE_EXTENSION
+from opentrons_pydantic_base_model import OpentronsBaseModel
+
+if TYPE_CHECKING:
+    from emulation_system import SystemConfigurationModel
+
+
+class LockedSource(OpentronsBaseModel):
+    """Git ref of a remote source and the commit SHA it resolved to."""
+
+    ref: str
+    commit_sha: str
+
+
+class LockFileModel(OpentronsBaseModel):
+    """Model of a lock file. Keyed by repo name."""
+
+    sources: Dict[str, LockedSource] = {}
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "LockFileModel":
+        """Parse from file."""
+        return parse_file_as(cls, file_path)
+
+    def to_file(self, file_path: str) -> None:
+        """Atomically write lock file to file_path."""
+        write_file_atomically(
+            file_path, self.json(by_alias=True, indent=2, sort_keys=True) + "\n"
+        )
+
+
+def get_lock_file_path(config_file_path: str) -> str:
+    """Path of the lock file belonging to config_file_path.
+
+    Every configuration file gets its own lock file, so configuration files sharing
+    a directory never pick up each other's pins.
+    """
+    return os.path.splitext(os.path.abspath(config_file_path))[0] + LOCK_FILE_EXTENSION
+
+
+def create_lock(config_model: "SystemConfigurationModel") -> LockFileModel:
+    """Resolve every remote source of config_model to its commit SHA.
+
+    Reuses the refs config_model was validated against instead of looking them up
+    again.
+    """
+    sources: Dict[str, LockedSource] = {}
+    for source in config_model.sources:
+        if not source.is_remote():
+            continue
+        ref_shas = git_interaction.get_resolved_ref_shas(
+            git_interaction.get_remote_url(source.repo.OWNER, source.repo.value)
+        )
+        sources[source.repo.value] = LockedSource(
+            ref=source.git_ref, commit_sha=ref_shas[source.git_ref]
+        )
+    return LockFileModel(sources=sources)
+
+
+def apply_lock(config_model: "SystemConfigurationModel", lock: LockFileModel) -> None:
+    """Pin the remote sources of config_model to the commit SHAs in lock.
+
+    Sources that are local or not in the lock file are left untouched.
+    Raises LockFileOutOfDateError if a source uses a different ref than the one
+    that was locked.
+    """
+    for source in config_model.sources:
+        locked_source = lock.sources.get(source.repo.value)
+        if not source.is_remote() or locked_source is None:
+            continue
+        if locked_source.ref != source.git_ref:
+            raise LockFileOutOfDateError(
+                source.repo.value, locked_source.ref, source.git_ref
+            )
+        source.pin_commit_sha(locked_source.commit_sha)
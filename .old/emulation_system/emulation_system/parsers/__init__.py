@@ -1,11 +1,19 @@
 """parsers package."""
 
+from .batch_parser import BatchParser
 from .emulation_system_parser import EmulationSystemParser
 from .load_containers_parser import LoadContainersParser
+from .lock_parser import LockParser
+from .render_log_parser import RenderLogParser
+from .serve_parser import ServeParser
 from .top_level_parser import TopLevelParser
 
 __all__ = [
+    "BatchParser",
     "EmulationSystemParser",
     "LoadContainersParser",
+    "LockParser",
+    "RenderLogParser",
+    "ServeParser",
     "TopLevelParser",
 ]
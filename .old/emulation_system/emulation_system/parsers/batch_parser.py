@@ -0,0 +1,73 @@
+"""Parser for batch sub-command."""
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING
+
+from .abstract_parser import AbstractParser
+from .parser_utils import get_formatter
+
+if TYPE_CHECKING:
+    from emulation_system.commands import BatchCommand
+
+
+def _batch_command_from_cli_input(args: argparse.Namespace) -> BatchCommand:
+    """Construct BatchCommand, importing it only when the batch command is run."""
+    from emulation_system.commands import BatchCommand
+
+    return BatchCommand.from_cli_input(args)
+
+
+class BatchParser(AbstractParser):
+    """Parser for batch sub-command."""
+
+    @classmethod
+    def get_parser(cls, parser: argparse.ArgumentParser) -> None:
+        """Build parser for "batch" command."""
+        subparser = parser.add_parser(  # type: ignore
+            "batch",
+            formatter_class=get_formatter(),
+            help="Create docker-compose files for many configuration files at once",
+        )
+
+        subparser.set_defaults(func=_batch_command_from_cli_input)
+
+        subparser.add_argument(
+            "inputs",
+            action="store",
+            nargs="+",
+            metavar="<input>",
+            help="Configuration file, directory, glob, or .txt manifest listing one "
+            "configuration file per line",
+        )
+
+        subparser.add_argument(
+            "--output-dir",
+            action="store",
+            required=True,
+            metavar="<output_dir>",
+            help="Directory to write one compose file per input and summary.json to",
+        )
+
+        subparser.add_argument(
+            "--jobs",
+            action="store",
+            type=int,
+            default=None,
+            metavar="<jobs>",
+            help="Number of worker processes. Defaults to the number of CPUs.",
+        )
+
+        subparser.add_argument(
+            "--remote-only", action="store_true", help="Allow only remote source-types"
+        )
+
+        subparser.add_argument(
+            "--dev", action="store_true", help="Create dev compose files"
+        )
+
+        subparser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Always regenerate compose files instead of using the cache",
+        )
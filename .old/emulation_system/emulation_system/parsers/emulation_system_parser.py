@@ -2,6 +2,11 @@
 import argparse
 
 from emulation_system.commands import EmulationSystemCommand
+from emulation_system.commands.emulation_system_command import (
+    OUTPUT_FORMATS,
+    YAML_FORMAT,
+)
+from emulation_system.profiling import CHROME_TRACE_FORMAT, PROFILE_FORMATS
 
 from .abstract_parser import AbstractParser
 from .parser_utils import get_formatter
@@ -27,7 +32,8 @@ class EmulationSystemParser(AbstractParser):
             action="store",
             metavar="<input_path>",
             type=argparse.FileType("r"),
-            help='Input path to read file from. Specify "-" to read from stdin.',
+            help='Input path to read file from. Specify "-" to read from stdin. '
+            'Multiple "---" separated configurations are converted one at a time.',
         )
 
         subparser.add_argument(
@@ -45,3 +51,68 @@ class EmulationSystemParser(AbstractParser):
         subparser.add_argument(
             "--dev", action="store_true", help="Create dev compose file"
         )
+
+        subparser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Always regenerate the compose file instead of using the cache",
+        )
+
+        subparser.add_argument(
+            "--format",
+            action="store",
+            choices=OUTPUT_FORMATS,
+            default=YAML_FORMAT,
+            help="Write compose files as a YAML stream, as JSON, or as NDJSON with "
+            "one compose file per line. JSON is faster to generate and is accepted "
+            "by docker-compose, but only supports a single configuration.",
+        )
+
+        subparser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Build services that do not depend on each other concurrently",
+        )
+
+        subparser.add_argument(
+            "--snapshot",
+            action="store",
+            metavar="<snapshot_path>",
+            help="Only rebuild services whose inputs changed since the snapshot "
+            "stored in <snapshot_path>, then update the snapshot. Containers that "
+            "must be recreated, are new, or are orphaned are reported.",
+        )
+
+        subparser.add_argument(
+            "--changes",
+            action="store",
+            metavar="<changes_path>",
+            help='File to write changed containers to when using "--snapshot", as '
+            'one "<recreate|new|orphaned> <container_name>" line per container. '
+            "Defaults to stderr.",
+        )
+
+        subparser.add_argument(
+            "--log-file",
+            action="store",
+            metavar="<log_path>",
+            help="File to write the conversion log to, as JSON lines. Defaults to a "
+            'new file in the log directory. Render it with "render-log".',
+        )
+
+        subparser.add_argument(
+            "--profile",
+            action="store",
+            metavar="<profile_path>",
+            help="Time every stage of the conversion and write the result to "
+            '<profile_path>, or to stderr if it is "-"',
+        )
+
+        subparser.add_argument(
+            "--profile-format",
+            action="store",
+            choices=PROFILE_FORMATS,
+            default=CHROME_TRACE_FORMAT,
+            help='Format of "--profile": a Chrome trace-event file, viewable in '
+            "chrome://tracing or Perfetto, or a table summarizing time per stage",
+        )
@@ -2,6 +2,10 @@
 import argparse
 
 from emulation_system.commands import LoadContainersCommand
+from emulation_system.commands.load_containers_command import (
+    OUTPUT_FORMATS,
+    TEXT_FORMAT,
+)
 
 from .abstract_parser import AbstractParser
 from .parser_utils import get_formatter
@@ -33,12 +37,24 @@ class LoadContainersParser(AbstractParser):
             action="store",
             metavar="<input_path>",
             type=argparse.FileType("r"),
-            help='Input path to read file from. Specify "-" to read from stdin.',
+            help='Input path to read file from. Specify "-" to read from stdin. '
+            'Multiple "---" separated configurations are converted one at a time.',
         )
 
         subparser.add_argument(
             "filter",
             action="store",
             metavar="<filter>",
-            help="Filter to apply.",
+            help='Filter to apply. Combine filters with "," to load containers in '
+            'any of them, or "+" to load containers in all of them, e.g. '
+            '"ot3-firmware,modules" or "modules+not-hardware-modules".',
+        )
+
+        subparser.add_argument(
+            "--format",
+            action="store",
+            choices=OUTPUT_FORMATS,
+            default=TEXT_FORMAT,
+            help='Print container names one per line, with "---" between '
+            "configurations, or as NDJSON with one list of names per configuration",
         )
@@ -0,0 +1,31 @@
+"""Parser for lock sub-command."""
+import argparse
+
+from emulation_system.commands import LockCommand
+
+from .abstract_parser import AbstractParser
+from .parser_utils import get_formatter
+
+
+class LockParser(AbstractParser):
+    """Parser for lock sub-command."""
+
+    @classmethod
+    def get_parser(cls, parser: argparse.ArgumentParser) -> None:
+        """Build parser for "lock" command."""
+        subparser = parser.add_parser(  # type: ignore
+            "lock",
+            formatter_class=get_formatter(),
+            help="Pin remote sources to commit SHAs in a lock file",
+        )
+
+        subparser.set_defaults(func=LockCommand.from_cli_input)
+
+        subparser.add_argument(
+            "input_path",
+            action="store",
+            metavar="<input_path>",
+            type=argparse.FileType("r"),
+            help="Configuration file to lock. The lock file is written next to it, "
+            "with the same name and a .lock extension.",
+        )
@@ -0,0 +1,48 @@
+"""Parser for render-log sub-command."""
+import argparse
+
+from emulation_system.commands import RenderLogCommand
+from emulation_system.commands.render_log_command import RENDER_FORMATS, TEXT_FORMAT
+
+from .abstract_parser import AbstractParser
+from .parser_utils import get_formatter
+
+
+class RenderLogParser(AbstractParser):
+    """Parser for render-log sub-command."""
+
+    @classmethod
+    def get_parser(cls, parser: argparse.ArgumentParser) -> None:
+        """Build parser for "render-log" command."""
+        subparser = parser.add_parser(  # type: ignore
+            "render-log",
+            formatter_class=get_formatter(),
+            help="Render the log written by emulation-system as text or HTML",
+        )
+
+        subparser.set_defaults(func=RenderLogCommand.from_cli_input)
+
+        subparser.add_argument(
+            "log_path",
+            action="store",
+            metavar="<log_path>",
+            nargs="?",
+            default=None,
+            help="Log file to render. Defaults to the log of the most recent run.",
+        )
+
+        subparser.add_argument(
+            "--output",
+            action="store",
+            metavar="<output_path>",
+            default=None,
+            help="File to write the rendered log to. Defaults to stdout.",
+        )
+
+        subparser.add_argument(
+            "--format",
+            action="store",
+            choices=RENDER_FORMATS,
+            default=TEXT_FORMAT,
+            help="Render the log as plain text or as a styled HTML page",
+        )
@@ -0,0 +1,33 @@
+"""Parser for serve sub-command."""
+import argparse
+
+from emulation_system.commands import ServeCommand
+from emulation_system.daemon_client import get_daemon_socket_path
+
+from .abstract_parser import AbstractParser
+from .parser_utils import get_formatter
+
+
+class ServeParser(AbstractParser):
+    """Parser for serve sub-command."""
+
+    @classmethod
+    def get_parser(cls, parser: argparse.ArgumentParser) -> None:
+        """Build parser for "serve" command."""
+        subparser = parser.add_parser(  # type: ignore
+            "serve",
+            formatter_class=get_formatter(),
+            help="Keep a warm process running that executes emulation-system and "
+            "load-containers requests",
+        )
+
+        subparser.set_defaults(func=ServeCommand.from_cli_input)
+
+        subparser.add_argument(
+            "--socket",
+            dest="socket_path",
+            action="store",
+            metavar="<socket_path>",
+            default=get_daemon_socket_path(),
+            help="Unix socket to listen on",
+        )
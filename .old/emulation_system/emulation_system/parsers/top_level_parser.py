@@ -1,12 +1,23 @@
 """Top-level parser for emulation cli."""
 import argparse
+import os
 import sys
 
+from emulation_system.consts import (
+    LOG_LEVEL_ENV_VAR_NAME,
+    REF_CACHE_REFRESH_ENV_VAR_NAME,
+    REF_MIRROR_DIR_ENV_VAR_NAME,
+    REF_SNAPSHOT_FILE_ENV_VAR_NAME,
+)
 from emulation_system.executable import Executable
 
+from .batch_parser import BatchParser
 from .emulation_system_parser import EmulationSystemParser
 from .load_containers_parser import LoadContainersParser
+from .lock_parser import LockParser
 from .parser_utils import get_formatter
+from .render_log_parser import RenderLogParser
+from .serve_parser import ServeParser
 
 
 class TopLevelParser:
@@ -17,7 +28,14 @@ class TopLevelParser:
 
     # Add subcommand parsers here
     # Parsers must inherit from emulation_system/src/parsers/abstract_parser.py
-    SUBPARSERS = [EmulationSystemParser, LoadContainersParser]
+    SUBPARSERS = [
+        EmulationSystemParser,
+        LoadContainersParser,
+        LockParser,
+        ServeParser,
+        BatchParser,
+        RenderLogParser,
+    ]
 
     def __init__(self) -> None:
         """Construct TopLevelParser object.
@@ -37,6 +55,47 @@ class TopLevelParser:
             help="Print out commands to be run by system",
         )
 
+        self._parser.add_argument(
+            "--refresh-refs",
+            action="store_true",
+            help="Ignore the on-disk git ref cache and re-fetch refs from Github",
+        )
+
+        offline_refs_group = self._parser.add_mutually_exclusive_group()
+
+        offline_refs_group.add_argument(
+            "--ref-mirror-dir",
+            action="store",
+            metavar="<mirror_dir>",
+            help="Resolve git refs against bare mirrors (<mirror_dir>/<repo>.git) "
+            "instead of Github",
+        )
+
+        offline_refs_group.add_argument(
+            "--ref-snapshot",
+            action="store",
+            metavar="<snapshot_file>",
+            help="Resolve git refs against a refs snapshot file instead of Github",
+        )
+
+        log_level_group = self._parser.add_mutually_exclusive_group()
+
+        log_level_group.add_argument(
+            "--quiet",
+            action="store_const",
+            const="quiet",
+            dest="log_level",
+            help="Do not write the conversion log",
+        )
+
+        log_level_group.add_argument(
+            "--verbose",
+            action="store_const",
+            const="verbose",
+            dest="log_level",
+            help="Also log how every build step was run to the conversion log",
+        )
+
         subparsers = self._parser.add_subparsers(
             dest="command", title="subcommands", required=True
         )
@@ -51,4 +110,16 @@ class TopLevelParser:
         else:
             parsed_args = self._parser.parse_args(passed_args)
 
+        if parsed_args.refresh_refs:
+            os.environ[REF_CACHE_REFRESH_ENV_VAR_NAME] = "1"
+
+        if parsed_args.ref_mirror_dir is not None:
+            os.environ[REF_MIRROR_DIR_ENV_VAR_NAME] = parsed_args.ref_mirror_dir
+
+        if parsed_args.ref_snapshot is not None:
+            os.environ[REF_SNAPSHOT_FILE_ENV_VAR_NAME] = parsed_args.ref_snapshot
+
+        if parsed_args.log_level is not None:
+            os.environ[LOG_LEVEL_ENV_VAR_NAME] = parsed_args.log_level
+
         return parsed_args.func(parsed_args)
@@ -0,0 +1,250 @@
+"""Timing spans for profiling where conversion time goes.
+
+Code marks stages of a conversion with span() or timed(). Spans are only recorded
+inside profile(); otherwise span() returns a shared no-op context manager, so
+instrumented code costs a function call and a global lookup.
+
+Recorded spans can be exported as a Chrome trace-event file, viewable in
+chrome://tracing or https://ui.perfetto.dev, or as a flat summary table.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type, TypeVar, Union
+
+T = TypeVar("T")
+
+CHROME_TRACE_FORMAT = "chrome-trace"
+SUMMARY_FORMAT = "summary"
+PROFILE_FORMATS = [CHROME_TRACE_FORMAT, SUMMARY_FORMAT]
+
+TRACE_CATEGORY = "emulation_system"
+
+NANOSECONDS_PER_MICROSECOND = 1_000
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+
+
+@dataclass
+class TimingSpan:
+    """A completed span. Times are in nanoseconds since the profile started."""
+
+    name: str
+    start: int
+    duration: int
+    thread_id: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def end(self) -> int:
+        """Time the span ended."""
+        return self.start + self.duration
+
+
+@dataclass
+class SpanSummary:
+    """Timing of every span with the same name, in nanoseconds."""
+
+    name: str
+    calls: int = 0
+    total: int = 0
+    self_total: int = 0
+    max: int = 0
+
+
+class Profiler:
+    """Records spans from every thread."""
+
+    def __init__(self) -> None:
+        """Creates a profiler with no spans, starting the clock."""
+        self.spans: List[TimingSpan] = []
+        self._start = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        """Nanoseconds since the profiler was created."""
+        return time.perf_counter_ns() - self._start
+
+    def add(self, span: TimingSpan) -> None:
+        """Record a completed span."""
+        with self._lock:
+            self.spans.append(span)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Spans as Chrome trace "complete" events."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": TRACE_CATEGORY,
+                    "ph": "X",
+                    "ts": span.start / NANOSECONDS_PER_MICROSECOND,
+                    "dur": span.duration / NANOSECONDS_PER_MICROSECOND,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": span.args,
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def _get_self_durations(self) -> List[int]:
+        """Duration of every span minus the spans directly nested in it."""
+        self_durations = [span.duration for span in self.spans]
+        open_spans: Dict[int, List[int]] = {}
+        for index in sorted(
+            range(len(self.spans)),
+            key=lambda index: (self.spans[index].start, -self.spans[index].duration),
+        ):
+            span = self.spans[index]
+            stack = open_spans.setdefault(span.thread_id, [])
+            while len(stack) > 0 and self.spans[stack[-1]].end <= span.start:
+                stack.pop()
+            if len(stack) > 0:
+                self_durations[stack[-1]] -= span.duration
+            stack.append(index)
+        return self_durations
+
+    def summarize(self) -> List[SpanSummary]:
+        """Timing of spans grouped by name, longest total first."""
+        summaries: Dict[str, SpanSummary] = {}
+        for span, self_duration in zip(self.spans, self._get_self_durations()):
+            summary = summaries.setdefault(span.name, SpanSummary(span.name))
+            summary.calls += 1
+            summary.total += span.duration
+            summary.self_total += self_duration
+            summary.max = max(summary.max, span.duration)
+        return sorted(summaries.values(), key=lambda summary: -summary.total)
+
+    def to_summary_table(self) -> str:
+        """Summary of spans as a plain text table, in milliseconds."""
+        summaries = self.summarize()
+        name_width = max([len("span")] + [len(summary.name) for summary in summaries])
+        header = (
+            f"{'span':<{name_width}}  {'calls':>6}  {'total ms':>10}  "
+            f"{'self ms':>10}  {'mean ms':>10}  {'max ms':>10}"
+        )
+        lines = [header, "-" * len(header)]
+        for summary in summaries:
+            total, self_total, mean, maximum = (
+                value / NANOSECONDS_PER_MILLISECOND
+                for value in [
+                    summary.total,
+                    summary.self_total,
+                    summary.total / summary.calls,
+                    summary.max,
+                ]
+            )
+            lines.append(
+                f"{summary.name:<{name_width}}  {summary.calls:>6}  {total:>10.3f}  "
+                f"{self_total:>10.3f}  {mean:>10.3f}  {maximum:>10.3f}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(self, profile_format: str) -> str:
+        """Spans in profile_format, one of PROFILE_FORMATS."""
+        if profile_format == CHROME_TRACE_FORMAT:
+            return json.dumps(self.to_chrome_trace()) + "\n"
+        if profile_format == SUMMARY_FORMAT:
+            return self.to_summary_table()
+        raise ValueError(
+            f'"{profile_format}" is not a valid profile format. Valid formats are: '
+            f"{PROFILE_FORMATS}"
+        )
+
+
+class _Span:
+    """Records a span on a profiler when exited."""
+
+    def __init__(self, profiler: Profiler, name: str, args: Dict[str, Any]) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._args = args
+        self._start = 0
+
+    def set_arg(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Add an argument shown with the span in the trace."""
+        self._args[name] = value
+
+    def __enter__(self) -> _Span:
+        self._start = self._profiler.now()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._profiler.add(
+            TimingSpan(
+                self._name,
+                self._start,
+                self._profiler.now() - self._start,
+                threading.get_ident(),
+                self._args,
+            )
+        )
+
+
+class _NullSpan:
+    """Span used when not profiling. Does nothing."""
+
+    def set_arg(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Ignore argument."""
+        pass
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# Module level instead of a ContextVar so that worker threads building services
+# record their spans too.
+_active_profiler: Optional[Profiler] = None
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profiler]:
+    """Record every span started until exited."""
+    global _active_profiler
+    previous_profiler = _active_profiler
+    profiler = Profiler()
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous_profiler
+
+
+def span(name: str, **args: Any) -> Union[_Span, _NullSpan]:  # noqa: ANN401
+    """Context manager timing the code it wraps, if profiling."""
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return _Span(profiler, name, args)
+
+
+def timed(function: Callable[[], T]) -> T:
+    """Call function, timing it as a span named after it if profiling."""
+    if _active_profiler is None:
+        return function()
+    with span(function.__name__):
+        return function()
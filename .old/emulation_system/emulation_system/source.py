@@ -8,9 +8,18 @@ import pathlib
 import re
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import List, Union
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from emulation_system import git_interaction
 from emulation_system.compose_file_creator.config_file_settings import (
@@ -36,14 +45,38 @@ from emulation_system.consts import (
     OT3_FIRMWARE_BUILDER_STATE_MANAGER_WHEEL_NAMED_VOLUME_STRING,
     OT3_FIRMWARE_BUILDER_STM32_TOOLS_CACHE_OVERRIDE_VOLUME,
 )
+from emulation_system.source_fingerprint import (
+    SourceFingerprint,
+    compute_source_fingerprint,
+)
 from opentrons_pydantic_base_model import OpentronsBaseModel
 
+if TYPE_CHECKING:
+    from emulation_system.compose_file_creator.pipette_utils.definitions import (
+        PipetteDefinitionIndex,
+    )
+
 ENTRYPOINT_MOUNT_STRING = FileMount(
     type=MountTypes.FILE,
     source_path=pathlib.Path(ENTRYPOINT_FILE_LOCATION),
     mount_path="/entrypoint.sh",
 ).get_bind_mount_string()
 
+# Number of times SourceState.to_source_state has been called.
+# Only used so tests can assert how many resolutions a conversion performs.
+_source_state_resolution_count = 0
+
+
+def get_source_state_resolution_count() -> int:
+    """Number of times a source-location has been resolved to a SourceState."""
+    return _source_state_resolution_count
+
+
+def reset_source_state_resolution_count() -> None:
+    """Reset source state resolution counter back to 0."""
+    global _source_state_resolution_count
+    _source_state_resolution_count = 0
+
 
 class SourceState(Enum):
     """State of Source object.
@@ -58,6 +91,8 @@ class SourceState(Enum):
     @staticmethod
     def to_source_state(passed_value: str, repo: OpentronsRepository) -> "SourceState":
         """Helper method to parse passed string value to SourceState."""
+        global _source_state_resolution_count
+        _source_state_resolution_count += 1
         source_state: SourceState
 
         if passed_value.lower() == "latest":
@@ -76,8 +111,19 @@ class SourceState(Enum):
                 "is deprecated. Use a branch name instead."
             )
         else:
+            closest_refs = git_interaction.get_closest_refs(
+                repo.OWNER, repo.value, passed_value
+            )
+            suggestion = (
+                "\nDid you mean one of the following refs?"
+                + "".join(f'\n\t- "{ref}"' for ref in closest_refs)
+                + "\n"
+                if len(closest_refs) > 0
+                else ""
+            )
             raise ValueError(
                 f'\nYou passed: "{passed_value}"'
+                f"{suggestion}"
                 "\nField can be the following values:"
                 '\n\t- "latest" to pull latest code from Github'
                 "\n\t- A valid ref name to pull a specific ref from Github"
@@ -85,6 +131,11 @@ class SourceState(Enum):
             )
         return source_state
 
+    @staticmethod
+    def requires_ref_lookup(passed_value: str) -> bool:
+        """Whether parsing passed value to SourceState requires looking up git refs."""
+        return passed_value.lower() != "latest" and not os.path.isdir(passed_value)
+
     def is_remote(self) -> bool:
         """If SourceState is remote."""
         return self in [self.REMOTE_REF, self.REMOTE_LATEST]
@@ -94,11 +145,28 @@ class SourceState(Enum):
         return self == self.LOCAL
 
 
+def prefetch_source_refs(
+    source_locations: Iterable[Tuple[str, OpentronsRepository]]
+) -> None:
+    """Concurrently fetch git refs for all source locations that are ref names.
+
+    Sources that are "latest" or local directories are skipped.
+    """
+    git_interaction.prefetch_ref_lists(
+        (repo.OWNER, repo.value)
+        for source_location, repo in source_locations
+        if SourceState.requires_ref_lookup(source_location)
+    )
+
+
 class Source(ABC):
     """ABC for Source objects."""
 
     source_location: str
     repo: OpentronsRepository
+    _source_state_cache: Optional[Tuple[str, SourceState]] = None
+    _pinned_commit_sha: Optional[str] = None
+    FINGERPRINT_SUB_PROJECTS: ClassVar[List[str]] = []
 
     def __init__(self, source_location: str, repo: OpentronsRepository) -> None:
         self.source_location = source_location
@@ -122,8 +190,58 @@ class Source(ABC):
 
     @property
     def source_state(self) -> SourceState:
-        """Source State of the Source object."""
-        return SourceState.to_source_state(self.source_location, self.repo)
+        """Source State of the Source object.
+
+        Only resolved once per source_location. The cached value is tied to the
+        source_location it was resolved from, so it is re-resolved if
+        source_location is reassigned.
+        """
+        cache = self._source_state_cache
+        if cache is None or cache[0] != self.source_location:
+            cache = (
+                self.source_location,
+                SourceState.to_source_state(self.source_location, self.repo),
+            )
+            self._source_state_cache = cache
+        return cache[1]
+
+    def _cache_source_state(self, source_state: SourceState) -> None:
+        """Store an already resolved SourceState for the current source_location."""
+        self._source_state_cache = (self.source_location, source_state)
+
+    @property
+    def git_ref(self) -> str:
+        """Git ref a remote source downloads.
+
+        "latest" resolves to the default branch of the repo.
+        """
+        return (
+            self.repo.default_branch
+            if self.source_location == "latest"
+            else self.source_location
+        )
+
+    @property
+    def pinned_commit_sha(self) -> Optional[str]:
+        """Commit SHA the source is pinned to by a lock file, if any."""
+        return self._pinned_commit_sha
+
+    def pin_commit_sha(self, commit_sha: str) -> None:
+        """Pin remote source to commit_sha instead of the tip of its git ref."""
+        self._pinned_commit_sha = commit_sha
+
+    def fingerprint(self) -> Optional[SourceFingerprint]:
+        """Content fingerprint of a local source. None for remote sources."""
+        if not self.is_local():
+            return None
+        return compute_source_fingerprint(
+            self.source_location, self.FINGERPRINT_SUB_PROJECTS
+        )
+
+    def generate_fingerprint_env_vars(self) -> Dict[str, str]:
+        """Env vars that let builder containers skip work on an unchanged local tree."""
+        fingerprint = self.fingerprint()
+        return fingerprint.to_env_vars() if fingerprint is not None else {}
 
     def generate_build_args(self) -> IntermediateBuildArgs | None:
         """Generate build args based off of global settings."""
@@ -131,11 +249,12 @@ class Source(ABC):
             return None
         env_var_to_use = str(self.repo.build_arg_name)
         source_location = self.source_location
-        value = (
-            self.repo.get_default_download_url()
-            if source_location == "latest"
-            else self.repo.get_user_specified_download_url(source_location)
-        )
+        if self._pinned_commit_sha is not None:
+            value = self.repo.get_user_specified_download_url(self._pinned_commit_sha)
+        elif source_location == "latest":
+            value = self.repo.get_default_download_url()
+        else:
+            value = self.repo.get_user_specified_download_url(source_location)
         return {env_var_to_use: value}
 
     def generate_source_code_bind_mounts(self) -> List[str]:
@@ -170,24 +289,62 @@ class MonorepoSource(OpentronsBaseModel, Source):
 
     source_location: str
     repo: OpentronsRepository = OpentronsRepository.OPENTRONS
+    _source_state_cache: Optional[Tuple[str, SourceState]] = PrivateAttr(default=None)
+    _pinned_commit_sha: Optional[str] = PrivateAttr(default=None)
+    _pipette_definitions_cache: Optional[
+        Tuple[str, Optional["PipetteDefinitionIndex"]]
+    ] = PrivateAttr(default=None)
     DEFAULT_BUILDER_VOLUMES: List[str] = Field(
         [MONOREPO_NAMED_VOLUME_STRING], const=True
     )
+    # Python projects built into wheels by selective_monorepo_builder.sh
+    FINGERPRINT_SUB_PROJECTS: ClassVar[List[str]] = [
+        "shared-data/python",
+        "api",
+        "notify-server",
+        "robot-server",
+        "hardware",
+        "server-utils",
+    ]
 
     @classmethod
     def validate(cls, v: str) -> "MonorepoSource":
         """Confirm that parsing source-location string to SourceState does not throw an error."""
         try:
-            SourceState.to_source_state(v, OpentronsRepository.OPENTRONS)
+            source_state = SourceState.to_source_state(v, OpentronsRepository.OPENTRONS)
         except ValueError:
             raise
         else:
-            return MonorepoSource(source_location=v)
+            source = MonorepoSource(source_location=v)
+            source._cache_source_state(source_state)
+            return source
 
     def __repr__(self) -> str:
         """Override __repr__."""
         return f"MonorepoSource({super().__repr__()})"
 
+    def pipette_definitions(self) -> Optional["PipetteDefinitionIndex"]:
+        """Index of the pipette definitions in a local monorepo's shared-data.
+
+        None for remote sources and local monorepos without pipette definitions.
+        Only loaded once per source_location.
+        """
+        # Imported here because pipette_utils imports this module.
+        from emulation_system.compose_file_creator.pipette_utils.definitions import (
+            load_pipette_definitions,
+        )
+
+        if not self.is_local():
+            return None
+        cache = self._pipette_definitions_cache
+        if cache is None or cache[0] != self.source_location:
+            cache = (
+                self.source_location,
+                load_pipette_definitions(self.source_location),
+            )
+            self._pipette_definitions_cache = cache
+        return cache[1]
+
     @staticmethod
     def generate_emulator_mount_strings() -> List[str]:
         """Generates volume and bind mount strings for emulator contianers using monorepo source code."""
@@ -203,6 +360,8 @@ class OT3FirmwareSource(OpentronsBaseModel, Source, EmulatorSourceMixin):
 
     source_location: str
     repo: OpentronsRepository = OpentronsRepository.OT3_FIRMWARE
+    _source_state_cache: Optional[Tuple[str, SourceState]] = PrivateAttr(default=None)
+    _pinned_commit_sha: Optional[str] = PrivateAttr(default=None)
     DEFAULT_BUILDER_VOLUMES: List[str] = Field(
         [
             OT3_FIRMWARE_BUILDER_STATE_MANAGER_VENV_NAMED_VOLUME_STRING,
@@ -238,11 +397,15 @@ class OT3FirmwareSource(OpentronsBaseModel, Source, EmulatorSourceMixin):
     def validate(cls, v: str) -> "OT3FirmwareSource":
         """Confirm that parsing source-location string to SourceState does not throw an error."""
         try:
-            SourceState.to_source_state(v, OpentronsRepository.OT3_FIRMWARE)
+            source_state = SourceState.to_source_state(
+                v, OpentronsRepository.OT3_FIRMWARE
+            )
         except ValueError:
             raise
         else:
-            return OT3FirmwareSource(source_location=v)
+            source = OT3FirmwareSource(source_location=v)
+            source._cache_source_state(source_state)
+            return source
 
     def __repr__(self) -> str:
         """Override __repr__."""
@@ -271,6 +434,8 @@ class OpentronsModulesSource(OpentronsBaseModel, Source, EmulatorSourceMixin):
 
     source_location: str
     repo: OpentronsRepository = OpentronsRepository.OPENTRONS_MODULES
+    _source_state_cache: Optional[Tuple[str, SourceState]] = PrivateAttr(default=None)
+    _pinned_commit_sha: Optional[str] = PrivateAttr(default=None)
     DEFAULT_BUILDER_VOLUMES: List[str] = Field(
         [
             OPENTRONS_MODULES_BUILDER_BUILD_HOST_CACHE_OVERRIDE_VOLUME,
@@ -293,11 +458,15 @@ class OpentronsModulesSource(OpentronsBaseModel, Source, EmulatorSourceMixin):
     def validate(cls, v: str) -> "OpentronsModulesSource":
         """Confirm that parsing source-location string to SourceState does not throw an error."""
         try:
-            SourceState.to_source_state(v, OpentronsRepository.OPENTRONS_MODULES)
+            source_state = SourceState.to_source_state(
+                v, OpentronsRepository.OPENTRONS_MODULES
+            )
         except ValueError:
             raise
         else:
-            return OpentronsModulesSource(source_location=v)
+            source = OpentronsModulesSource(source_location=v)
+            source._cache_source_state(source_state)
+            return source
 
     def __repr__(self) -> str:
         """Override __repr__."""
@@ -0,0 +1,230 @@
+"""Content fingerprints of local source trees.
+
+Kept apart from the source models so the compose file cache can check whether a
+local source changed without importing the configuration models.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple, Union
+
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.consts import (
+    DEFAULT_FINGERPRINT_CACHE_DIR,
+    FINGERPRINT_CACHE_DIR_ENV_VAR_NAME,
+    SOURCE_FINGERPRINT_ENV_VAR_NAME,
+)
+
+# File hashes are cached as [mtime_ns, size, sha256] per relative file path.
+_FingerprintCacheEntries = Dict[str, List[Union[int, str]]]
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Content hash of a local source tree.
+
+    tree_hash covers every file. sub_project_hashes covers only the files below
+    each requested sub-project directory.
+    """
+
+    tree_hash: str
+    sub_project_hashes: Dict[str, str]
+
+    @staticmethod
+    def sub_project_env_var_name(sub_project: str) -> str:
+        """Env var holding the hash of sub_project, e.g. SOURCE_FINGERPRINT_ROBOT_SERVER."""
+        suffix = re.sub(r"[^A-Z0-9]", "_", sub_project.upper())
+        return f"{SOURCE_FINGERPRINT_ENV_VAR_NAME}_{suffix}"
+
+    def to_env_vars(self) -> Dict[str, str]:
+        """Env vars exposing the fingerprint to builder containers."""
+        env_vars = {SOURCE_FINGERPRINT_ENV_VAR_NAME: self.tree_hash}
+        for sub_project, sub_project_hash in self.sub_project_hashes.items():
+            env_vars[self.sub_project_env_var_name(sub_project)] = sub_project_hash
+        return env_vars
+
+
+def _walk_source_files(source_dir: str) -> List[str]:
+    """Relative paths of files in source_dir, skipping .git and .gitignore matches.
+
+    Fallback for directories that are not git work trees. Only supports simple
+    .gitignore patterns matched against file and directory names.
+    """
+    file_paths: List[str] = []
+    ignore_patterns: Dict[str, List[str]] = {}
+    for dir_path, dir_names, file_names in os.walk(source_dir):
+        patterns = list(ignore_patterns.get(os.path.dirname(dir_path), []))
+        gitignore_path = os.path.join(dir_path, ".gitignore")
+        if os.path.isfile(gitignore_path):
+            with open(gitignore_path, "r") as file:
+                for line in file:
+                    pattern = line.strip()
+                    if pattern != "" and not pattern.startswith(("#", "!")):
+                        patterns.append(pattern.strip("/"))
+        ignore_patterns[dir_path] = patterns
+
+        def _is_ignored(name: str) -> bool:
+            return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+        dir_names[:] = sorted(
+            name for name in dir_names if name != ".git" and not _is_ignored(name)
+        )
+        file_paths.extend(
+            os.path.relpath(os.path.join(dir_path, name), source_dir)
+            for name in file_names
+            if not _is_ignored(name)
+        )
+    return sorted(file_paths)
+
+
+def _list_source_files(source_dir: str) -> List[str]:
+    """Relative paths of all files in source_dir that are not ignored by git.
+
+    Uses git ls-files so every .gitignore and git's exclude files are honoured.
+    """
+    try:
+        output = subprocess.run(
+            [
+                "git",
+                "-C",
+                source_dir,
+                "ls-files",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                "-z",
+            ],
+            capture_output=True,
+            check=True,
+        ).stdout.decode()
+    except (OSError, subprocess.CalledProcessError):
+        return _walk_source_files(source_dir)
+    return sorted(
+        path
+        for path in output.split("\0")
+        if path != "" and os.path.isfile(os.path.join(source_dir, path))
+    )
+
+
+def _fingerprint_cache_file_path(source_dir: str) -> str:
+    """Path of the fingerprint cache file for source_dir."""
+    cache_dir = os.environ.get(
+        FINGERPRINT_CACHE_DIR_ENV_VAR_NAME, DEFAULT_FINGERPRINT_CACHE_DIR
+    )
+    dir_hash = hashlib.sha256(source_dir.encode()).hexdigest()
+    return os.path.join(cache_dir, f"{dir_hash}.json")
+
+
+def _read_fingerprint_cache(source_dir: str) -> _FingerprintCacheEntries:
+    """Reads cached file hashes for source_dir. Returns {} if there are none."""
+    try:
+        with open(_fingerprint_cache_file_path(source_dir), "r") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("source_dir") != source_dir:
+        return {}
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_fingerprint_cache(
+    source_dir: str, entries: _FingerprintCacheEntries
+) -> None:
+    """Atomically writes file hashes for source_dir. Failing to write is not fatal."""
+    try:
+        write_file_atomically(
+            _fingerprint_cache_file_path(source_dir),
+            json.dumps({"source_dir": source_dir, "files": entries}),
+        )
+    except OSError:
+        pass
+
+
+def _hash_file(file_path: str) -> str:
+    """sha256 of the contents of file_path."""
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _hash_file_list(file_hashes: Iterable[Tuple[str, str]]) -> str:
+    """Combine (relative path, file hash) pairs into a single hash."""
+    tree_hash = hashlib.sha256()
+    for relative_path, file_hash in file_hashes:
+        tree_hash.update(f"{relative_path}\0{file_hash}\n".encode())
+    return tree_hash.hexdigest()
+
+
+def compute_source_fingerprint(
+    source_dir: str, sub_projects: Iterable[str] = ()
+) -> SourceFingerprint:
+    """Compute content hash of a local source directory.
+
+    Files ignored by .gitignore are skipped. Individual file hashes are cached on
+    disk keyed by mtime and size, so only files that changed since the last call
+    are read again.
+    """
+    source_dir = os.path.abspath(source_dir)
+    cached_entries = _read_fingerprint_cache(source_dir)
+    entries: _FingerprintCacheEntries = {}
+    file_hashes: List[Tuple[str, str]] = []
+
+    for relative_path in _list_source_files(source_dir):
+        file_path = os.path.join(source_dir, relative_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        cached_entry = cached_entries.get(relative_path)
+        if cached_entry is not None and cached_entry[:2] == [
+            stat.st_mtime_ns,
+            stat.st_size,
+        ]:
+            file_hash = str(cached_entry[2])
+        else:
+            file_hash = _hash_file(file_path)
+        entries[relative_path] = [stat.st_mtime_ns, stat.st_size, file_hash]
+        file_hashes.append((relative_path, file_hash))
+
+    if entries != cached_entries:
+        _write_fingerprint_cache(source_dir, entries)
+
+    return SourceFingerprint(
+        tree_hash=_hash_file_list(file_hashes),
+        sub_project_hashes={
+            sub_project: _hash_file_list(
+                (path, file_hash)
+                for path, file_hash in file_hashes
+                if path.startswith(f"{sub_project.strip('/')}/")
+            )
+            for sub_project in sub_projects
+        },
+    )
+
+
+def compute_source_stat_signature(source_dir: str) -> str:
+    """Hash of the path, mtime and size of every file in a local source directory.
+
+    Cheaper than compute_source_fingerprint since no file is read, but changes
+    whenever a file is touched, even if its contents stay the same. Files ignored by
+    .gitignore are skipped.
+    """
+    source_dir = os.path.abspath(source_dir)
+    signature = hashlib.sha256()
+    for relative_path in _list_source_files(source_dir):
+        try:
+            stat = os.stat(os.path.join(source_dir, relative_path))
+        except OSError:
+            continue
+        signature.update(
+            f"{relative_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode()
+        )
+    return signature.hexdigest()
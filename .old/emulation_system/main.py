@@ -1,5 +1,14 @@
 """Entrypoint for the emulation system cli application."""
-from emulation_system.parsers.top_level_parser import TopLevelParser
+import sys
+
+from emulation_system.daemon_client import run_with_daemon
 
 if __name__ == "__main__":
+    # Let a running "serve" daemon handle the request if there is one
+    exit_code = run_with_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from emulation_system.parsers.top_level_parser import TopLevelParser
+
     TopLevelParser().parse().execute()
@@ -0,0 +1,366 @@
+"""Benchmarks for importing emulation_system and converting configuration files.
+
+Every file in samples/ and configurations generated with TestingConfigBuilder, at
+increasing numbers of modules, are timed through each stage of a conversion.
+Results are appended to a JSON history file, stored in
+~/.cache/opentrons-emulation/benchmarks by default, which can be compared to fail on
+regressions.
+
+Run from the emulation_system directory:
+
+    python -m tests.benchmarks.benchmark_suite run
+    python -m tests.benchmarks.benchmark_suite compare --threshold 0.25
+
+Samples that cannot be converted, e.g. because their local source paths do not
+exist, are skipped. Set OPENTRONS_EMULATION_REF_SNAPSHOT to benchmark remote
+sources without network access.
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import yaml
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.atomic_file import write_file_atomically
+from emulation_system.compose_file_creator.conversion import ServiceOrchestrator
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    _convert,
+)
+from emulation_system.consts import ROOT_DIR
+from tests.testing_config_builder import ConfigDefinition, TestingConfigBuilder
+from tests.testing_types import ModuleDeclaration
+
+T = TypeVar("T")
+
+SAMPLES_DIR = os.path.join(ROOT_DIR, "samples")
+# Kept out of the source tree, next to the other opentrons-emulation caches
+DEFAULT_HISTORY_FILE_PATH = os.path.join(
+    os.path.expanduser("~"),
+    ".cache",
+    "opentrons-emulation",
+    "benchmarks",
+    "history.json",
+)
+
+# Module that pulls in everything needed to convert a configuration file
+IMPORT_TARGET = "emulation_system.compose_file_creator.conversion.conversion_functions"
+IMPORT_KEY = "emulation_system/import"
+
+VALIDATE_STAGE = "validate"
+BUILD_SERVICES_STAGE = "build_services"
+TO_YAML_STAGE = "to_yaml"
+TO_JSON_STAGE = "to_json"
+
+# Number of each module type in generated configurations
+GENERATED_MODULE_COUNTS = [1, 10, 50]
+
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Changes smaller than this are noise no matter the relative change
+DEFAULT_MIN_DELTA_SECONDS = 0.005
+
+
+@dataclass
+class BenchmarkInput:
+    """Configuration file content to benchmark conversion of."""
+
+    name: str
+    content: Dict[str, Any]
+
+
+@dataclass
+class Regression:
+    """A benchmark that got slower than allowed."""
+
+    key: str
+    baseline_seconds: float
+    current_seconds: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from baseline to current."""
+        return self.current_seconds / self.baseline_seconds - 1
+
+
+def get_sample_inputs() -> List[BenchmarkInput]:
+    """All configuration files in samples/."""
+    sample_paths = sorted(
+        glob.glob(os.path.join(SAMPLES_DIR, "**", "*.yaml"), recursive=True)
+        + glob.glob(os.path.join(SAMPLES_DIR, "**", "*.json"), recursive=True)
+    )
+    inputs = []
+    for sample_path in sample_paths:
+        with open(sample_path, "r") as sample_file:
+            content = yaml.safe_load(sample_file)
+        inputs.append(BenchmarkInput(os.path.relpath(sample_path, ROOT_DIR), content))
+    return inputs
+
+
+def get_generated_inputs() -> List[BenchmarkInput]:
+    """Configurations for both robots with an increasing number of modules."""
+    inputs = []
+    for robot in ["ot2", "ot3"]:
+        for module_count in GENERATED_MODULE_COUNTS:
+            modules: ModuleDeclaration = {
+                "heater-shaker-module": module_count,
+                "thermocycler-module": module_count,
+                "temperature-module": module_count,
+                "magnetic-module": module_count,
+            }
+            config_definition = ConfigDefinition(
+                opentrons_dir="",
+                opentrons_modules_dir="",
+                ot3_firmware_dir="",
+                robot=robot,  # type: ignore[arg-type]
+                modules=modules,
+            )
+            inputs.append(
+                BenchmarkInput(
+                    f"generated/{robot}-{module_count}-of-each-module",
+                    TestingConfigBuilder(config_definition).make_config(),
+                )
+            )
+    return inputs
+
+
+def _time(func: Callable[[], T], repeat: int) -> Tuple[float, T]:
+    """Fastest of repeat calls to func and the result of the last call.
+
+    func is called once before timing so caches, like the git ref cache, are warm.
+    """
+    result = func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def benchmark_cold_import(repeat: int) -> float:
+    """Fastest time to import IMPORT_TARGET in a fresh interpreter."""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import time; start = time.perf_counter(); "
+                f"import {IMPORT_TARGET}; print(time.perf_counter() - start)",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=os.path.join(ROOT_DIR, "emulation_system"),
+        ).stdout
+        timings.append(float(output))
+    return min(timings)
+
+
+def benchmark_input(benchmark: BenchmarkInput, repeat: int) -> Dict[str, float]:
+    """Time each conversion stage for benchmark. Returns seconds keyed by stage."""
+    validate_seconds, config_model = _time(
+        lambda: parse_obj_as(SystemConfigurationModel, benchmark.content), repeat
+    )
+    build_services_seconds, _ = _time(
+        lambda: ServiceOrchestrator(config_model, False).build_services(), repeat
+    )
+    compose_file_model = _convert(config_model, False)
+    to_yaml_seconds, _ = _time(compose_file_model.to_yaml, repeat)
+    to_json_seconds, _ = _time(compose_file_model.to_json, repeat)
+    return {
+        VALIDATE_STAGE: validate_seconds,
+        BUILD_SERVICES_STAGE: build_services_seconds,
+        TO_YAML_STAGE: to_yaml_seconds,
+        TO_JSON_STAGE: to_json_seconds,
+    }
+
+
+def _get_commit_sha() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=ROOT_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat: int) -> Dict[str, Any]:
+    """Run all benchmarks. Returns a history entry."""
+    results = {IMPORT_KEY: benchmark_cold_import(repeat)}
+    for benchmark in get_sample_inputs() + get_generated_inputs():
+        try:
+            stage_results = benchmark_input(benchmark, repeat)
+        except (ValueError, RuntimeError) as err:
+            # Samples with placeholder local paths cannot be converted until the
+            # paths are changed, and remote refs cannot be resolved offline.
+            first_line = str(err).strip().splitlines()[0]
+            print(f"Skipping {benchmark.name}: {first_line}", file=sys.stderr)
+            continue
+        for stage, seconds in stage_results.items():
+            results[f"{benchmark.name}/{stage}"] = seconds
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": _get_commit_sha(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def load_history(history_file_path: str) -> List[Dict[str, Any]]:
+    """Load history file. Returns empty history if it does not exist."""
+    if not os.path.isfile(history_file_path):
+        return []
+    with open(history_file_path, "r") as history_file:
+        return json.load(history_file)
+
+
+def save_history(history_file_path: str, history: List[Dict[str, Any]]) -> None:
+    """Write history file."""
+    write_file_atomically(history_file_path, json.dumps(history, indent=2) + "\n")
+
+
+def find_regressions(
+    baseline: Dict[str, float],
+    current: Dict[str, float],
+    threshold: float,
+    min_delta_seconds: float = DEFAULT_MIN_DELTA_SECONDS,
+) -> List[Regression]:
+    """Benchmarks in both runs that got more than threshold slower.
+
+    Benchmarks that only exist in one of the runs are ignored.
+    """
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        regression = Regression(key, baseline[key], current[key])
+        if (
+            regression.current_seconds - regression.baseline_seconds > min_delta_seconds
+            and regression.change > threshold
+        ):
+            regressions.append(regression)
+    return regressions
+
+
+def compare(
+    history: List[Dict[str, Any]],
+    threshold: float,
+    min_delta_seconds: float,
+    baseline_index: int = -2,
+) -> List[Regression]:
+    """Compare the latest run in history to the run at baseline_index."""
+    if len(history) < 2:
+        raise ValueError("At least 2 runs are required in the history to compare.")
+    return find_regressions(
+        history[baseline_index]["results"],
+        history[-1]["results"],
+        threshold,
+        min_delta_seconds,
+    )
+
+
+def _print_run(run: Dict[str, Any]) -> None:
+    for key, seconds in run["results"].items():
+        print(f"{key:<80} {seconds * 1000:>10.2f} ms")
+
+
+def _print_regressions(regressions: List[Regression], threshold: float) -> None:
+    if len(regressions) == 0:
+        print(f"No benchmark regressed by more than {threshold:.0%}.")
+        return
+    print(f"The following benchmarks regressed by more than {threshold:.0%}:")
+    for regression in regressions:
+        print(
+            f"\t{regression.key}: {regression.baseline_seconds * 1000:.2f} ms -> "
+            f"{regression.current_seconds * 1000:.2f} ms ({regression.change:+.0%})"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks and/or compare results. Returns exit code."""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks for importing emulation_system and converting "
+        "configuration files."
+    )
+    parser.add_argument(
+        "--history",
+        default=DEFAULT_HISTORY_FILE_PATH,
+        help="JSON file benchmark runs are appended to",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run benchmarks and append the results to the history"
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Number of timed repetitions per benchmark, the fastest is kept",
+    )
+    run_parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare to the previous run after running",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare the latest run to a previous run"
+    )
+    compare_parser.add_argument(
+        "--baseline",
+        type=int,
+        default=-2,
+        help="Index in the history of the run to compare to. Defaults to the "
+        "previous run.",
+    )
+
+    for subparser in [run_parser, compare_parser]:
+        subparser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="Relative slowdown that counts as a regression",
+        )
+        subparser.add_argument(
+            "--min-delta",
+            type=float,
+            default=DEFAULT_MIN_DELTA_SECONDS,
+            help="Absolute slowdown in seconds below which changes are ignored",
+        )
+
+    args = parser.parse_args(argv)
+    history = load_history(args.history)
+    baseline_index = -2
+
+    if args.command == "run":
+        run = run_benchmarks(args.repeat)
+        _print_run(run)
+        history.append(run)
+        save_history(args.history, history)
+        if not args.compare or len(history) < 2:
+            return 0
+    else:
+        baseline_index = args.baseline
+
+    regressions = compare(history, args.threshold, args.min_delta, baseline_index)
+    _print_regressions(regressions, args.threshold)
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
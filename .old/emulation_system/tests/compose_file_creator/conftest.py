@@ -1,17 +1,135 @@
 """Conftest for compose_file_creator package."""
-from typing import Any, Callable, Dict, Literal
+import pathlib
+from typing import Any, Callable, Dict, Generator, List, Literal
 
 import py
 import pytest
 
+from emulation_system import git_interaction
 from emulation_system.compose_file_creator.config_file_settings import (
     EmulationLevels,
     OpentronsRepository,
 )
+from emulation_system.compose_file_creator.logging.log_sink import (
+    MemoryLogSink,
+    log_to,
+)
+from emulation_system.consts import (
+    COMPOSE_CACHE_DIR_ENV_VAR_NAME,
+    FINGERPRINT_CACHE_DIR_ENV_VAR_NAME,
+    LOG_DIR_ENV_VAR_NAME,
+    PIPETTE_DEFINITIONS_CACHE_DIR_ENV_VAR_NAME,
+    REF_CACHE_DIR_ENV_VAR_NAME,
+    REF_CACHE_REFRESH_ENV_VAR_NAME,
+    REF_CACHE_TTL_ENV_VAR_NAME,
+    REF_MIRROR_DIR_ENV_VAR_NAME,
+    REF_SNAPSHOT_FILE_ENV_VAR_NAME,
+)
 from tests.conftest import SYSTEM_UNIQUE_ID
 from tests.testing_config_builder import ConfigDefinition, TestingConfigBuilder
 from tests.testing_types import ModuleDeclaration
 
+FAKE_REFS = ["edge", "main"]
+FAKE_REF_SHA = "f" * 40
+REFS_SNAPSHOT_PATH = pathlib.Path(__file__).parent / "refs_snapshot.json"
+
+
+@pytest.fixture(autouse=True)
+def refs_from_snapshot(monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Resolve git refs against REFS_SNAPSHOT_PATH instead of Github.
+
+    Keeps tests deterministic and runnable offline. Tests of other backends unset
+    it through isolated_ref_cache.
+    """
+    monkeypatch.setenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, str(REFS_SNAPSHOT_PATH))
+    monkeypatch.delenv(REF_MIRROR_DIR_ENV_VAR_NAME, raising=False)
+    return REFS_SNAPSHOT_PATH
+
+
+@pytest.fixture(autouse=True)
+def isolated_fingerprint_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Point the on-disk source fingerprint cache at a temporary directory."""
+    fingerprint_cache_dir = tmp_path / "fingerprint-cache"
+    monkeypatch.setenv(FINGERPRINT_CACHE_DIR_ENV_VAR_NAME, str(fingerprint_cache_dir))
+    return fingerprint_cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_compose_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Point the on-disk compose file cache at a temporary directory."""
+    compose_cache_dir = tmp_path / "compose-cache"
+    monkeypatch.setenv(COMPOSE_CACHE_DIR_ENV_VAR_NAME, str(compose_cache_dir))
+    return compose_cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_pipette_definitions_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Point the on-disk pipette definitions index cache at a temporary directory."""
+    cache_dir = tmp_path / "pipette-definitions-cache"
+    monkeypatch.setenv(PIPETTE_DEFINITIONS_CACHE_DIR_ENV_VAR_NAME, str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_log_dir(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Point the directory conversion logs are written to at a temporary directory."""
+    log_dir = tmp_path / "logs"
+    monkeypatch.setenv(LOG_DIR_ENV_VAR_NAME, str(log_dir))
+    return log_dir
+
+
+@pytest.fixture
+def log_sink() -> Generator[MemoryLogSink, None, None]:
+    """Log events of conversions run by the test to memory."""
+    sink = MemoryLogSink()
+    with log_to(sink):
+        yield sink
+
+
+@pytest.fixture
+def isolated_ref_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[pathlib.Path, None, None]:
+    """Point the on-disk ref cache at a temporary directory.
+
+    Also clears the in-process ref caches before and after the test.
+    """
+    ref_cache_dir = tmp_path / "ref-cache"
+    monkeypatch.setenv(REF_CACHE_DIR_ENV_VAR_NAME, str(ref_cache_dir))
+    monkeypatch.delenv(REF_CACHE_REFRESH_ENV_VAR_NAME, raising=False)
+    monkeypatch.delenv(REF_CACHE_TTL_ENV_VAR_NAME, raising=False)
+    monkeypatch.delenv(REF_MIRROR_DIR_ENV_VAR_NAME, raising=False)
+    monkeypatch.delenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, raising=False)
+    git_interaction.clear_ref_caches()
+    yield ref_cache_dir
+    git_interaction.clear_ref_caches()
+
+
+@pytest.fixture
+def fake_ls_remote(
+    isolated_ref_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> List[str]:
+    """Replace git ls-remote with a fake returning FAKE_REFS.
+
+    Returns list of remote urls that were fetched.
+    """
+    calls: List[str] = []
+
+    def _fake_fetch(remote_url: str) -> Dict[str, str]:
+        calls.append(remote_url)
+        return {ref: FAKE_REF_SHA for ref in FAKE_REFS}
+
+    monkeypatch.setattr(git_interaction, "_ls_remote", _fake_fetch)
+    return calls
+
 
 @pytest.fixture
 def opentrons_dir(tmpdir: py.path.local) -> str:
@@ -49,10 +49,14 @@ def test_simple_values(
     assert service.environment is not None
     env_root = cast(Dict[str, Any], service.environment.__root__)
     assert env_root is not None
-    assert len(env_root.values()) == 3
     assert "LEFT_OT3_PIPETTE_DEFINITION" in env_root
     assert "RIGHT_OT3_PIPETTE_DEFINITION" in env_root
     assert "OPENTRONS_PROJECT" in env_root
+    if model.ot3_firmware_source.is_local():
+        assert len(env_root.values()) == 4
+        assert "SOURCE_FINGERPRINT" in env_root
+    else:
+        assert len(env_root.values()) == 3
 
 
 def test_local_ot3_firmware_remote_monorepo(
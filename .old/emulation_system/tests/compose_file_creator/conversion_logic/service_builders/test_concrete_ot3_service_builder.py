@@ -9,6 +9,10 @@ from emulation_system import SystemConfigurationModel
 from emulation_system.compose_file_creator import BuildItem, Service
 from emulation_system.compose_file_creator.config_file_settings import OT3Hardware
 from emulation_system.compose_file_creator.conversion import ServiceOrchestrator
+from emulation_system.compose_file_creator.conversion.service_builders.service_orchestrator import (
+    CAN_SERVER_STEP,
+    STATE_MANAGER_STEP,
+)
 from emulation_system.consts import DEV_DOCKERFILE_NAME, DOCKERFILE_NAME
 from tests.validation_helper_functions import (
     build_args_are_none,
@@ -16,6 +20,24 @@ from tests.validation_helper_functions import (
 )
 
 
+def build_ot3_services(
+    config_model: SystemConfigurationModel, dev: bool
+) -> List[Service]:
+    """Build the OT-3 Firmware Services and the services they depend on."""
+    orchestrator = ServiceOrchestrator(config_model, dev)
+    ot3_step_names = [
+        service_info.ot3_hardware.value
+        for service_info in ServiceOrchestrator.OT3_SERVICES_TO_CREATE
+    ]
+    steps = [
+        step
+        for step in orchestrator.get_build_steps()
+        if step.name in ot3_step_names + [CAN_SERVER_STEP, STATE_MANAGER_STEP]
+    ]
+    services = orchestrator.build_steps(steps)
+    return [services[step_name] for step_name in ot3_step_names]
+
+
 def get_ot3_service(service_list: List[Service], hardware: OT3Hardware) -> Service:
     """Load OT-3 Service from passed service_list."""
     for service in service_list:
@@ -60,9 +82,7 @@ def test_simple_ot3_values(
 ) -> None:
     """Tests for values that are the same for all configurations of a Smoothie Service."""
     config_model = parse_obj_as(SystemConfigurationModel, model_dict)
-    services = ServiceOrchestrator(config_model, dev)._build_ot3_services(
-        can_server_service_name="can-server", state_manager_name="state-manager"
-    )
+    services = build_ot3_services(config_model, dev)
     head = get_ot3_service(services, OT3Hardware.HEAD)
     pipette_1, pipette_2 = get_pipettes(services)
     gantry_x = get_ot3_service(services, OT3Hardware.GANTRY_X)
@@ -134,9 +154,7 @@ def test_ot3_service_environment_variables(
 ) -> None:
     """Tests for values that are the same for all configurations of a Smoothie Service."""
     config_model = parse_obj_as(SystemConfigurationModel, model_dict)
-    services = ServiceOrchestrator(config_model, dev=True)._build_ot3_services(
-        can_server_service_name="can-server", state_manager_name="state-manager"
-    )
+    services = build_ot3_services(config_model, dev=True)
     # The number of items in ServiceOrchestrator.OT3_SERVICES_TO_CREATE
     assert len(services) == 7
     head = get_ot3_service(services, OT3Hardware.HEAD)
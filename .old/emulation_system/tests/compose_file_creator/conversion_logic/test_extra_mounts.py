@@ -3,7 +3,9 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import pytest
+from pydantic import parse_obj_as
 
+from emulation_system import SystemConfigurationModel
 from emulation_system.compose_file_creator.conversion.conversion_functions import (
     convert_from_obj,
 )
@@ -110,3 +112,23 @@ def test_exception_thrown_on_invalid_container_names(
         'The following "container_names" specified in "extra-mounts" do not exist in the emulated system:'
         in str(error_info.value)
     )
+
+
+def test_extra_mounts_indexed_by_container_name(
+    extra_mounts: List[Dict[str, Any]],
+    ot3_only: Dict[str, Any],
+) -> None:
+    """Test extra mounts are looked up by container name."""
+    ot3_only["extra-mounts"] = extra_mounts
+    config_model = parse_obj_as(SystemConfigurationModel, ot3_only)
+    file_mount, dir_mount = config_model.extra_mounts
+
+    assert config_model.get_extra_mounts("ot3-head") == [dir_mount]
+    assert config_model.get_extra_mounts("ot3-state-manager") == [file_mount]
+    assert config_model.get_extra_mounts("can-server") == []
+    assert config_model.extra_mount_container_names == {
+        "edgar-allen-poebot",
+        "ot3-state-manager",
+        "ot3-head",
+        "emulator-proxy",
+    }
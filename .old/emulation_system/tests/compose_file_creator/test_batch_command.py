@@ -0,0 +1,101 @@
+"""Tests for converting many configuration files in one invocation."""
+import json
+import pathlib
+from typing import Callable
+
+import pytest
+import yaml
+
+from emulation_system.commands.batch_command import (
+    SUMMARY_FILE_NAME,
+    BatchCommand,
+    BatchConversionError,
+    expand_inputs,
+    get_output_paths,
+)
+
+
+@pytest.fixture
+def config_dir(make_config: Callable, tmp_path: pathlib.Path) -> pathlib.Path:
+    """Directory with an OT-2 and an OT-3 configuration file in subdirectories."""
+    config_dir = tmp_path / "configs"
+    for robot in ["ot2", "ot3"]:
+        robot_dir = config_dir / robot
+        robot_dir.mkdir(parents=True)
+        (robot_dir / "system.yaml").write_text(
+            yaml.dump(make_config(robot=robot, monorepo_source="path"))
+        )
+    (config_dir / "notes.md").write_text("Not a configuration file")
+    return config_dir
+
+
+def test_expand_directory_glob_and_manifest(
+    config_dir: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Confirm all input kinds expand to the same configuration files."""
+    expected = [
+        str(config_dir / "ot2" / "system.yaml"),
+        str(config_dir / "ot3" / "system.yaml"),
+    ]
+    manifest_path = tmp_path / "manifest.txt"
+    manifest_path.write_text(
+        "# CI systems\nconfigs/ot2/system.yaml\n\nconfigs/ot3/system.yaml\n"
+    )
+
+    assert expand_inputs([str(config_dir)]) == expected
+    assert expand_inputs([str(config_dir / "*" / "*.yaml")]) == expected
+    assert expand_inputs([str(manifest_path)]) == expected
+    assert expand_inputs([str(config_dir), str(manifest_path)]) == expected
+
+
+def test_output_paths_mirror_input_directories(config_dir: pathlib.Path) -> None:
+    """Confirm inputs with the same file name get separate compose files."""
+    input_paths = expand_inputs([str(config_dir)])
+    assert get_output_paths(input_paths, "/out") == {
+        input_paths[0]: "/out/ot2/system.yaml",
+        input_paths[1]: "/out/ot3/system.yaml",
+    }
+
+
+def test_batch_converts_all_inputs(
+    config_dir: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Confirm one compose file is written per input."""
+    output_dir = tmp_path / "out"
+    BatchCommand(
+        inputs=[str(config_dir)],
+        output_dir=str(output_dir),
+        remote_only=False,
+        dev=False,
+        jobs=2,
+    ).execute()
+
+    for robot in ["ot2", "ot3"]:
+        compose_file = yaml.safe_load((output_dir / robot / "system.yaml").read_text())
+        assert len(compose_file["services"]) > 0
+    summary = json.loads((output_dir / SUMMARY_FILE_NAME).read_text())
+    assert all(entry["error"] is None for entry in summary.values())
+
+
+def test_batch_reports_failures_in_summary(
+    config_dir: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Confirm a file that fails to convert does not stop the rest of the batch."""
+    bad_config_path = config_dir / "bad.yaml"
+    bad_config_path.write_text(yaml.dump({"robot": {"hardware": "not-a-robot"}}))
+    output_dir = tmp_path / "out"
+
+    with pytest.raises(BatchConversionError, match="1 of 3 files"):
+        BatchCommand(
+            inputs=[str(config_dir)],
+            output_dir=str(output_dir),
+            remote_only=False,
+            dev=False,
+            jobs=2,
+        ).execute()
+
+    summary = json.loads((output_dir / SUMMARY_FILE_NAME).read_text())
+    assert summary[str(bad_config_path)]["output_path"] is None
+    assert summary[str(bad_config_path)]["error"] is not None
+    assert (output_dir / "ot2" / "system.yaml").exists()
+    assert (output_dir / "ot3" / "system.yaml").exists()
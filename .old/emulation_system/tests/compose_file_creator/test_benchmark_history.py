@@ -0,0 +1,55 @@
+"""Tests for comparing benchmark runs."""
+import os
+import pathlib
+
+import pytest
+
+from emulation_system.consts import ROOT_DIR
+from tests.benchmarks.benchmark_suite import (
+    DEFAULT_HISTORY_FILE_PATH,
+    compare,
+    find_regressions,
+    load_history,
+    main,
+    save_history,
+)
+
+
+def test_find_regressions() -> None:
+    """Confirm only benchmarks slower by more than threshold and min delta regress."""
+    baseline = {"a/validate": 0.100, "b/validate": 0.100, "c/to_yaml": 0.001}
+    current = {"a/validate": 0.200, "b/validate": 0.110, "c/to_yaml": 0.003}
+    regressions = find_regressions(baseline, current, threshold=0.25)
+    assert [regression.key for regression in regressions] == ["a/validate"]
+    assert regressions[0].change == pytest.approx(1.0)
+
+
+def test_benchmarks_missing_from_a_run_are_ignored() -> None:
+    """Confirm adding or removing a benchmark is not a regression."""
+    assert find_regressions({"old/validate": 0.1}, {"new/validate": 1.0}, 0.25) == []
+
+
+def test_compare_requires_two_runs() -> None:
+    """Confirm comparing a history with a single run is an error."""
+    with pytest.raises(ValueError):
+        compare([{"results": {}}], 0.25, 0.0)
+
+
+def test_compare_exit_code(tmp_path: pathlib.Path) -> None:
+    """Confirm compare exits non-zero only when the latest run regressed."""
+    history_path = str(tmp_path / "history.json")
+    assert load_history(history_path) == []
+
+    save_history(
+        history_path,
+        [{"results": {"a/validate": 0.1}}, {"results": {"a/validate": 0.5}}],
+    )
+    assert main(["--history", history_path, "compare"]) == 1
+    assert main(["--history", history_path, "compare", "--threshold", "5"]) == 0
+
+
+def test_default_history_is_outside_source_tree() -> None:
+    """Confirm running benchmarks does not write into the repository."""
+    assert not os.path.abspath(DEFAULT_HISTORY_FILE_PATH).startswith(
+        os.path.abspath(ROOT_DIR)
+    )
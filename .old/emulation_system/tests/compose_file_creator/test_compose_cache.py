@@ -0,0 +1,210 @@
+"""Tests for caching generated compose files."""
+import io
+import os
+import pathlib
+import time
+from datetime import datetime, tzinfo
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+import yaml
+
+from emulation_system import compose_cache
+from emulation_system.commands.emulation_system_command import EmulationSystemCommand
+from emulation_system.compose_cache import (
+    ComposeCache,
+    get_compose_cache_key,
+    get_compose_cache_max_age,
+)
+from emulation_system.compose_file_creator.conversion import conversion_functions
+from emulation_system.consts import (
+    REF_CACHE_REFRESH_ENV_VAR_NAME,
+    REF_CACHE_TTL_ENV_VAR_NAME,
+)
+
+
+@pytest.fixture
+def conversion_calls(monkeypatch: pytest.MonkeyPatch) -> List[bool]:
+    """Record every call to convert_from_obj made by EmulationSystemCommand."""
+    calls: List[bool] = []
+    original_convert_from_obj = conversion_functions.convert_from_obj
+
+    def _tracking_convert_from_obj(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        calls.append(True)
+        return original_convert_from_obj(*args, **kwargs)
+
+    monkeypatch.setattr(
+        conversion_functions, "convert_from_obj", _tracking_convert_from_obj
+    )
+    return calls
+
+
+@pytest.fixture
+def config_path(make_config: Callable, tmp_path: pathlib.Path) -> pathlib.Path:
+    """OT-2 configuration file with local monorepo source."""
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump(make_config(robot="ot2", monorepo_source="path")))
+    return path
+
+
+def _generate(config_path: pathlib.Path, dev: bool = False) -> str:
+    output = io.StringIO()
+    with open(config_path) as input_file:
+        EmulationSystemCommand(
+            input_path=input_file,
+            output_path=output,  # type: ignore[arg-type]
+            remote_only=False,
+            dev=dev,
+        ).execute()
+    return output.getvalue()
+
+
+def test_second_generation_is_served_from_cache(
+    config_path: pathlib.Path, conversion_calls: List[bool]
+) -> None:
+    """Confirm generating the same compose file twice converts only once."""
+    first = _generate(config_path)
+    second = _generate(config_path)
+    assert first == second
+    assert len(conversion_calls) == 1
+
+
+def test_dev_flag_is_part_of_cache_key(
+    config_path: pathlib.Path, conversion_calls: List[bool]
+) -> None:
+    """Confirm dev and non-dev compose files are cached separately."""
+    _generate(config_path, dev=False)
+    _generate(config_path, dev=True)
+    assert len(conversion_calls) == 2
+
+
+def test_local_source_change_invalidates_cache(
+    config_path: pathlib.Path, opentrons_dir: str, conversion_calls: List[bool]
+) -> None:
+    """Confirm editing a local source tree regenerates the compose file."""
+    _generate(config_path)
+    pathlib.Path(opentrons_dir, "new_file.py").write_text("print('hi')")
+    _generate(config_path)
+    assert len(conversion_calls) == 2
+
+
+def test_extra_mount_host_paths_are_part_of_cache_key(
+    make_config: Callable, tmp_path: pathlib.Path
+) -> None:
+    """Confirm deleting or replacing an extra-mount host path changes the key."""
+    host_path = tmp_path / "extra.env"
+    host_path.touch()
+    config: Dict[str, Any] = make_config(robot="ot2")
+    config["extra-mounts"] = [
+        {
+            "container-names": ["otie"],
+            "host-path": str(host_path),
+            "container-path": "/extra.env",
+        }
+    ]
+    existing = get_compose_cache_key(config, False, False, None)
+    assert get_compose_cache_key(config, False, False, None) == existing
+
+    host_path.unlink()
+    deleted = get_compose_cache_key(config, False, False, None)
+    assert deleted != existing
+
+    host_path.mkdir()
+    assert get_compose_cache_key(config, False, False, None) not in [existing, deleted]
+
+
+def test_ref_refresh_skips_cache_lookup(
+    config_path: pathlib.Path,
+    conversion_calls: List[bool],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm refreshing refs always converts, and stores the result."""
+    _generate(config_path)
+    monkeypatch.setenv(REF_CACHE_REFRESH_ENV_VAR_NAME, "1")
+    _generate(config_path)
+    assert len(conversion_calls) == 2
+
+    monkeypatch.delenv(REF_CACHE_REFRESH_ENV_VAR_NAME)
+    _generate(config_path)
+    assert len(conversion_calls) == 2
+
+
+def test_remote_ref_entries_expire_with_ref_cache(
+    make_config: Callable, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    """Confirm only compose files validated against remote refs use the ref TTL."""
+    monkeypatch.setenv(REF_CACHE_TTL_ENV_VAR_NAME, "30")
+    assert get_compose_cache_max_age(make_config(robot="ot2")) is None
+    assert (
+        get_compose_cache_max_age(make_config(robot="ot2", monorepo_source="path"))
+        is None
+    )
+    assert (
+        get_compose_cache_max_age(make_config(robot="ot2", monorepo_source="branch"))
+        == 30
+    )
+
+    cache = ComposeCache(str(tmp_path), max_age_seconds=60)
+    cache.put("entry", "x")
+    written_at = time.time() - 45
+    os.utime(tmp_path / "entry.yaml", (written_at, written_at))
+    assert cache.get("entry", max_age_seconds=30) is None
+    assert cache.get("entry", max_age_seconds=120) == "x"
+    assert cache.get("entry") == "x"
+    # Serving an entry does not make it look newer
+    assert cache.get("entry", max_age_seconds=30) is None
+
+
+def test_invalid_config_is_not_cached(
+    make_config: Callable,
+    tmp_path: pathlib.Path,
+    isolated_compose_cache: pathlib.Path,
+) -> None:
+    """Confirm failed conversions store nothing and non-mappings get no key."""
+    config: Dict[str, Any] = make_config(robot="ot2")
+    config["monorepo-source"] = "/not/a/real/dir/or/ref"
+    path = tmp_path / "invalid.yaml"
+    path.write_text(yaml.dump(config))
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            _generate(path)
+    assert (
+        not isolated_compose_cache.exists() or os.listdir(isolated_compose_cache) == []
+    )
+    assert get_compose_cache_key("not a dict", False, False, None) is None
+
+
+class _FutureDatetime(datetime):
+    @classmethod
+    def now(cls, tz: Optional[tzinfo] = None) -> "_FutureDatetime":
+        return cls(2100, 1, 1)
+
+
+def test_date_is_part_of_cache_key(
+    config_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm compose files containing today's date are not served the next day."""
+    config = yaml.safe_load(config_path.read_text())
+    today = get_compose_cache_key(config, False, False, None)
+    monkeypatch.setattr(compose_cache, "datetime", _FutureDatetime)
+    assert get_compose_cache_key(config, False, False, None) != today
+
+
+def test_eviction_by_age_and_size(tmp_path: pathlib.Path) -> None:
+    """Confirm expired entries and least recently used entries are evicted."""
+    cache = ComposeCache(str(tmp_path), max_size_bytes=25, max_age_seconds=60)
+    cache.put("old", "x" * 10)
+    old_time = time.time() - 120
+    os.utime(tmp_path / "old.yaml", (old_time, old_time))
+    assert cache.get("old") is None
+
+    cache.put("first", "x" * 10)
+    cache.put("second", "x" * 10)
+    assert not (tmp_path / "old.yaml").exists()
+    os.utime(tmp_path / "first.yaml", (old_time + 90, old_time + 90))
+    os.utime(tmp_path / "second.yaml", (old_time + 100, old_time + 100))
+
+    # Reading "first" makes "second" the least recently used entry
+    assert cache.get("first") == "x" * 10
+    cache.put("third", "x" * 10)
+    assert sorted(os.listdir(tmp_path)) == ["first.yaml", "third.yaml"]
@@ -0,0 +1,86 @@
+"""Tests for resolving all source refs concurrently during validation."""
+import pathlib
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel, git_interaction
+from emulation_system.source import SourceState
+
+FAKE_NETWORK_DELAY = 0.3
+
+
+@pytest.fixture
+def slow_ls_remote(
+    isolated_ref_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> List[str]:
+    """Replace git ls-remote with a fake that takes FAKE_NETWORK_DELAY to respond.
+
+    Returns list of names of the threads that fetched refs.
+    """
+    thread_names: List[str] = []
+
+    def _slow_fetch(remote_url: str) -> Dict[str, str]:
+        thread_names.append(threading.current_thread().name)
+        time.sleep(FAKE_NETWORK_DELAY)
+        return {"edge": "a" * 40, "main": "b" * 40}
+
+    monkeypatch.setattr(git_interaction, "_ls_remote", _slow_fetch)
+    return thread_names
+
+
+@pytest.fixture
+def ot3_and_modules_all_branches(make_config: Callable) -> Dict[str, Any]:
+    """OT-3 and modules with every source pinned to a branch."""
+    return make_config(
+        robot="ot3",
+        modules={"heater-shaker-module": 1},
+        monorepo_source="branch",
+        ot3_firmware_source="branch",
+        opentrons_modules_source="branch",
+    )
+
+
+def test_branch_sources_resolved_concurrently(
+    slow_ls_remote: List[str], ot3_and_modules_all_branches: Dict[str, Any]
+) -> None:
+    """Confirm three branch-pinned sources cost one round-trip, not three."""
+    start = time.monotonic()
+    config = parse_obj_as(SystemConfigurationModel, ot3_and_modules_all_branches)
+    elapsed = time.monotonic() - start
+
+    assert len(slow_ls_remote) == 3
+    assert len(set(slow_ls_remote)) == 3
+    assert elapsed < FAKE_NETWORK_DELAY * 2
+    assert config.monorepo_source.source_state == SourceState.REMOTE_REF
+    assert config.ot3_firmware_source.source_state == SourceState.REMOTE_REF
+    assert config.opentrons_modules_source.source_state == SourceState.REMOTE_REF
+
+
+def test_latest_and_local_sources_not_fetched(
+    slow_ls_remote: List[str], make_config: Callable
+) -> None:
+    """Confirm "latest" and local path sources never trigger a ref lookup."""
+    parse_obj_as(
+        SystemConfigurationModel,
+        make_config(robot="ot3", monorepo_source="path", ot3_firmware_source="latest"),
+    )
+    assert slow_ls_remote == []
+
+
+def test_prefetch_errors_are_raised(
+    isolated_ref_cache: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    ot3_and_modules_all_branches: Dict[str, Any],
+) -> None:
+    """Confirm failures from a concurrent lookup surface to the caller."""
+
+    def _failing_fetch(remote_url: str) -> Dict[str, str]:
+        raise RuntimeError(f"Unable to get valid ref list from {remote_url}.")
+
+    monkeypatch.setattr(git_interaction, "_ls_remote", _failing_fetch)
+    with pytest.raises(RuntimeError, match="Unable to get valid ref list"):
+        parse_obj_as(SystemConfigurationModel, ot3_and_modules_all_branches)
@@ -0,0 +1,185 @@
+"""Tests for the serve daemon and its client."""
+import io
+import json
+import os
+import pathlib
+import stat
+import sys
+import threading
+from typing import Callable, Generator
+
+import pytest
+import yaml
+
+from emulation_system import daemon
+from emulation_system.consts import DAEMON_SOCKET_ENV_VAR_NAME
+from emulation_system.daemon import EmulationSystemDaemon
+from emulation_system.daemon_client import get_request_env, run_with_daemon
+from emulation_system.parsers.top_level_parser import TopLevelParser
+
+
+@pytest.fixture
+def socket_path(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    """Short socket path, Unix socket paths are limited to about 100 characters."""
+    path = str(tmp_path_factory.mktemp("daemon") / "d.sock")
+    monkeypatch.setenv(DAEMON_SOCKET_ENV_VAR_NAME, path)
+    return path
+
+
+@pytest.fixture
+def running_daemon(socket_path: str) -> Generator[EmulationSystemDaemon, None, None]:
+    """Daemon serving requests from a background thread."""
+    server = EmulationSystemDaemon(socket_path)
+    server.timeout = 0.05
+    thread = threading.Thread(target=server.serve_until_stopped)
+    thread.start()
+    yield server
+    server.stopped = True
+    thread.join()
+    server.server_close()
+
+
+@pytest.fixture
+def config_path(make_config: Callable, tmp_path: pathlib.Path) -> pathlib.Path:
+    """OT-2 configuration file with local monorepo source."""
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump(make_config(robot="ot2", monorepo_source="path")))
+    return path
+
+
+def test_socket_only_accessible_by_owner(
+    running_daemon: EmulationSystemDaemon, socket_path: str
+) -> None:
+    """Confirm the socket is created private and the umask is restored."""
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    current_umask = os.umask(0o022)
+    os.umask(current_umask)
+    assert current_umask != daemon.SOCKET_UMASK
+
+
+def test_socket_dir_only_accessible_by_owner(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    """Confirm a missing socket directory is created private."""
+    socket_dir = tmp_path_factory.mktemp("daemon") / "private"
+    server = EmulationSystemDaemon(str(socket_dir / "d.sock"))
+    server.server_close()
+    assert stat.S_IMODE(os.stat(socket_dir).st_mode) == daemon.SOCKET_DIR_MODE
+
+
+@pytest.mark.parametrize("make_path", ["file", "symlink"])
+def test_only_owned_sockets_are_used(
+    running_daemon: EmulationSystemDaemon,
+    socket_path: str,
+    config_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_path: str,
+) -> None:
+    """Confirm the client never connects to a path that is not its own socket."""
+    other_path = pathlib.Path(socket_path).with_name("other.sock")
+    if make_path == "file":
+        other_path.write_text("")
+    else:
+        other_path.symlink_to(socket_path)
+    monkeypatch.setenv(DAEMON_SOCKET_ENV_VAR_NAME, str(other_path))
+    monkeypatch.setattr(sys, "stdin", io.StringIO(config_path.read_text()))
+    assert run_with_daemon(["em-sys", "-", "-"]) is None
+    assert sys.stdin.read() == config_path.read_text()
+
+
+def test_only_emulation_env_vars_sent(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm unrelated environment variables, like credentials, are not sent."""
+    monkeypatch.setenv("GITHUB_TOKEN", "secret")
+    monkeypatch.setenv("OPENTRONS_EMULATION_LOG_LEVEL", "quiet")
+    request_env = get_request_env()
+    assert request_env["OPENTRONS_EMULATION_LOG_LEVEL"] == "quiet"
+    assert all(name.startswith("OPENTRONS_EMULATION_") for name in request_env)
+
+
+def test_no_daemon_falls_back(socket_path: str, config_path: pathlib.Path) -> None:
+    """Confirm requests run in-process when no daemon is listening."""
+    assert run_with_daemon(["emulation-system", str(config_path), "-"]) is None
+
+
+def test_unsupported_command_falls_back(
+    running_daemon: EmulationSystemDaemon, config_path: pathlib.Path
+) -> None:
+    """Confirm only emulation-system and load-containers are sent to the daemon."""
+    assert run_with_daemon(["lock", str(config_path)]) is None
+
+
+def test_daemon_output_matches_in_process(
+    running_daemon: EmulationSystemDaemon,
+    config_path: pathlib.Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm the daemon generates the same compose file as an in-process run."""
+    argv = ["emulation-system", "--no-cache", str(config_path), "-"]
+    TopLevelParser().parse(argv).execute()
+    in_process_output = capsys.readouterr().out
+
+    assert run_with_daemon(argv) == 0
+    assert capsys.readouterr().out == in_process_output
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(config_path.read_text()))
+    assert run_with_daemon(["em-sys", "--no-cache", "-", "-"]) == 0
+    assert capsys.readouterr().out == in_process_output
+
+
+def test_daemon_writes_output_file(
+    running_daemon: EmulationSystemDaemon,
+    config_path: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Confirm output files are written relative to the client's directory."""
+    output_path = tmp_path / "compose.yaml"
+    assert run_with_daemon(["em-sys", str(config_path), str(output_path)]) == 0
+    assert "services" in yaml.safe_load(output_path.read_text())
+
+
+def test_daemon_reports_errors(
+    running_daemon: EmulationSystemDaemon, capsys: pytest.CaptureFixture
+) -> None:
+    """Confirm argument errors are returned to the client like a real process."""
+    assert run_with_daemon(["em-sys", "does-not-exist.yaml", "-"]) == 2
+    assert "does-not-exist.yaml" in capsys.readouterr().err
+
+
+def test_daemon_stops_when_code_changes(
+    running_daemon: EmulationSystemDaemon,
+    config_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm the daemon hands the request back and stops after a code change."""
+    monkeypatch.setattr(daemon, "get_package_mtime", lambda: 0.0)
+    assert run_with_daemon(["em-sys", str(config_path), "-"]) is None
+    assert running_daemon.stopped
+
+
+def test_stdin_request_fails_when_daemon_stops(
+    running_daemon: EmulationSystemDaemon,
+    config_path: pathlib.Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm requests are not run in-process without the stdin already sent."""
+    monkeypatch.setattr(daemon, "get_package_mtime", lambda: 0.0)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(config_path.read_text()))
+    assert run_with_daemon(["em-sys", "-", "-"]) == 1
+    assert "Run the command again" in capsys.readouterr().err
+    assert running_daemon.stopped
+
+
+def test_stdin_forwarded_with_format_option(
+    running_daemon: EmulationSystemDaemon,
+    config_path: pathlib.Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm option values are not mistaken for the input path."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO(config_path.read_text()))
+    assert run_with_daemon(["em-sys", "--format", "ndjson", "-", "-"]) == 0
+    assert "services" in json.loads(capsys.readouterr().out)
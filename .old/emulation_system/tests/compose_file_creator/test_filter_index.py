@@ -0,0 +1,99 @@
+"""Tests for the filter index of RuntimeComposeFileModel."""
+from typing import Callable, Set, cast
+
+import pytest
+
+from emulation_system.compose_file_creator.container_filters import ContainerFilters
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    convert_from_obj,
+)
+from emulation_system.compose_file_creator.errors import InvalidFilterError
+from emulation_system.compose_file_creator.output.runtime_compose_file_model import (
+    RuntimeComposeFileModel,
+)
+
+
+@pytest.fixture
+def compose_file(make_config: Callable) -> RuntimeComposeFileModel:
+    """OT-3 compose file with hardware and firmware level modules."""
+    return convert_from_obj(
+        make_config(
+            robot="ot3",
+            modules={"heater-shaker-module": 2, "thermocycler-module": 1},
+            monorepo_source="path",
+            ot3_firmware_source="path",
+        ),
+        dev=False,
+    )
+
+
+def test_index_matches_filter_services(compose_file: RuntimeComposeFileModel) -> None:
+    """Confirm every filter and its inverse return the same services as before."""
+    assert compose_file.services is not None
+    services = list(compose_file.services.values())
+    for container_filter in ContainerFilters:
+        for filter_name in [
+            container_filter.container_filter_name,
+            f"not-{container_filter.container_filter_name}",
+        ]:
+            assert compose_file.load_containers_by_filter(
+                filter_name
+            ) == ContainerFilters.filter_services(filter_name, services)
+
+
+def test_index_rebuilt_when_services_change(
+    compose_file: RuntimeComposeFileModel,
+) -> None:
+    """Confirm mutating or replacing services is reflected by lookups."""
+    assert compose_file.services is not None
+    can_server = compose_file.can_server
+    assert can_server is not None
+    assert can_server.container_name is not None
+
+    del compose_file.services[can_server.container_name]
+    assert compose_file.can_server is None
+
+    compose_file.services["can-server-copy"] = can_server
+    assert compose_file.can_server is can_server
+
+    compose_file.services = {}
+    assert compose_file.can_server is None
+    assert compose_file.load_containers_by_filter("not-all") == []
+
+
+def test_invalid_filter(compose_file: RuntimeComposeFileModel) -> None:
+    """Confirm unknown filters still raise InvalidFilterError."""
+    with pytest.raises(InvalidFilterError):
+        compose_file.load_containers_by_filter("not-a-filter")
+
+
+def _names(compose_file: RuntimeComposeFileModel, filter_name: str) -> Set[str]:
+    return {
+        cast(str, service.container_name)
+        for service in compose_file.load_containers_by_filter(filter_name)
+    }
+
+
+def test_union_and_intersection(compose_file: RuntimeComposeFileModel) -> None:
+    """Confirm composite filters are evaluated as set operations."""
+    firmware = _names(compose_file, "ot3-firmware")
+    modules = _names(compose_file, "modules")
+    hardware_modules = _names(compose_file, "hardware-modules")
+
+    assert _names(compose_file, "ot3-firmware,modules") == firmware | modules
+    assert (
+        _names(compose_file, "modules+not-hardware-modules")
+        == modules - hardware_modules
+    )
+    assert _names(compose_file, "modules+hardware-modules,can-server") == (
+        hardware_modules | _names(compose_file, "can-server")
+    )
+    assert _names(compose_file, "modules+not-modules") == set()
+
+
+def test_composite_filter_with_invalid_term(
+    compose_file: RuntimeComposeFileModel,
+) -> None:
+    """Confirm every term of a composite filter is validated."""
+    with pytest.raises(InvalidFilterError):
+        compose_file.load_containers_by_filter("modules,not-a-filter")
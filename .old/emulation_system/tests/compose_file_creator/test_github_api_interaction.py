@@ -1,8 +1,19 @@
 """Validate github API interface"""
 
+import json
+import os
+import pathlib
+import time
+from typing import List
+
 import pytest
 
 from emulation_system import git_interaction
+from emulation_system.consts import (
+    REF_CACHE_REFRESH_ENV_VAR_NAME,
+    REF_CACHE_TTL_ENV_VAR_NAME,
+)
+from tests.compose_file_creator.conftest import FAKE_REF_SHA
 
 
 @pytest.mark.parametrize(
@@ -22,3 +33,71 @@ from emulation_system import git_interaction
 def test_check_if_ref_exists(owner: str, repo: str, ref: str, exists: bool) -> None:
     """Test check_if_ref_exists."""
     assert git_interaction.check_if_ref_exists(owner, repo, ref) == exists
+
+
+FAKE_REMOTE_URL = "https://github.com/Opentrons/fake-repo.git"
+
+
+def test_ref_list_is_read_from_disk_cache(fake_ls_remote: List[str]) -> None:
+    """Confirm a second process (simulated by clearing lru_cache) reuses the cache."""
+    assert git_interaction.get_valid_ref_list(FAKE_REMOTE_URL) == ["edge", "main"]
+    git_interaction.clear_ref_caches()
+    assert git_interaction.get_valid_ref_list(FAKE_REMOTE_URL) == ["edge", "main"]
+    assert fake_ls_remote == [FAKE_REMOTE_URL]
+
+
+def test_expired_ref_cache_is_refetched(
+    fake_ls_remote: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm entries older than the TTL are ignored."""
+    monkeypatch.setenv(REF_CACHE_TTL_ENV_VAR_NAME, "0")
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL)
+    git_interaction.clear_ref_caches()
+    time.sleep(0.01)
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL)
+    assert fake_ls_remote == [FAKE_REMOTE_URL, FAKE_REMOTE_URL]
+
+
+def test_force_refresh_skips_ref_cache(
+    fake_ls_remote: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm force refresh flag and env var both skip the cache."""
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL)
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL, force_refresh=True)
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL, force_refresh=True)
+    git_interaction.clear_ref_caches()
+    monkeypatch.setenv(REF_CACHE_REFRESH_ENV_VAR_NAME, "1")
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL)
+    assert len(fake_ls_remote) == 4
+
+
+def test_force_refresh_updates_in_process_cache(
+    fake_ls_remote: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm refs fetched by a forced refresh are returned by later lookups."""
+    assert git_interaction.get_valid_ref_list(FAKE_REMOTE_URL) == ["edge", "main"]
+    monkeypatch.setattr(
+        git_interaction,
+        "_ls_remote",
+        lambda remote_url: {"edge": FAKE_REF_SHA, "release": FAKE_REF_SHA},
+    )
+    assert git_interaction.get_valid_ref_list(FAKE_REMOTE_URL, force_refresh=True) == [
+        "edge",
+        "release",
+    ]
+    assert git_interaction.get_valid_ref_list(FAKE_REMOTE_URL) == ["edge", "release"]
+    assert "release" in git_interaction.get_ref_index(FAKE_REMOTE_URL)
+
+
+def test_ref_cache_write_leaves_no_temp_files(
+    fake_ls_remote: List[str], isolated_ref_cache: pathlib.Path
+) -> None:
+    """Confirm atomic write leaves only the final cache file behind."""
+    git_interaction.get_valid_ref_list(FAKE_REMOTE_URL)
+    cache_files = os.listdir(isolated_ref_cache)
+    assert len(cache_files) == 1
+    assert cache_files[0].endswith(".json")
+    with open(isolated_ref_cache / cache_files[0]) as file:
+        cache_entry = json.load(file)
+    assert cache_entry["remote_url"] == FAKE_REMOTE_URL
+    assert cache_entry["ref_shas"] == {"edge": FAKE_REF_SHA, "main": FAKE_REF_SHA}
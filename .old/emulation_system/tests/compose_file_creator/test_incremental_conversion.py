@@ -0,0 +1,146 @@
+"""Tests for incremental conversion with a service-level diff."""
+import io
+import pathlib
+from typing import Any, Callable, Dict, List
+
+import pytest
+import yaml
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.commands import EmulationSystemCommand
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    _convert,
+)
+from emulation_system.compose_file_creator.conversion.incremental import (
+    ServiceDiff,
+    ServiceSnapshot,
+    convert_incrementally,
+)
+from emulation_system.compose_file_creator.errors import (
+    MultipleDocumentsNotSupportedError,
+)
+from emulation_system.compose_file_creator.logging.log_sink import MemoryLogSink
+
+MODULES = {"heater-shaker-module": 2, "temperature-module": 1}
+
+
+@pytest.fixture
+def config(make_config: Callable) -> Dict[str, Any]:
+    """OT-2 configuration with modules and local monorepo source."""
+    return make_config(robot="ot2", modules=MODULES, monorepo_source="path")
+
+
+def _parse(config: Dict[str, Any]) -> SystemConfigurationModel:
+    return parse_obj_as(SystemConfigurationModel, config)
+
+
+def _first_snapshot(config: Dict[str, Any]) -> ServiceSnapshot:
+    return convert_incrementally(_parse(config), False, None)[2]
+
+
+def _module(config: Dict[str, Any], module_id: str) -> Dict[str, Any]:
+    return next(module for module in config["modules"] if module["id"] == module_id)
+
+
+def test_first_conversion_matches_full_conversion(config: Dict[str, Any]) -> None:
+    """Confirm every service is new and the compose file is unchanged."""
+    compose_file, diff, _ = convert_incrementally(_parse(config), False, None)
+    assert compose_file.to_yaml() == _convert(_parse(config), False).to_yaml()
+    assert diff.recreate == []
+    assert diff.orphaned == []
+    assert compose_file.services is not None
+    assert diff.new == list(compose_file.services)
+
+
+def test_unchanged_config_rebuilds_nothing(
+    config: Dict[str, Any], log_sink: MemoryLogSink
+) -> None:
+    """Confirm no service is built again when no input changed."""
+    snapshot = _first_snapshot(config)
+    log_start = len(log_sink.events)
+    compose_file, diff, _ = convert_incrementally(_parse(config), False, snapshot)
+
+    assert diff == ServiceDiff()
+    assert log_sink.events[log_start:] == []
+    assert compose_file.to_yaml() == _convert(_parse(config), False).to_yaml()
+
+
+def test_changed_module_env_vars(
+    config: Dict[str, Any], log_sink: MemoryLogSink
+) -> None:
+    """Confirm only the changed module is rebuilt and recreated."""
+    snapshot = _first_snapshot(config)
+    module_id = config["modules"][0]["id"]
+    _module(config, module_id)["module-env-vars"] = {"DEBUG": "1"}
+    log_start = len(log_sink.events)
+    compose_file, diff, _ = convert_incrementally(_parse(config), False, snapshot)
+
+    assert diff == ServiceDiff(recreate=[module_id])
+    assert {event.service for event in log_sink.events[log_start:]} == {module_id}
+    assert compose_file.to_yaml() == _convert(_parse(config), False).to_yaml()
+
+
+def test_added_and_removed_modules(
+    config: Dict[str, Any], make_config: Callable
+) -> None:
+    """Confirm added modules are new and removed modules are orphaned."""
+    snapshot = _first_snapshot(config)
+    new_config = make_config(
+        robot="ot2",
+        modules={"heater-shaker-module": 3},
+        monorepo_source="path",
+    )
+    _, diff, _ = convert_incrementally(_parse(new_config), False, snapshot)
+
+    removed: List[str] = [
+        module["id"]
+        for module in config["modules"]
+        if module["hardware"] == "temperature-module"
+    ]
+    assert diff.recreate == []
+    assert diff.new == [new_config["modules"][2]["id"]]
+    assert diff.orphaned == removed
+
+
+def test_previous_configuration_instead_of_snapshot(config: Dict[str, Any]) -> None:
+    """Confirm the previous configuration can be passed instead of a snapshot."""
+    previous_config_model = _parse(config)
+    config["system-unique-id"] = "incremental"
+    _, diff, _ = convert_incrementally(_parse(config), False, previous_config_model)
+    assert diff.recreate == []
+    assert len(diff.new) == len(diff.orphaned) > 0
+
+
+def test_command_writes_snapshot_and_changes(
+    config: Dict[str, Any], tmp_path: pathlib.Path
+) -> None:
+    """Confirm the command updates the snapshot and reports changed containers."""
+    snapshot_path = tmp_path / "system.snapshot.json"
+    changes_path = tmp_path / "system.changes"
+
+    def run(documents: List[Dict[str, Any]]) -> None:
+        input_stream = io.StringIO(yaml.safe_dump_all(documents))
+        input_stream.name = "<stdin>"
+        EmulationSystemCommand(
+            input_path=input_stream,  # type: ignore[arg-type]
+            output_path=io.StringIO(),  # type: ignore[arg-type]
+            remote_only=False,
+            dev=False,
+            snapshot_path=str(snapshot_path),
+            changes_path=str(changes_path),
+        ).execute()
+
+    run([config])
+    assert snapshot_path.exists()
+    assert all(
+        line.startswith("new ") for line in changes_path.read_text().splitlines()
+    )
+
+    module_id = config["modules"][0]["id"]
+    _module(config, module_id)["module-env-vars"] = {"DEBUG": "1"}
+    run([config])
+    assert changes_path.read_text() == f"recreate {module_id}\n"
+
+    with pytest.raises(MultipleDocumentsNotSupportedError):
+        run([config, config])
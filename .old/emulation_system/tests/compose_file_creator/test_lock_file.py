@@ -0,0 +1,160 @@
+"""Tests for pinning remote sources to commit SHAs with a lock file."""
+import io
+import json
+import pathlib
+from typing import Any, Callable, Dict
+
+import pytest
+import yaml
+
+from emulation_system import SystemConfigurationModel, git_interaction
+from emulation_system.commands import EmulationSystemCommand, LockCommand
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    convert_from_obj,
+)
+from emulation_system.compose_file_creator.errors import LockFileOutOfDateError
+from emulation_system.consts import REF_SNAPSHOT_FILE_ENV_VAR_NAME
+from emulation_system.lock_file import (
+    LockedSource,
+    LockFileModel,
+    apply_lock,
+    create_lock,
+    get_lock_file_path,
+)
+
+MONOREPO_SHA = "a" * 40
+OT3_FIRMWARE_SHA = "b" * 40
+OPENTRONS_MODULES_SHA = "c" * 40
+
+
+@pytest.fixture
+def refs_snapshot(
+    isolated_ref_cache: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Resolve refs against a snapshot so SHAs are known."""
+    snapshot_path = tmp_path / "refs-snapshot.json"
+    snapshot_path.write_text(
+        json.dumps(
+            {
+                "Opentrons/opentrons": {"edge": MONOREPO_SHA},
+                "Opentrons/ot3-firmware": {"main": OT3_FIRMWARE_SHA},
+                "Opentrons/opentrons-modules": {"edge": OPENTRONS_MODULES_SHA},
+            }
+        )
+    )
+    monkeypatch.setenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, str(snapshot_path))
+
+
+@pytest.fixture
+def ot3_config(make_config: Callable) -> Dict[str, Any]:
+    """OT-3 with branch monorepo, latest firmware, and local modules source."""
+    return make_config(
+        robot="ot3",
+        monorepo_source="branch",
+        ot3_firmware_source="latest",
+        opentrons_modules_source="path",
+    )
+
+
+def test_create_lock(refs_snapshot: None, ot3_config: Dict[str, Any]) -> None:
+    """Confirm remote sources are locked and local sources are not."""
+    lock = create_lock(SystemConfigurationModel.from_dict(ot3_config))
+    assert lock.sources == {
+        "opentrons": LockedSource(ref="edge", commit_sha=MONOREPO_SHA),
+        "ot3-firmware": LockedSource(ref="main", commit_sha=OT3_FIRMWARE_SHA),
+    }
+
+
+def test_create_lock_reuses_validated_refs(
+    refs_snapshot: None, make_config: Callable, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm creating a lock does not look refs up again after validation."""
+    config_model = SystemConfigurationModel.from_dict(
+        make_config(
+            robot="ot3",
+            monorepo_source="branch",
+            ot3_firmware_source="branch",
+            opentrons_modules_source="path",
+        )
+    )
+
+    def _fail(remote_url: str) -> Dict[str, str]:
+        raise AssertionError(f"Refs of {remote_url} were looked up again.")
+
+    monkeypatch.setattr(git_interaction, "get_ref_shas", _fail)
+    assert create_lock(config_model).sources["opentrons"].commit_sha == MONOREPO_SHA
+
+
+def test_locked_build_args_use_commit_sha(
+    refs_snapshot: None, ot3_config: Dict[str, Any]
+) -> None:
+    """Confirm build args download the pinned commit instead of the branch."""
+    lock = create_lock(SystemConfigurationModel.from_dict(ot3_config))
+    config_model = SystemConfigurationModel.from_dict(ot3_config)
+    apply_lock(config_model, lock)
+    assert config_model.monorepo_source.generate_build_args() == {
+        "OPENTRONS_SOURCE_DOWNLOAD_LOCATION": f"https://github.com/Opentrons/opentrons.git#{MONOREPO_SHA}"
+    }
+    assert config_model.ot3_firmware_source.generate_build_args() == {
+        "FIRMWARE_SOURCE_DOWNLOAD_LOCATION": f"https://github.com/Opentrons/ot3-firmware.git#{OT3_FIRMWARE_SHA}"
+    }
+    assert config_model.opentrons_modules_source.generate_build_args() is None
+
+
+def test_out_of_date_lock(refs_snapshot: None, ot3_config: Dict[str, Any]) -> None:
+    """Confirm a lock for a different ref is rejected."""
+    lock = LockFileModel(
+        sources={"opentrons": LockedSource(ref="release", commit_sha=MONOREPO_SHA)}
+    )
+    with pytest.raises(LockFileOutOfDateError):
+        convert_from_obj(ot3_config, False, lock)
+
+
+def test_commands_write_and_use_lock_file(
+    refs_snapshot: None, ot3_config: Dict[str, Any], tmp_path: pathlib.Path
+) -> None:
+    """Confirm lock command writes config.lock and emulation-system uses it."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.dump(ot3_config))
+
+    with open(config_path) as input_file:
+        LockCommand(input_path=input_file).execute()
+    assert get_lock_file_path(str(config_path)) == str(tmp_path / "config.lock")
+    assert (tmp_path / "config.lock").is_file()
+
+    output = io.StringIO()
+    with open(config_path) as input_file:
+        EmulationSystemCommand(
+            input_path=input_file,
+            output_path=output,  # type: ignore[arg-type]
+            remote_only=False,
+            dev=False,
+        ).execute()
+    assert f"opentrons.git#{MONOREPO_SHA}" in output.getvalue()
+    assert "opentrons.git#edge" not in output.getvalue()
+
+
+def test_lock_file_only_applies_to_its_config(
+    refs_snapshot: None, ot3_config: Dict[str, Any], tmp_path: pathlib.Path
+) -> None:
+    """Confirm a lock file is not picked up by other configs in the same directory."""
+    locked_config_path = tmp_path / "locked.yaml"
+    unlocked_config_path = tmp_path / "unlocked.yaml"
+    locked_config_path.write_text(yaml.dump(ot3_config))
+    unlocked_config_path.write_text(yaml.dump(ot3_config))
+
+    with open(locked_config_path) as input_file:
+        LockCommand(input_path=input_file).execute()
+
+    output = io.StringIO()
+    with open(unlocked_config_path) as input_file:
+        EmulationSystemCommand(
+            input_path=input_file,
+            output_path=output,  # type: ignore[arg-type]
+            remote_only=False,
+            dev=False,
+        ).execute()
+    assert "opentrons.git#edge" in output.getvalue()
+    assert f"opentrons.git#{MONOREPO_SHA}" not in output.getvalue()
@@ -0,0 +1,147 @@
+"""Tests for the log levels of the compose file creator log."""
+import pathlib
+from typing import Any, Callable, List
+
+import pytest
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    _convert,
+)
+from emulation_system.compose_file_creator.logging import InputLoggingClient
+from emulation_system.compose_file_creator.logging.abstract_logging_client import (
+    AbstractLoggingClient,
+)
+from emulation_system.compose_file_creator.logging.log_sink import (
+    LogLevel,
+    MemoryLogSink,
+    get_log_level,
+)
+from emulation_system.consts import LOG_LEVEL_ENV_VAR_NAME
+from emulation_system.parsers.top_level_parser import TopLevelParser
+
+
+@pytest.fixture
+def config_model(make_config: Callable) -> SystemConfigurationModel:
+    """OT-3 configuration with modules and local sources."""
+    return parse_obj_as(
+        SystemConfigurationModel,
+        make_config(
+            robot="ot3",
+            modules={"heater-shaker-module": 1, "temperature-module": 1},
+            monorepo_source="path",
+            ot3_firmware_source="path",
+        ),
+    )
+
+
+class _Unformattable:
+    """Fails if anything tries to build log output from it."""
+
+    def __iter__(self) -> Any:  # noqa: ANN401
+        raise AssertionError("Log output was formatted")
+
+    def __str__(self) -> str:
+        raise AssertionError("Log output was formatted")
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_quiet_logs_nothing(
+    config_model: SystemConfigurationModel,
+    log_sink: MemoryLogSink,
+    monkeypatch: pytest.MonkeyPatch,
+    parallel: bool,
+) -> None:
+    """Confirm nothing is logged and the compose file is unchanged."""
+    expected = _convert(config_model, False).to_yaml()
+    log_sink.events.clear()
+
+    monkeypatch.setenv(LOG_LEVEL_ENV_VAR_NAME, "quiet")
+    assert _convert(config_model, False, parallel).to_yaml() == expected
+    assert log_sink.events == []
+
+
+def test_no_sink_logs_nothing(
+    config_model: SystemConfigurationModel, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm log methods are skipped when no sink is set."""
+
+    def fail(*args: Any) -> None:  # noqa: ANN401
+        raise AssertionError("Log event was written")
+
+    monkeypatch.setattr(AbstractLoggingClient, "_log_decision", fail)
+    _convert(config_model, False)
+
+
+def test_quiet_skips_formatting(
+    log_sink: MemoryLogSink, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm log methods return before formatting their arguments."""
+    monkeypatch.setenv(LOG_LEVEL_ENV_VAR_NAME, "quiet")
+    logging_client = InputLoggingClient("input", False)
+    logging_client.log_networks(_Unformattable())  # type: ignore[arg-type]
+    logging_client.log_volumes(_Unformattable())  # type: ignore[arg-type]
+    logging_client.log_container_name(_Unformattable(), _Unformattable(), "id")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_verbose_logs_build_steps(
+    config_model: SystemConfigurationModel,
+    log_sink: MemoryLogSink,
+    monkeypatch: pytest.MonkeyPatch,
+    parallel: bool,
+) -> None:
+    """Confirm verbose logs everything normal does, followed by the build steps."""
+    _convert(config_model, False, parallel)
+    normal_events = list(log_sink.events)
+    log_sink.events.clear()
+    monkeypatch.setenv(LOG_LEVEL_ENV_VAR_NAME, "verbose")
+    _convert(config_model, False, parallel)
+    verbose_events = log_sink.events
+
+    build_step_events = verbose_events[len(normal_events) :]
+    assert "build-step" not in {event.field for event in normal_events}
+    assert verbose_events[: len(normal_events)] == normal_events
+    assert len(build_step_events) > 0
+    assert all(event.field == "build-step" for event in build_step_events)
+    assert all(event.reason[0] == "Built." for event in build_step_events)
+
+
+@pytest.mark.parametrize(
+    "flags, expected",
+    [
+        ([], LogLevel.NORMAL),
+        (["--quiet"], LogLevel.QUIET),
+        (["--verbose"], LogLevel.VERBOSE),
+    ],
+)
+def test_log_level_flags(
+    flags: List[str],
+    expected: LogLevel,
+    config_model: SystemConfigurationModel,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm --quiet and --verbose set the log level."""
+    # Restores the environment variable after the parser sets it
+    monkeypatch.setenv(LOG_LEVEL_ENV_VAR_NAME, "normal")
+    config_path = tmp_path / "system.json"
+    config_path.write_text(config_model.json(by_alias=True))
+    TopLevelParser().parse([*flags, "emulation-system", str(config_path), "-"])
+    assert get_log_level() == expected
+
+
+def test_quiet_and_verbose_are_exclusive(tmp_path: pathlib.Path) -> None:
+    """Confirm --quiet and --verbose cannot be combined."""
+    with pytest.raises(SystemExit):
+        TopLevelParser().parse(
+            ["--quiet", "--verbose", "emulation-system", str(tmp_path), "-"]
+        )
+
+
+def test_invalid_log_level(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm an unknown log level is reported."""
+    monkeypatch.setenv(LOG_LEVEL_ENV_VAR_NAME, "loud")
+    with pytest.raises(ValueError):
+        get_log_level()
@@ -0,0 +1,114 @@
+"""Tests for converting multi-document YAML streams."""
+import io
+import json
+from typing import Any, Callable, Dict, List
+
+import pytest
+import yaml
+
+from emulation_system.commands import EmulationSystemCommand, LoadContainersCommand
+from emulation_system.commands.emulation_system_command import (
+    JSON_FORMAT,
+    NDJSON_FORMAT,
+)
+from emulation_system.compose_file_creator.errors import (
+    MultipleDocumentsNotSupportedError,
+)
+
+
+@pytest.fixture
+def configs(make_config: Callable) -> List[Dict[str, Any]]:
+    """An OT-2 and an OT-3 configuration with local monorepo source."""
+    return [
+        make_config(robot="ot2", monorepo_source="path"),
+        make_config(robot="ot3", monorepo_source="path"),
+    ]
+
+
+def _stream(documents: List[Dict[str, Any]]) -> io.StringIO:
+    stream = io.StringIO(yaml.safe_dump_all(documents))
+    stream.name = "<stdin>"
+    return stream
+
+
+def _convert(input_stream: io.StringIO, output_format: str = "yaml") -> str:
+    output = io.StringIO()
+    EmulationSystemCommand(
+        input_path=input_stream,  # type: ignore[arg-type]
+        output_path=output,  # type: ignore[arg-type]
+        remote_only=False,
+        dev=False,
+        output_format=output_format,
+    ).execute()
+    return output.getvalue()
+
+
+def test_yaml_stream(configs: List[Dict[str, Any]]) -> None:
+    """Confirm each document becomes one compose file in a YAML stream."""
+    compose_files = list(yaml.safe_load_all(_convert(_stream(configs))))
+    assert len(compose_files) == 2
+    assert any("smoothie" in name for name in compose_files[0]["services"])
+    assert any("can-server" in name for name in compose_files[1]["services"])
+
+
+def test_single_document_output_unchanged(configs: List[Dict[str, Any]]) -> None:
+    """Confirm a single document is not prefixed with a document separator."""
+    assert not _convert(_stream(configs[:1])).startswith("---")
+
+
+def test_ndjson_stream(configs: List[Dict[str, Any]]) -> None:
+    """Confirm each document becomes one line of JSON."""
+    lines = _convert(_stream(configs), NDJSON_FORMAT).splitlines()
+    assert len(lines) == 2
+    yaml_compose_files = list(yaml.safe_load_all(_convert(_stream(configs))))
+    assert [json.loads(line) for line in lines] == yaml_compose_files
+
+
+def test_empty_stream_is_invalid() -> None:
+    """Confirm empty input is still reported as an invalid configuration."""
+    with pytest.raises(Exception):
+        _convert(_stream([]))
+
+
+def _load_robot_servers(
+    configs: List[Dict[str, Any]], output_format: str, capsys: pytest.CaptureFixture
+) -> str:
+    LoadContainersCommand(
+        input_path=_stream(configs),  # type: ignore[arg-type]
+        filter="robot-server",
+        local_only=False,
+        output_format=output_format,
+    ).execute()
+    return capsys.readouterr().out
+
+
+def test_load_containers_text_stream(
+    configs: List[Dict[str, Any]], capsys: pytest.CaptureFixture
+) -> None:
+    """Confirm container names of every document are separated by "---"."""
+    ot2_id, ot3_id = [config["robot"]["id"] for config in configs]
+    output = _load_robot_servers(configs, "text", capsys)
+    assert output == f"{ot2_id}\n---\n{ot3_id}\n"
+
+
+def test_load_containers_ndjson_stream(
+    configs: List[Dict[str, Any]], capsys: pytest.CaptureFixture
+) -> None:
+    """Confirm container names of every document are printed as a JSON list."""
+    ot2_id, ot3_id = [config["robot"]["id"] for config in configs]
+    output = _load_robot_servers(configs, NDJSON_FORMAT, capsys)
+    assert output == f'["{ot2_id}"]\n["{ot3_id}"]\n'
+
+
+def test_json_output(configs: List[Dict[str, Any]]) -> None:
+    """Confirm JSON output is the same compose file as YAML output."""
+    json_compose_file = _convert(_stream(configs[:1]), JSON_FORMAT)
+    assert json.loads(json_compose_file) == yaml.safe_load(
+        _convert(_stream(configs[:1]))
+    )
+
+
+def test_json_output_rejects_multiple_documents(configs: List[Dict[str, Any]]) -> None:
+    """Confirm multiple documents are not written as invalid JSON."""
+    with pytest.raises(MultipleDocumentsNotSupportedError):
+        _convert(_stream(configs), JSON_FORMAT)
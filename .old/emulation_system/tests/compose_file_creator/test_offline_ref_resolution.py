@@ -0,0 +1,132 @@
+"""Tests for resolving git refs against a local mirror or refs snapshot."""
+
+import json
+import pathlib
+import subprocess
+from typing import List
+
+import pytest
+
+from emulation_system import git_interaction
+from emulation_system.compose_file_creator.config_file_settings import (
+    OpentronsRepository,
+)
+from emulation_system.consts import (
+    REF_MIRROR_DIR_ENV_VAR_NAME,
+    REF_SNAPSHOT_FILE_ENV_VAR_NAME,
+)
+from emulation_system.source import SourceState
+
+OPENTRONS_REMOTE_URL = git_interaction.get_remote_url("Opentrons", "opentrons")
+EDGE_SHA = "1" * 40
+RELEASE_SHA = "2" * 40
+
+
+@pytest.fixture
+def refs_snapshot(
+    isolated_ref_cache: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> pathlib.Path:
+    """Select the snapshot backend with a snapshot containing the opentrons repo."""
+    snapshot_path = tmp_path / "refs-snapshot.json"
+    snapshot_path.write_text(
+        json.dumps({"Opentrons/opentrons": {"edge": EDGE_SHA, "v6.0.0": RELEASE_SHA}})
+    )
+    monkeypatch.setenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, str(snapshot_path))
+    monkeypatch.delenv(REF_MIRROR_DIR_ENV_VAR_NAME, raising=False)
+    return snapshot_path
+
+
+@pytest.fixture
+def mirror_dir(
+    isolated_ref_cache: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> pathlib.Path:
+    """Select the mirror backend with a bare mirror of a tiny opentrons repo."""
+
+    def _git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            check=True,
+            capture_output=True,
+        )
+
+    work_tree = tmp_path / "work"
+    mirrors = tmp_path / "mirrors"
+    _git("init", "-q", "-b", "edge", str(work_tree))
+    _git("-C", str(work_tree), "commit", "-q", "--allow-empty", "-m", "initial")
+    _git("-C", str(work_tree), "tag", "-a", "v6.0.0", "-m", "release")
+    _git("clone", "-q", "--mirror", str(work_tree), str(mirrors / "opentrons.git"))
+    monkeypatch.setenv(REF_MIRROR_DIR_ENV_VAR_NAME, str(mirrors))
+    monkeypatch.delenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, raising=False)
+    return mirrors
+
+
+def test_backend_defaults_to_remote(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm Github is used when no offline backend is configured."""
+    monkeypatch.delenv(REF_MIRROR_DIR_ENV_VAR_NAME, raising=False)
+    monkeypatch.delenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, raising=False)
+    assert git_interaction.get_ref_backend() == git_interaction.RefBackend.REMOTE
+
+
+def test_both_offline_backends_is_an_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm mirror and snapshot backends cannot both be selected."""
+    monkeypatch.setenv(REF_MIRROR_DIR_ENV_VAR_NAME, "/mirrors")
+    monkeypatch.setenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, "/snapshot.json")
+    with pytest.raises(ValueError):
+        git_interaction.get_ref_backend()
+
+
+def test_refs_read_from_snapshot(
+    refs_snapshot: pathlib.Path, fake_ls_remote: List[str]
+) -> None:
+    """Confirm refs come from the snapshot without calling git ls-remote."""
+    assert git_interaction.get_valid_ref_list(OPENTRONS_REMOTE_URL) == [
+        "edge",
+        "v6.0.0",
+    ]
+    assert git_interaction.get_ref_shas(OPENTRONS_REMOTE_URL)["edge"] == EDGE_SHA
+    assert (
+        SourceState.to_source_state("edge", OpentronsRepository.OPENTRONS)
+        == SourceState.REMOTE_REF
+    )
+    assert fake_ls_remote == []
+
+
+def test_repo_missing_from_snapshot(refs_snapshot: pathlib.Path) -> None:
+    """Confirm a repo that is not in the snapshot is reported."""
+    with pytest.raises(RuntimeError, match="Opentrons/ot3-firmware"):
+        git_interaction.check_if_ref_exists("Opentrons", "ot3-firmware", "main")
+
+
+def test_refs_read_from_mirror(mirror_dir: pathlib.Path) -> None:
+    """Confirm refs come from the local mirror and annotated tags are peeled."""
+    ref_shas = git_interaction.get_ref_shas(OPENTRONS_REMOTE_URL)
+    assert sorted(ref_shas) == ["edge", "v6.0.0"]
+    assert ref_shas["edge"] == ref_shas["v6.0.0"]
+    assert git_interaction.check_if_ref_exists("Opentrons", "opentrons", "edge")
+
+
+def test_missing_mirror(mirror_dir: pathlib.Path) -> None:
+    """Confirm a repo without a mirror is reported."""
+    with pytest.raises(RuntimeError, match="no local mirror found"):
+        git_interaction.check_if_ref_exists("Opentrons", "ot3-firmware", "main")
+
+
+def test_write_refs_snapshot_from_mirror(
+    mirror_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm a snapshot written from a mirror can be used as the snapshot backend."""
+    snapshot_path = tmp_path / "written-snapshot.json"
+    git_interaction.write_refs_snapshot(
+        str(snapshot_path), [("Opentrons", "opentrons")]
+    )
+    mirror_ref_shas = git_interaction.get_ref_shas(OPENTRONS_REMOTE_URL)
+
+    monkeypatch.delenv(REF_MIRROR_DIR_ENV_VAR_NAME)
+    monkeypatch.setenv(REF_SNAPSHOT_FILE_ENV_VAR_NAME, str(snapshot_path))
+    assert git_interaction.get_ref_shas(OPENTRONS_REMOTE_URL) == mirror_ref_shas
@@ -0,0 +1,112 @@
+"""Tests for building services concurrently."""
+from typing import Any, Callable, Dict, List, Tuple, cast
+
+import pytest
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator import Service
+from emulation_system.compose_file_creator.conversion import ServiceOrchestrator
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    _convert,
+)
+from emulation_system.compose_file_creator.errors import UnbuildableStepsError
+from emulation_system.compose_file_creator.logging.log_sink import (
+    AbstractLogSink,
+    LogEvent,
+    MemoryLogSink,
+    get_log_sink,
+)
+
+MODULES = {
+    "heater-shaker-module": 2,
+    "thermocycler-module": 2,
+    "temperature-module": 2,
+    "magnetic-module": 2,
+}
+
+
+def _config_model(make_config: Callable, robot: str) -> SystemConfigurationModel:
+    config: Dict[str, Any] = make_config(
+        robot=robot,
+        modules=MODULES,
+        monorepo_source="path",
+        ot3_firmware_source="path",
+        opentrons_modules_source="path",
+    )
+    return parse_obj_as(SystemConfigurationModel, config)
+
+
+def _convert_and_log(
+    config_model: SystemConfigurationModel,
+    parallel: bool,
+    log_sink: MemoryLogSink,
+) -> Tuple[str, List[LogEvent]]:
+    log_start = len(log_sink.events)
+    compose_file = _convert(config_model, False, parallel).to_yaml()
+    return compose_file, log_sink.events[log_start:]
+
+
+@pytest.mark.parametrize("robot", ["ot2", "ot3"])
+def test_parallel_build_matches_serial(
+    robot: str, make_config: Callable, log_sink: MemoryLogSink
+) -> None:
+    """Confirm the compose file and log do not depend on how services are built."""
+    config_model = _config_model(make_config, robot)
+    serial_compose_file, serial_log = _convert_and_log(config_model, False, log_sink)
+    parallel_compose_file, parallel_log = _convert_and_log(config_model, True, log_sink)
+
+    assert parallel_compose_file == serial_compose_file
+    assert parallel_log == serial_log
+    assert len(parallel_log) > 0
+
+
+def test_build_steps_depend_on_named_services(make_config: Callable) -> None:
+    """Confirm services referring to other services by name depend on them."""
+    config_model = _config_model(make_config, "ot3")
+    steps = {
+        step.name: step
+        for step in ServiceOrchestrator(config_model, False).get_build_steps()
+    }
+    robot_id = config_model.robot.id  # type: ignore[union-attr]
+    assert steps["emulator-proxy"].dependencies == []
+    assert steps["ot3-head"].dependencies == ["can-server", "state-manager"]
+    assert steps[f"input-{robot_id}"].dependencies == ["emulator-proxy", "can-server"]
+    assert steps["monorepo-builder"].dependencies == []
+
+
+def test_failed_parallel_build_flushes_logs(
+    make_config: Callable, log_sink: MemoryLogSink
+) -> None:
+    """Confirm logs of steps that ran are kept when another step fails."""
+    orchestrator = ServiceOrchestrator(
+        _config_model(make_config, "ot3"), False, parallel=True
+    )
+    steps = orchestrator.get_build_steps()
+    failing_step = steps[-1]
+
+    def _fail(**dependency_container_names: str) -> Service:
+        cast(AbstractLogSink, get_log_sink()).write(
+            LogEvent(failing_step.name, "build", None, ["Failing."])
+        )
+        raise RuntimeError("Build failed.")
+
+    failing_step.build = _fail
+    with pytest.raises(RuntimeError, match="Build failed."):
+        orchestrator.build_steps(steps)
+
+    logged_services = {event.service for event in log_sink.events}
+    assert failing_step.name in logged_services
+    assert len(logged_services) > 1
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_unbuildable_step_is_reported(make_config: Callable, parallel: bool) -> None:
+    """Confirm a step depending on a step that is never built fails instead of hanging."""
+    orchestrator = ServiceOrchestrator(
+        _config_model(make_config, "ot3"), False, parallel=parallel
+    )
+    steps = orchestrator.get_build_steps()
+    steps[-1].dependencies = ["not-a-step"]
+    with pytest.raises(UnbuildableStepsError, match="not-a-step"):
+        orchestrator.build_steps(steps)
@@ -0,0 +1,155 @@
+"""Tests for indexing pipette definitions in a local monorepo."""
+import json
+import pathlib
+from typing import Any, Callable, Dict, List
+
+import pytest
+from pydantic import ValidationError
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    convert_from_obj,
+)
+from emulation_system.compose_file_creator.pipette_utils import definitions
+from emulation_system.compose_file_creator.pipette_utils.definitions import (
+    PipetteVersion,
+    get_definitions_dir,
+    load_pipette_definitions,
+)
+from emulation_system.compose_file_creator.pipette_utils.lookups import (
+    OT3PipetteLookup,
+)
+
+DEFINITION_FILES = [
+    "single_channel/p50/3_0.json",
+    "single_channel/p50/3_3.json",
+    "single_channel/p50/3_5.json",
+    "single_channel/p1000/2_2.json",
+    "single_channel/p1000/3_4.json",
+    "eight_channel/p1000/3_4.json",
+    "ninety_six_channel/p1000/3_3.json",
+    "ninety_six_channel/p1000/README.md",
+]
+
+
+@pytest.fixture
+def definitions_dir(opentrons_dir: str) -> pathlib.Path:
+    """Pipette definitions directory of the local monorepo."""
+    path = pathlib.Path(get_definitions_dir(opentrons_dir))
+    for definition_file in DEFINITION_FILES:
+        file_path = path / definition_file
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("{}")
+    return path
+
+
+def _v(version: str) -> PipetteVersion:
+    return PipetteVersion.parse(version)
+
+
+def test_index(definitions_dir: pathlib.Path, opentrons_dir: str) -> None:
+    """Confirm versions are read from file names and split by robot."""
+    index = load_pipette_definitions(opentrons_dir)
+    assert index is not None
+    assert index.versions == {
+        "p50_single": [_v("3.0"), _v("3.3"), _v("3.5")],
+        "p1000_single": [_v("2.2"), _v("3.4")],
+        "p1000_multi": [_v("3.4")],
+        "p1000_96": [_v("3.3")],
+    }
+    assert index.get_versions("ot2", "p1000_single") == [_v("2.2")]
+    assert index.get_latest_version("ot3", "p1000_single") == _v("3.4")
+    assert index.get_latest_version("ot3", "p50_multi") is None
+
+
+def test_index_cached_by_fingerprint(
+    definitions_dir: pathlib.Path,
+    opentrons_dir: str,
+    isolated_pipette_definitions_cache: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm the directory is only scanned again after a definition changes."""
+    scans: List[str] = []
+    scan_definitions = definitions._scan_definitions
+
+    def tracking_scan(path: str) -> Dict[str, List[PipetteVersion]]:
+        scans.append(path)
+        return scan_definitions(path)
+
+    monkeypatch.setattr(definitions, "_scan_definitions", tracking_scan)
+    first = load_pipette_definitions(opentrons_dir)
+    assert load_pipette_definitions(opentrons_dir) == first
+    assert len(scans) == 1
+    assert len(list(isolated_pipette_definitions_cache.iterdir())) == 1
+
+    (definitions_dir / "single_channel" / "p50" / "3_6.json").write_text("{}")
+    changed = load_pipette_definitions(opentrons_dir)
+    assert len(scans) == 2
+    assert changed is not None and first is not None
+    assert changed.fingerprint != first.fingerprint
+    assert changed.get_latest_version("ot3", "p50_single") == _v("3.6")
+
+
+def test_no_definitions_dir(opentrons_dir: str) -> None:
+    """Confirm monorepos without pipette definitions have no index."""
+    assert load_pipette_definitions(opentrons_dir) is None
+
+
+@pytest.fixture
+def ot3_config(make_config: Callable) -> Dict[str, Any]:
+    """OT-3 configuration with a local monorepo and a left pipette."""
+    config = make_config(
+        robot="ot3", monorepo_source="path", ot3_firmware_source="path"
+    )
+    config["robot"]["hardware-specific-attributes"] = {"left-pipette": "P50 Single"}
+    return config
+
+
+def _left_pipette_model(config: Dict[str, Any]) -> int:
+    compose_file = convert_from_obj(config, dev=False)
+    builder = compose_file.ot3_firmware_builder
+    assert builder is not None and builder.environment is not None
+    env_vars = builder.environment.__root__
+    assert isinstance(env_vars, dict)
+    return json.loads(str(env_vars["LEFT_OT3_PIPETTE_DEFINITION"]))["pipette_model"]
+
+
+@pytest.mark.usefixtures("definitions_dir")
+def test_newest_local_version_by_default(ot3_config: Dict[str, Any]) -> None:
+    """Confirm pipettes use the newest definition in the local monorepo."""
+    assert _left_pipette_model(ot3_config) == 35
+
+
+@pytest.mark.usefixtures("definitions_dir")
+def test_requested_version(ot3_config: Dict[str, Any]) -> None:
+    """Confirm a requested version is used when the definition exists."""
+    ot3_config["robot"]["hardware-specific-attributes"]["left-pipette-version"] = "3.3"
+    assert _left_pipette_model(ot3_config) == 33
+
+    ot3_config["robot"]["hardware-specific-attributes"]["left-pipette-version"] = "3.4"
+    with pytest.raises(ValueError, match="Available versions are"):
+        convert_from_obj(ot3_config, dev=False)
+
+
+def test_out_of_range_model(
+    definitions_dir: pathlib.Path, ot3_config: Dict[str, Any]
+) -> None:
+    """Confirm versions with models OT-3 pipettes cannot have are rejected."""
+    (definitions_dir / "single_channel" / "p50" / "3_10.json").write_text("{}")
+    with pytest.raises(ValueError, match="must be between 0 and 99"):
+        convert_from_obj(ot3_config, dev=False)
+
+
+def test_versions_file_without_definitions(ot3_config: Dict[str, Any]) -> None:
+    """Confirm pipette_versions.json is used if the monorepo has no definitions."""
+    assert (
+        _left_pipette_model(ot3_config)
+        == OT3PipetteLookup.P50_SINGLE.get_pipette_model()
+    )
+
+
+def test_invalid_version(ot3_config: Dict[str, Any]) -> None:
+    """Confirm versions must be formatted as <major>.<minor>."""
+    ot3_config["robot"]["hardware-specific-attributes"]["left-pipette-version"] = "3_3"
+    with pytest.raises(ValidationError):
+        SystemConfigurationModel.from_dict(ot3_config)
@@ -2,17 +2,24 @@
 
 import datetime
 import json
+import os
+import pathlib
 from enum import Enum
-from typing import Tuple
+from typing import IO, Any, Dict, List, Tuple, cast
 
 import pytest
 
-from emulation_system.compose_file_creator.pipette_utils import get_robot_pipettes
+from emulation_system.compose_file_creator.pipette_utils import (
+    get_robot_pipettes,
+    lookups,
+)
 from emulation_system.compose_file_creator.pipette_utils.lookups import (
     OT2PipetteLookup,
     OT3PipetteLookup,
+    PipetteVersionRegistry,
     lookup_pipette,
 )
+from emulation_system.consts import PIPETTE_VERSIONS_FILE_PATH
 
 VALID_OT2_PIPETTE_NAMES = [
     ("p20_single", OT2PipetteLookup.P20_SINGLE),
@@ -177,3 +184,57 @@ def test_pipette_restrictions() -> None:
     with pytest.raises(ValueError) as err:
         get_robot_pipettes("ot3", "P1000 96 Channel", "P50 Single")
     assert '"P1000 96 Channel" blocks both pipette mounts'
+
+
+@pytest.fixture
+def versions_path(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Copy of the pipette versions file used by every lookup in the test."""
+    path = tmp_path / "pipette_versions.json"
+    path.write_text(pathlib.Path(PIPETTE_VERSIONS_FILE_PATH).read_text())
+    monkeypatch.setattr(lookups, "_registry", PipetteVersionRegistry(str(path)))
+    return path
+
+
+def _set_ot3_model(path: pathlib.Path, pipette_name: str, model: int) -> None:
+    versions = json.loads(path.read_text())
+    versions["ot3"][pipette_name] = model
+    path.write_text(json.dumps(versions))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_versions_file_read_once(
+    versions_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm the versions file is only read again after it changes."""
+    loads: List[IO[str]] = []
+    json_load = json.load
+
+    def tracking_load(file: IO[str]) -> Dict[str, Any]:
+        loads.append(file)
+        return cast(Dict[str, Any], json_load(file))
+
+    monkeypatch.setattr(lookups.json, "load", tracking_load)
+    for _ in range(3):
+        assert OT3PipetteLookup.P50_SINGLE.get_pipette_model() == 34
+        assert OT2PipetteLookup.P20_MULTI.versioned_pipette_string == "p20_multi_v2.1"
+    assert len(loads) == 1
+
+    _set_ot3_model(versions_path, "p50_single", 35)
+    assert OT3PipetteLookup.P50_SINGLE.get_pipette_model() == 35
+    assert len(loads) == 2
+
+
+def test_robot_pipettes_memoized(versions_path: pathlib.Path) -> None:
+    """Confirm pipettes are shared per robot until the versions file changes."""
+    pipettes = get_robot_pipettes("ot3", "P50 Single", "p1000_multi")
+    assert get_robot_pipettes("ot3", "P50 Single", "p1000_multi") is pipettes
+    assert get_robot_pipettes("ot3", "P50 Single", None) is not pipettes
+
+    _set_ot3_model(versions_path, "p50_single", 35)
+    reloaded = get_robot_pipettes("ot3", "P50 Single", "p1000_multi")
+    assert reloaded is not pipettes
+    assert reloaded.left is not None
+    assert reloaded.left.model == 35
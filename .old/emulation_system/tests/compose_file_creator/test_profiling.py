@@ -0,0 +1,134 @@
+"""Tests for timing conversion stages with --profile."""
+import io
+import json
+import pathlib
+from typing import Callable
+
+import pytest
+import yaml
+
+from emulation_system import profiling
+from emulation_system.commands import EmulationSystemCommand
+from emulation_system.profiling import (
+    SUMMARY_FORMAT,
+    Profiler,
+    TimingSpan,
+    profile,
+    span,
+)
+
+EXPECTED_SPAN_NAMES = {
+    "parse_yaml",
+    "convert_from_obj",
+    "validate",
+    "build_services",
+    "build_service",
+    "generate_container_name",
+    "generate_env_vars",
+    "get_top_level_volumes",
+    "RuntimeComposeFileModel",
+    "to_yaml",
+}
+
+
+@pytest.fixture
+def config_path(make_config: Callable, tmp_path: pathlib.Path) -> pathlib.Path:
+    """OT-3 configuration file with modules and local sources."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.dump(
+            make_config(
+                robot="ot3",
+                modules={"heater-shaker-module": 1},
+                monorepo_source="path",
+                ot3_firmware_source="path",
+            )
+        )
+    )
+    return path
+
+
+def _generate(
+    config_path: pathlib.Path, profile_path: pathlib.Path, profile_format: str
+) -> None:
+    with open(config_path) as input_file:
+        EmulationSystemCommand(
+            input_path=input_file,
+            output_path=io.StringIO(),  # type: ignore[arg-type]
+            remote_only=False,
+            dev=False,
+            use_cache=False,
+            profile_path=str(profile_path),
+            profile_format=profile_format,
+        ).execute()
+
+
+def test_nothing_recorded_without_profile() -> None:
+    """Confirm spans are no-ops outside of profile()."""
+    assert span("stage") is span("other-stage")
+    with profile() as profiler:
+        with span("stage"):
+            pass
+    with span("stage"):
+        pass
+    assert [recorded.name for recorded in profiler.spans] == ["stage"]
+    assert profiling._active_profiler is None
+
+
+def test_self_time_excludes_nested_spans() -> None:
+    """Confirm self time only subtracts directly nested spans on the same thread."""
+    profiler = Profiler()
+    profiler.spans = [
+        TimingSpan("outer", 0, 100, 1),
+        TimingSpan("inner", 10, 50, 1),
+        TimingSpan("innermost", 20, 10, 1),
+        TimingSpan("inner", 70, 20, 1),
+        TimingSpan("other-thread", 10, 50, 2),
+    ]
+    summaries = {summary.name: summary for summary in profiler.summarize()}
+    assert summaries["outer"].self_total == 30
+    assert summaries["inner"].calls == 2
+    assert summaries["inner"].total == 70
+    assert summaries["inner"].self_total == 60
+    assert summaries["inner"].max == 50
+    assert summaries["other-thread"].self_total == 50
+
+
+def test_command_writes_chrome_trace(
+    config_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Confirm every stage of the conversion is in the trace."""
+    profile_path = tmp_path / "profile.json"
+    _generate(config_path, profile_path, profiling.CHROME_TRACE_FORMAT)
+
+    events = json.loads(profile_path.read_text())["traceEvents"]
+    assert EXPECTED_SPAN_NAMES <= {event["name"] for event in events}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert {
+        event["args"]["container_name"]
+        for event in events
+        if event["name"] == "build_service"
+    } >= {"can-server", "emulator-proxy", "ot3-bootloader"}
+
+
+def test_command_writes_summary(
+    config_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Confirm the summary table has a row per stage."""
+    profile_path = tmp_path / "profile.txt"
+    _generate(config_path, profile_path, SUMMARY_FORMAT)
+
+    lines = profile_path.read_text().splitlines()
+    assert lines[0].split() == [
+        "span",
+        "calls",
+        "total",
+        "ms",
+        "self",
+        "ms",
+        "mean",
+        "ms",
+        "max",
+        "ms",
+    ]
+    assert {line.split()[0] for line in lines[2:]} >= EXPECTED_SPAN_NAMES
@@ -0,0 +1,70 @@
+"""Tests for RefIndex and ref suggestions."""
+
+from typing import List
+
+import pytest
+
+from emulation_system import git_interaction
+from emulation_system.compose_file_creator.config_file_settings import (
+    OpentronsRepository,
+)
+from emulation_system.source import SourceState
+
+REFS = ["edge", "main", "v6.0.0", "v6.0.1", "v6.1.0", "v7.0.0", "release_6.0"]
+
+
+@pytest.fixture
+def ref_index() -> git_interaction.RefIndex:
+    """RefIndex built from REFS."""
+    return git_interaction.RefIndex(REFS)
+
+
+def test_membership(ref_index: git_interaction.RefIndex) -> None:
+    """Confirm membership checks."""
+    assert "edge" in ref_index
+    assert "v6.0" not in ref_index
+    assert len(ref_index) == len(REFS)
+
+
+@pytest.mark.parametrize(
+    "prefix, expected_refs",
+    [
+        ("v6.0", ["v6.0.0", "v6.0.1"]),
+        ("v", ["v6.0.0", "v6.0.1", "v6.1.0", "v7.0.0"]),
+        ("release", ["release_6.0"]),
+        ("zzz", []),
+        ("", sorted(REFS)),
+    ],
+)
+def test_with_prefix(
+    ref_index: git_interaction.RefIndex, prefix: str, expected_refs: List[str]
+) -> None:
+    """Confirm prefix queries."""
+    assert ref_index.with_prefix(prefix) == expected_refs
+
+
+def test_range(ref_index: git_interaction.RefIndex) -> None:
+    """Confirm range queries include start and exclude end."""
+    assert ref_index.range("v6.0.1", "v7.0.0") == ["v6.0.1", "v6.1.0"]
+
+
+def test_closest_matches(ref_index: git_interaction.RefIndex) -> None:
+    """Confirm typos and partial refs produce suggestions."""
+    assert ref_index.closest_matches("egde")[0] == "edge"
+    assert set(ref_index.closest_matches("v6.0")) >= {"v6.0.0", "v6.0.1"}
+    assert ref_index.closest_matches("completely-different") == []
+
+
+def test_invalid_ref_error_lists_closest_refs(fake_ls_remote: List[str]) -> None:
+    """Confirm the error for an unknown ref suggests the closest refs."""
+    with pytest.raises(ValueError, match='Did you mean.*\n\t- "edge"'):
+        SourceState.to_source_state("egde", OpentronsRepository.OPENTRONS)
+
+
+def test_invalid_ref_error_without_close_refs(fake_ls_remote: List[str]) -> None:
+    """Confirm no suggestions are listed when nothing is close."""
+    with pytest.raises(ValueError) as err:
+        SourceState.to_source_state(
+            "completely-different", OpentronsRepository.OPENTRONS
+        )
+    assert "Did you mean" not in str(err.value)
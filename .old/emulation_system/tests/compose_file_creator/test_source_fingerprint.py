@@ -0,0 +1,111 @@
+"""Tests for content fingerprinting of local source trees."""
+import os
+import pathlib
+import subprocess
+
+import pytest
+
+from emulation_system import source_fingerprint
+from emulation_system.source import MonorepoSource
+from emulation_system.source_fingerprint import (
+    compute_source_fingerprint,
+    compute_source_stat_signature,
+)
+
+
+@pytest.fixture
+def source_tree(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Small monorepo-like git work tree with an ignored build directory."""
+    tree = tmp_path / "opentrons"
+    (tree / "api").mkdir(parents=True)
+    (tree / "robot-server").mkdir()
+    (tree / "api" / "build").mkdir()
+    (tree / "api" / "setup.py").write_text("api")
+    (tree / "api" / "build" / "artifact.whl").write_text("artifact")
+    (tree / "robot-server" / "setup.py").write_text("robot-server")
+    (tree / ".gitignore").write_text("build/\n")
+    subprocess.run(["git", "init", "-q", str(tree)], check=True)
+    return tree
+
+
+def test_fingerprint_is_stable(source_tree: pathlib.Path) -> None:
+    """Confirm an unchanged tree produces the same fingerprint."""
+    assert compute_source_fingerprint(str(source_tree)) == compute_source_fingerprint(
+        str(source_tree)
+    )
+
+
+def test_ignored_files_do_not_change_fingerprint(source_tree: pathlib.Path) -> None:
+    """Confirm files matched by .gitignore are not part of the fingerprint."""
+    before = compute_source_fingerprint(str(source_tree))
+    (source_tree / "api" / "build" / "artifact.whl").write_text("rebuilt")
+    assert compute_source_fingerprint(str(source_tree)) == before
+
+
+def test_fallback_without_git_honours_gitignore(source_tree: pathlib.Path) -> None:
+    """Confirm the os.walk fallback lists the same files as git ls-files."""
+    git_files = source_fingerprint._list_source_files(str(source_tree))
+    assert source_fingerprint._walk_source_files(str(source_tree)) == git_files
+    assert "api/build/artifact.whl" not in git_files
+
+
+def test_sub_project_fingerprints(source_tree: pathlib.Path) -> None:
+    """Confirm changing one sub-project only changes its own hash."""
+    sub_projects = ["api", "robot-server"]
+    before = compute_source_fingerprint(str(source_tree), sub_projects)
+    (source_tree / "api" / "setup.py").write_text("api changed")
+    after = compute_source_fingerprint(str(source_tree), sub_projects)
+
+    assert after.tree_hash != before.tree_hash
+    assert after.sub_project_hashes["api"] != before.sub_project_hashes["api"]
+    assert (
+        after.sub_project_hashes["robot-server"]
+        == before.sub_project_hashes["robot-server"]
+    )
+
+
+def test_only_changed_files_are_rehashed(
+    source_tree: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Confirm the mtime/size cache skips hashing unchanged files."""
+    compute_source_fingerprint(str(source_tree))
+    hashed_files = []
+    original_hash_file = source_fingerprint._hash_file
+
+    def _tracking_hash_file(file_path: str) -> str:
+        hashed_files.append(file_path)
+        return original_hash_file(file_path)
+
+    monkeypatch.setattr(source_fingerprint, "_hash_file", _tracking_hash_file)
+    compute_source_fingerprint(str(source_tree))
+    assert hashed_files == []
+
+    (source_tree / "robot-server" / "setup.py").write_text("robot-server changed")
+    compute_source_fingerprint(str(source_tree))
+    assert hashed_files == [os.path.join(str(source_tree), "robot-server", "setup.py")]
+
+
+def test_stat_signature_changes_with_tracked_files(source_tree: pathlib.Path) -> None:
+    """Confirm the stat signature changes with tracked files, not ignored ones."""
+    before = compute_source_stat_signature(str(source_tree))
+    (source_tree / "api" / "build" / "artifact.whl").write_text("rebuilt")
+    assert compute_source_stat_signature(str(source_tree)) == before
+    (source_tree / "api" / "setup.py").write_text("api changed")
+    assert compute_source_stat_signature(str(source_tree)) != before
+
+
+def test_monorepo_fingerprint_env_vars(source_tree: pathlib.Path) -> None:
+    """Confirm local monorepo source exposes a hash per python project."""
+    env_vars = MonorepoSource(
+        source_location=str(source_tree)
+    ).generate_fingerprint_env_vars()
+    assert "SOURCE_FINGERPRINT" in env_vars
+    assert "SOURCE_FINGERPRINT_ROBOT_SERVER" in env_vars
+    assert "SOURCE_FINGERPRINT_SHARED_DATA_PYTHON" in env_vars
+
+
+def test_remote_source_has_no_fingerprint() -> None:
+    """Confirm remote sources do not get fingerprint env vars."""
+    assert (
+        MonorepoSource(source_location="latest").generate_fingerprint_env_vars() == {}
+    )
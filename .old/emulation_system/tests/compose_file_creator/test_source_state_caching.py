@@ -0,0 +1,62 @@
+"""Tests confirming source states are only resolved once per source object."""
+from typing import Any, Callable, Dict
+
+import pytest
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    convert_from_obj,
+)
+from emulation_system.source import (
+    MonorepoSource,
+    SourceState,
+    get_source_state_resolution_count,
+    reset_source_state_resolution_count,
+)
+
+
+@pytest.fixture
+def ot3_local_everything_with_modules(make_config: Callable) -> Dict[str, Any]:
+    """OT-3 and modules with every source pointing at a local directory."""
+    return make_config(
+        robot="ot3",
+        modules={"heater-shaker-module": 1, "magnetic-module": 1},
+        monorepo_source="path",
+        ot3_firmware_source="path",
+        opentrons_modules_source="path",
+    )
+
+
+def test_conversion_only_resolves_each_source_once(
+    ot3_local_everything_with_modules: Dict[str, Any]
+) -> None:
+    """Confirm that building services reuses the states resolved during validation."""
+    reset_source_state_resolution_count()
+    convert_from_obj(ot3_local_everything_with_modules, False)
+    assert get_source_state_resolution_count() == 3
+
+
+def test_source_state_is_cached(opentrons_dir: str) -> None:
+    """Confirm repeated source_state access does not re-resolve."""
+    source = MonorepoSource.validate(opentrons_dir)
+    reset_source_state_resolution_count()
+    for _ in range(5):
+        assert source.is_local()
+        assert not source.is_remote()
+    assert get_source_state_resolution_count() == 0
+
+
+def test_source_state_invalidated_on_source_location_change(
+    ot3_local_everything_with_modules: Dict[str, Any]
+) -> None:
+    """Confirm changing source_location in place, like YamlSubstitution does, re-resolves."""
+    config = parse_obj_as(SystemConfigurationModel, ot3_local_everything_with_modules)
+    source = config.monorepo_source
+    assert source.source_state == SourceState.LOCAL
+
+    reset_source_state_resolution_count()
+    source.source_location = "latest"
+    assert source.source_state == SourceState.REMOTE_LATEST
+    assert source.source_state == SourceState.REMOTE_LATEST
+    assert get_source_state_resolution_count() == 1
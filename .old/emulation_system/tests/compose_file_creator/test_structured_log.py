@@ -0,0 +1,134 @@
+"""Tests for per-run JSON lines conversion logs and the render-log command."""
+import io
+import pathlib
+from typing import Callable, List, Optional
+
+import pytest
+import yaml
+
+from emulation_system.commands import EmulationSystemCommand, RenderLogCommand
+from emulation_system.commands.emulation_system_command import (
+    COMPOSE_CACHE_LOG_SERVICE_NAME,
+)
+from emulation_system.commands.render_log_command import HTML_FORMAT
+from emulation_system.compose_file_creator.errors import NoLogFilesError
+from emulation_system.compose_file_creator.logging.log_sink import (
+    JSONLinesLogSink,
+    LogEvent,
+    read_log_events,
+)
+
+
+@pytest.fixture
+def config_path(make_config: Callable, tmp_path: pathlib.Path) -> pathlib.Path:
+    """OT-2 configuration file with modules and local monorepo source."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.dump(
+            make_config(
+                robot="ot2",
+                modules={"heater-shaker-module": 1},
+                monorepo_source="path",
+            )
+        )
+    )
+    return path
+
+
+def _generate(config_path: pathlib.Path, log_path: Optional[str] = None) -> None:
+    with open(config_path) as input_file:
+        EmulationSystemCommand(
+            input_path=input_file,
+            output_path=io.StringIO(),  # type: ignore[arg-type]
+            remote_only=False,
+            dev=False,
+            use_cache=False,
+            log_path=log_path,
+        ).execute()
+
+
+def _log_paths(log_dir: pathlib.Path) -> List[pathlib.Path]:
+    return sorted(log_dir.glob("*.jsonl"))
+
+
+def test_every_run_writes_its_own_log(
+    config_path: pathlib.Path, isolated_log_dir: pathlib.Path
+) -> None:
+    """Confirm runs log structured events to separate files in the log directory."""
+    _generate(config_path)
+    _generate(config_path)
+
+    log_paths = _log_paths(isolated_log_dir)
+    assert len(log_paths) == 2
+    events = list(read_log_events(str(log_paths[0])))
+    assert events == list(read_log_events(str(log_paths[1])))
+    assert {"build.dockerfile", "container_name", "environment"} <= {
+        event.field for event in events
+    }
+    assert all(len(event.reason) > 0 for event in events)
+
+
+def test_log_file_option(
+    config_path: pathlib.Path,
+    isolated_log_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Confirm the log is written to the passed path instead of the log directory."""
+    log_path = tmp_path / "conversion.jsonl"
+    _generate(config_path, str(log_path))
+    assert len(list(read_log_events(str(log_path)))) > 0
+    assert _log_paths(isolated_log_dir) == []
+
+
+def test_cached_conversion_logs_cache_hit(
+    config_path: pathlib.Path, isolated_log_dir: pathlib.Path
+) -> None:
+    """Confirm only the cache hit is logged when the compose file is cached."""
+    for _ in range(2):
+        with open(config_path) as input_file:
+            EmulationSystemCommand(
+                input_path=input_file,
+                output_path=io.StringIO(),  # type: ignore[arg-type]
+                remote_only=False,
+                dev=False,
+            ).execute()
+    logged_services = [
+        {event.service for event in read_log_events(str(log_path))}
+        for log_path in _log_paths(isolated_log_dir)
+    ]
+    assert len(logged_services) == 2
+    assert {COMPOSE_CACHE_LOG_SERVICE_NAME} in logged_services
+
+
+def test_events_round_trip(tmp_path: pathlib.Path) -> None:
+    """Confirm events are read back as they were written."""
+    events = [
+        LogEvent("smoothie", "tty", True, ['Setting tty to "true".']),
+        LogEvent("smoothie", "environment", {"A": "1"}, ["Setting env vars to:"]),
+    ]
+    log_path = tmp_path / "log.jsonl"
+    sink = JSONLinesLogSink(str(log_path))
+    for event in events:
+        sink.write(event)
+    sink.close()
+    assert list(read_log_events(str(log_path))) == events
+
+
+def test_render_latest_log(config_path: pathlib.Path) -> None:
+    """Confirm the most recent log is rendered as text and HTML."""
+    _generate(config_path)
+    text = RenderLogCommand(log_path=None, output_path=None).render()
+    html = RenderLogCommand(
+        log_path=None, output_path=None, output_format=HTML_FORMAT
+    ).render()
+
+    assert "Creating Service for" in text
+    assert "build.dockerfile" in text
+    assert html.startswith("<!DOCTYPE html>")
+    assert "Creating Service for" in html
+
+
+def test_render_without_logs() -> None:
+    """Confirm rendering fails when no run has written a log."""
+    with pytest.raises(NoLogFilesError):
+        RenderLogCommand(log_path=None, output_path=None).render()
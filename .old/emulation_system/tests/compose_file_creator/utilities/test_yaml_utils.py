@@ -0,0 +1,48 @@
+"""Test that the libyaml and pure Python dumpers produce the same yaml."""
+from typing import Any, Callable, Dict
+
+import pytest
+import yaml
+from pydantic import parse_obj_as
+
+from emulation_system import SystemConfigurationModel
+from emulation_system.compose_file_creator.conversion.conversion_functions import (
+    _convert,
+)
+from emulation_system.compose_file_creator.utilities.yaml_utils import (
+    OpentronsEmulationYamlDumper,
+    PythonOpentronsEmulationYamlDumper,
+)
+
+
+def _dump(data: Dict[str, Any], dumper: Any) -> str:  # noqa: ANN401
+    return yaml.dump(data, default_flow_style=False, Dumper=dumper)
+
+
+@pytest.mark.parametrize("robot", ["ot2", "ot3"])
+def test_dumpers_match(robot: str, make_config: Callable) -> None:
+    """Confirm compose files and configuration files are dumped identically."""
+    config_model = parse_obj_as(
+        SystemConfigurationModel,
+        make_config(
+            robot=robot,
+            modules={"heater-shaker-module": 2, "thermocycler-module": 2},
+            monorepo_source="path",
+        ),
+    )
+    compose_file = _convert(config_model, False).dict(
+        exclude={"is_remote"}, exclude_none=True
+    )
+    for data in [compose_file, config_model.dict(by_alias=True)]:
+        assert _dump(data, OpentronsEmulationYamlDumper) == _dump(
+            data, PythonOpentronsEmulationYamlDumper
+        )
+
+
+def test_null_and_aliases() -> None:
+    """Confirm None is dumped blank and repeated objects are not aliased."""
+    shared = {"a": 1}
+    expected = "first:\n  a: 1\nnothing:\nsecond:\n  a: 1\n"
+    data = {"first": shared, "second": shared, "nothing": None}
+    assert _dump(data, OpentronsEmulationYamlDumper) == expected
+    assert _dump(data, PythonOpentronsEmulationYamlDumper) == expected